@@ -3,29 +3,58 @@
 로또 번호 추천 FastAPI 백엔드 서버
 Android 앱에서 호출할 수 있는 REST API 제공
 """
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Annotated
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
+import hashlib
 import json
 import logging
+import os
 from pathlib import Path
 from collections import Counter
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from anyio import to_thread
 import atexit
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 # 데이터베이스 및 인증 관련 import
 from database import get_db, engine, SessionLocal
 from models import Base, User, SavedNumber, WinningCheck, UserSettings, WinningNumber, UserSubscription
 from auth import TokenManager
+from principal_cache import Principal, get_principal, invalidate_user, token_key
 from kakao_auth import KakaoAuth
+from draw_snapshot import get_draw_snapshot, draw_data_tag
+from response_cache import DrawResponseCacheMiddleware
+from draw_archive import (
+    Rendered,
+    get_archived_draw,
+    get_bundle,
+    bundle_index,
+    IMMUTABLE_CACHE_CONTROL,
+    MUTABLE_CACHE_CONTROL
+)
+from lotto_sampler import InfeasibleConstraintsError
+from winning_fanout import run_winning_fanout
+from lotto_backtest import backtest_tickets
+from latest_draw_service import get_latest_winning, set_new_draw_callback
+from http_client import close_http_client
+from draw_aggregates import (
+    get_draw_aggregates,
+    aggregate_draws,
+    AGGREGATE_RECENT_DRAWS,
+    SCOPE_TOTAL, SCOPE_RECENT,
+    CATEGORIES, DECADE_LABELS, CONSECUTIVE_LABELS
+)
 
 # 기존 lott.py의 함수들 임포트
 from lott import (
@@ -36,20 +65,24 @@ from lott import (
 # 로또 크롤러 임포트
 from lotto_crawler import (
     get_or_fetch_winning_number,
+    upsert_winning_numbers,
     sync_all_winning_numbers,
     get_latest_draw_number,
-    get_latest_winning_numbers
+    list_winning_numbers,
+    WINNING_NUMBER_FIELDS
 )
 
 # 로또 당첨 확인 임포트
 from lotto_checker import (
     check_winning,
+    check_tickets,
+    actual_prize_for_rank,
     get_rank_message,
     estimate_prize_amount
 )
 
 # 구독 관리 라우터 임포트
-from subscription_api import router as subscription_router
+from subscription_api import router as subscription_router, get_or_create_subscription, build_subscription_status
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -64,14 +97,25 @@ scheduler = BackgroundScheduler(timezone="Asia/Seoul")
 # 보안 스키마
 security = HTTPBearer()
 
+# 동기(def) 핸들러를 실행하는 스레드풀 크기
+# DB/크롤러 작업은 블로킹이므로 이벤트 루프 대신 스레드풀에서 실행됨
+# DB 커넥션 풀(DB_POOL_SIZE + DB_MAX_OVERFLOW)과 비슷하게 맞추는 것을 권장
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     앱 생명주기 관리 (startup/shutdown)
     """
     # Startup
+    to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+    logger.info(f"🧵 요청 처리 스레드풀 크기: {API_THREADPOOL_SIZE}")
+    
     setup_scheduler()
     
+    # 최신 회차 백그라운드 갱신으로 새 회차가 저장되면 당첨 확인 작업 예약
+    set_new_draw_callback(schedule_winning_fanout)
+    
     # DB 초기화를 백그라운드에서 실행 (서버 시작을 블로킹하지 않음)
     import threading
     from init_db import init_database
@@ -84,6 +128,7 @@ async def lifespan(app: FastAPI):
     if scheduler.running:
         scheduler.shutdown()
         logger.info("🛑 스케줄러 종료됨")
+    close_http_client()
 
 app = FastAPI(
     title="로또 번호 추천 API",
@@ -95,6 +140,31 @@ app = FastAPI(
 # 정적 파일 제공 (카카오톡 공유 이미지 등)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+def load_draw_data_tag() -> str:
+    """스냅샷이 무효화된 뒤 처음 요청에서 한 번만 DB에서 다시 로드"""
+    db = SessionLocal()
+    try:
+        get_draw_snapshot(db)
+    finally:
+        db.close()
+    return draw_data_tag()
+
+# 당첨 번호 기반 응답 캐시 (새 회차 저장 또는 RESPONSE_CACHE_TTL마다 다시 렌더링, If-None-Match → 304)
+# CORS 헤더가 캐시된 응답에도 붙도록 CORS보다 먼저 등록 (안쪽 미들웨어)
+# /api/winning-numbers/latest는 요청마다 오래된 회차 갱신(refresh_if_stale)을 걸어야 하므로 제외
+app.add_middleware(
+    DrawResponseCacheMiddleware,
+    get_tag=draw_data_tag,
+    load_tag=load_draw_data_tag,
+    paths=[
+        "/api/stats",
+        "/api/dashboard",
+        "/api/winning-numbers",
+        "/api/latest-draw",
+    ],
+    patterns=[r"^/api/winning-numbers/\d+$"],
+)
+
 # CORS 설정 (Android 앱에서 접근 허용)
 app.add_middleware(
     CORSMiddleware,
@@ -235,12 +305,31 @@ class WinningNumberResponse(BaseModel):
     winners_1st: Optional[int]
     total_sales: Optional[int]
 
+class WinningNumberFieldsResponse(BaseModel):
+    """
+    목록 조회용 당첨 번호 (fields로 고른 필드만 응답에 포함, draw_number는 항상 포함)
+    fields를 지정하지 않으면 WinningNumberResponse와 같은 모양
+    """
+    draw_number: int
+    numbers: Optional[List[int]] = Field(default=None, description="당첨 번호 6개 (정렬됨)")
+    bonus_number: Optional[int] = None
+    draw_date: Optional[datetime] = None
+    prize_1st: Optional[int] = None
+    prize_2nd: Optional[int] = None
+    prize_3rd: Optional[int] = None
+    prize_4th: Optional[int] = None
+    prize_5th: Optional[int] = None
+    winners_1st: Optional[int] = None
+    total_sales: Optional[int] = None
+
 class WinningNumberListResponse(BaseModel):
     """당첨 번호 목록 응답"""
     success: bool
     count: int
     latest_draw: Optional[int]
-    winning_numbers: List[WinningNumberResponse]
+    order: str = Field(description="desc(최신순) / asc(과거순)")
+    next_cursor: Optional[int] = Field(description="다음 페이지 cursor (마지막 페이지면 null)")
+    winning_numbers: List[WinningNumberFieldsResponse]
 
 class SyncResponse(BaseModel):
     """동기화 결과 응답"""
@@ -269,6 +358,47 @@ class CheckWinningResponse(BaseModel):
     prize_amount: Optional[int] = Field(description="예상 당첨금 (실제 금액과 다를 수 있음)")
     message: str
 
+MAX_BATCH_TICKETS = 500   # 일괄 확인 최대 번호 세트 수
+MAX_BATCH_DRAWS = 20      # 일괄 확인 최대 회차 수
+
+class BatchCheckWinningRequest(BaseModel):
+    """일괄 당첨 확인 요청 모델"""
+    tickets: List[List[int]] = Field(min_items=1, max_items=MAX_BATCH_TICKETS, description="확인할 번호 세트 목록 (각 6개)")
+    draw_numbers: Optional[List[int]] = Field(default=None, max_items=MAX_BATCH_DRAWS, description="확인할 회차 목록 (없으면 최신 회차)")
+    save_history: bool = Field(default=True, description="당첨 확인 기록 저장 여부")
+
+MAX_BACKTEST_TICKETS = 1000  # 백테스트 최대 번호 세트 수
+
+class BacktestRequest(BaseModel):
+    """과거 회차 백테스트 요청 모델"""
+    tickets: List[List[int]] = Field(min_items=1, max_items=MAX_BACKTEST_TICKETS, description="백테스트할 번호 세트 목록 (각 6개)")
+    from_draw: Optional[int] = Field(default=None, description="시작 회차 (없으면 1회)")
+    to_draw: Optional[int] = Field(default=None, description="끝 회차 (없으면 최신 회차)")
+
+class BatchTicketResult(BaseModel):
+    ticket_index: int = Field(description="요청한 tickets 내 순서")
+    numbers: List[int]
+    matched_count: int
+    has_bonus: bool
+    rank: Optional[int] = None
+    prize_amount: Optional[int] = None
+    message: str
+
+class BatchDrawResult(BaseModel):
+    draw_number: int
+    winning_numbers: List[int]
+    bonus_number: int
+    results: List[BatchTicketResult]
+
+class BatchCheckWinningResponse(BaseModel):
+    """일괄 당첨 확인 결과 응답"""
+    success: bool
+    ticket_count: int
+    draw_count: int
+    rank_counts: Dict[str, int] = Field(description="등수별 당첨 건수")
+    total_prize: int = Field(description="예상 당첨금 합계")
+    draws: List[BatchDrawResult]
+
 class UserSettingsRequest(BaseModel):
     """사용자 설정 업데이트 요청"""
     theme_mode: Optional[str] = Field(None, description="light, dark, system")
@@ -289,17 +419,18 @@ class UserSettingsResponse(BaseModel):
 # -----------------------------
 # 인증 의존성 함수
 # -----------------------------
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     현재 인증된 사용자 반환
+    검증된 토큰 페이로드와 사용자 정보는 캐시되므로 같은 토큰의 반복 요청은 DB를 조회하지 않음
     """
     token = credentials.credentials
     user_id = TokenManager.get_user_id_from_token(token)
     
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
+    user = get_principal(db, user_id, token_key(TokenManager.verify_token(token)))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -338,7 +469,7 @@ async def get_kakao_share_image():
     return FileResponse(image_path)
 
 @app.get("/api/health", response_model=HealthResponse)
-async def health_check(db: Session = Depends(get_db)):
+def health_check(db: Session = Depends(get_db)):
     """
     서버 상태 확인 (DB에서 직접 조회)
     """
@@ -346,6 +477,9 @@ async def health_check(db: Session = Depends(get_db)):
     from sqlalchemy import func
     max_draw = db.query(func.max(WinningNumber.draw_number)).scalar()
     
+    return health_response(max_draw)
+
+def health_response(max_draw: Optional[int]) -> HealthResponse:
     # 다음 예정된 업데이트 시간 가져오기
     next_update = None
     if scheduler.running:
@@ -368,6 +502,70 @@ async def health_check(db: Session = Depends(get_db)):
 # 인증 관련 엔드포인트
 # -----------------------------
 
+def _login_kakao_user(db: Session, user_data: Dict) -> tuple:
+    """
+    카카오 사용자 조회/생성 및 로그인 정보 갱신 (블로킹 DB 작업)
+    Returns: (사용자 ID, 신규 가입 여부)
+    """
+    # 데이터베이스에서 사용자 찾기 또는 생성
+    user = db.query(User).filter(User.kakao_id == user_data["kakao_id"]).first()
+    is_new_user = False
+    
+    if not user:
+        # 새 사용자 생성
+        is_new_user = True
+        print(f"🆕 새 사용자 생성 중...")
+        print(f"   kakao_id: {user_data['kakao_id']}")
+        print(f"   email: {user_data['email']}")
+        print(f"   nickname: {user_data['nickname']}")
+        print(f"   profile_image: {user_data['profile_image']}")
+        
+        user = User(
+            kakao_id=user_data["kakao_id"],
+            email=user_data["email"],
+            nickname=user_data["nickname"],
+            profile_image=user_data["profile_image"],
+            last_login_at=datetime.now(timezone.utc)
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        
+        print(f"✅ 사용자 생성 완료: ID={user.id}, nickname={user.nickname}")
+        
+        # 기본 설정 생성
+        user_settings = UserSettings(user_id=user.id)
+        db.add(user_settings)
+        db.commit()
+        
+        # 기본 FREE 구독 플랜 생성
+        print(f"📦 FREE 플랜 생성 중...")
+        user_subscription = UserSubscription(
+            user_id=user.id,
+            is_pro_subscriber=False,
+            subscription_plan="free",
+            auto_renew=False
+        )
+        db.add(user_subscription)
+        db.commit()
+        print(f"✅ FREE 플랜 생성 완료")
+    else:
+        # 기존 사용자 정보 업데이트
+        print(f"♻️ 기존 사용자 업데이트 중 (ID={user.id})...")
+        print(f"   이전 nickname: {user.nickname}")
+        print(f"   새로운 nickname: {user_data['nickname']}")
+        
+        user.email = user_data["email"]
+        user.nickname = user_data["nickname"]
+        user.profile_image = user_data["profile_image"]
+        user.last_login_at = datetime.now(timezone.utc)
+        db.commit()
+        invalidate_user(user.id)
+        
+        print(f"✅ 업데이트 완료: nickname={user.nickname}")
+    
+    return user.id, is_new_user
+
 @app.post("/auth/kakao/login", response_model=TokenResponse)
 async def kakao_login(
     request: KakaoLoginRequest,
@@ -385,68 +583,15 @@ async def kakao_login(
         kakao_user_info = await KakaoAuth.get_user_info(kakao_access_token)
         user_data = KakaoAuth.extract_user_data(kakao_user_info)
         
-        # 데이터베이스에서 사용자 찾기 또는 생성
-        user = db.query(User).filter(User.kakao_id == user_data["kakao_id"]).first()
-        is_new_user = False
-        
-        if not user:
-            # 새 사용자 생성
-            is_new_user = True
-            print(f"🆕 새 사용자 생성 중...")
-            print(f"   kakao_id: {user_data['kakao_id']}")
-            print(f"   email: {user_data['email']}")
-            print(f"   nickname: {user_data['nickname']}")
-            print(f"   profile_image: {user_data['profile_image']}")
-            
-            user = User(
-                kakao_id=user_data["kakao_id"],
-                email=user_data["email"],
-                nickname=user_data["nickname"],
-                profile_image=user_data["profile_image"],
-                last_login_at=datetime.now(timezone.utc)
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            
-            print(f"✅ 사용자 생성 완료: ID={user.id}, nickname={user.nickname}")
-            
-            # 기본 설정 생성
-            user_settings = UserSettings(user_id=user.id)
-            db.add(user_settings)
-            db.commit()
-            
-            # 기본 FREE 구독 플랜 생성
-            print(f"📦 FREE 플랜 생성 중...")
-            user_subscription = UserSubscription(
-                user_id=user.id,
-                is_pro_subscriber=False,
-                subscription_plan="free",
-                auto_renew=False
-            )
-            db.add(user_subscription)
-            db.commit()
-            print(f"✅ FREE 플랜 생성 완료")
-        else:
-            # 기존 사용자 정보 업데이트
-            print(f"♻️ 기존 사용자 업데이트 중 (ID={user.id})...")
-            print(f"   이전 nickname: {user.nickname}")
-            print(f"   새로운 nickname: {user_data['nickname']}")
-            
-            user.email = user_data["email"]
-            user.nickname = user_data["nickname"]
-            user.profile_image = user_data["profile_image"]
-            user.last_login_at = datetime.now(timezone.utc)
-            db.commit()
-            
-            print(f"✅ 업데이트 완료: nickname={user.nickname}")
+        # 데이터베이스에서 사용자 찾기 또는 생성 (블로킹 DB 작업은 스레드풀에서 실행)
+        user_id, is_new_user = await run_in_threadpool(_login_kakao_user, db, user_data)
         
         # JWT 토큰 생성
-        access_token = TokenManager.create_access_token(data={"sub": str(user.id)})
-        refresh_token = TokenManager.create_refresh_token(data={"sub": str(user.id)})
+        access_token = TokenManager.create_access_token(data={"sub": str(user_id)})
+        refresh_token = TokenManager.create_refresh_token(data={"sub": str(user_id)})
         
         print(f"📤 로그인 응답 전송:")
-        print(f"   user_id: {user.id}")
+        print(f"   user_id: {user_id}")
         print(f"   is_new_user: {is_new_user}")
         
         return TokenResponse(
@@ -464,7 +609,7 @@ async def kakao_login(
         )
 
 @app.get("/auth/me", response_model=UserProfile)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: Principal = Depends(get_current_user)):
     """
     현재 로그인한 사용자 정보 조회
     """
@@ -490,7 +635,7 @@ async def get_me(current_user: User = Depends(get_current_user)):
     return user_profile
 
 @app.post("/auth/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: Principal = Depends(get_current_user)):
     """
     로그아웃 처리
     클라이언트에서 토큰을 삭제하도록 응답
@@ -501,7 +646,7 @@ async def logout(current_user: User = Depends(get_current_user)):
     }
 
 @app.get("/auth/profile", response_model=UserProfile)
-async def get_user_profile(current_user: User = Depends(get_current_user)):
+async def get_user_profile(current_user: Principal = Depends(get_current_user)):
     """
     현재 사용자 프로필 조회
     """
@@ -527,47 +672,21 @@ async def get_kakao_auth_url():
 # -----------------------------
 
 @app.get("/api/winning-numbers/latest", response_model=WinningNumberResponse)
-async def get_latest_winning_number(db: Session = Depends(get_db)):
+def get_latest_winning_number(db: Session = Depends(get_db)):
     """
-    최신 당첨 번호 조회 (DB 우선, 없으면 API에서 가져옴)
+    최신 당첨 번호 조회 (메모리 캐시/DB에서 바로 응답)
+    새 회차 확인은 백그라운드에서 수행되므로 외부 사이트 응답을 기다리지 않음
     """
     try:
-        # DB에서 현재 최신 회차 조회
-        db_latest = db.query(WinningNumber).order_by(WinningNumber.draw_number.desc()).first()
-        start_from = db_latest.draw_number if db_latest else None
+        latest = get_latest_winning(db)
         
-        # 최신 회차 번호 추정 (DB 최신 회차부터 검색)
-        latest_draw = get_latest_draw_number(start_from=start_from)
-        
-        if not latest_draw:
+        if not latest:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="최신 회차를 찾을 수 없습니다"
             )
         
-        # DB 또는 API에서 가져오기
-        winning = get_or_fetch_winning_number(db, latest_draw)
-        
-        if not winning:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"{latest_draw}회차 당첨 번호를 찾을 수 없습니다"
-            )
-        
-        return WinningNumberResponse(
-            draw_number=winning.draw_number,
-            numbers=[winning.number1, winning.number2, winning.number3,
-                    winning.number4, winning.number5, winning.number6],
-            bonus_number=winning.bonus_number,
-            draw_date=winning.draw_date,
-            prize_1st=winning.prize_1st,
-            prize_2nd=winning.prize_2nd,
-            prize_3rd=winning.prize_3rd,
-            prize_4th=winning.prize_4th,
-            prize_5th=winning.prize_5th,
-            winners_1st=winning.winners_1st,
-            total_sales=winning.total_sales
-        )
+        return WinningNumberResponse(**latest)
         
     except HTTPException:
         raise
@@ -578,13 +697,56 @@ async def get_latest_winning_number(db: Session = Depends(get_db)):
             detail="당첨 번호 조회 중 오류가 발생했습니다"
         )
 
+def rendered_response(request: Request, rendered: Rendered, cache_control: str) -> Response:
+    """미리 렌더링된 JSON 응답 (If-None-Match가 맞으면 304)"""
+    headers = {"ETag": rendered.etag, "Cache-Control": cache_control}
+    if rendered.etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
+
+@app.get("/api/winning-numbers/bundles")
+def get_winning_number_bundles(db: Session = Depends(get_db)):
+    """
+    지난 회차 묶음(100회차 단위) 목록
+    complete=true인 묶음은 내용이 바뀌지 않으므로 클라이언트가 영구 캐시해도 됨
+    """
+    snapshot = get_draw_snapshot(db)
+    return bundle_index(db, snapshot.latest_draw, url_prefix="/api/winning-numbers/bundles")
+
+@app.get("/api/winning-numbers/bundles/{bundle_no}")
+def get_winning_number_bundle(
+    bundle_no: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    bundle_no번 묶음 다운로드 (1 → 1~100회차)
+    모든 회차가 지난 회차인 묶음은 Cache-Control: immutable, 최신 회차가 포함된 묶음은 짧게 캐시
+    """
+    if bundle_no < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="묶음 번호는 1 이상이어야 합니다"
+        )
+    
+    snapshot = get_draw_snapshot(db)
+    rendered, complete = get_bundle(db, bundle_no, snapshot.latest_draw)
+    if rendered is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{bundle_no}번 묶음에 해당하는 회차가 없습니다"
+        )
+    return rendered_response(request, rendered, IMMUTABLE_CACHE_CONTROL if complete else MUTABLE_CACHE_CONTROL)
+
 @app.get("/api/winning-numbers/{draw_number}", response_model=WinningNumberResponse)
-async def get_winning_number_by_draw(
+def get_winning_number_by_draw(
     draw_number: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     특정 회차의 당첨 번호 조회
+    최신 회차 이전(지난 회차)은 미리 렌더링된 응답을 Cache-Control: immutable로 반환
     """
     if draw_number < 1:
         raise HTTPException(
@@ -592,6 +754,10 @@ async def get_winning_number_by_draw(
             detail="회차 번호는 1 이상이어야 합니다"
         )
     
+    archived = get_archived_draw(db, draw_number, get_draw_snapshot(db).latest_draw)
+    if archived is not None:
+        return rendered_response(request, archived, IMMUTABLE_CACHE_CONTROL)
+    
     try:
         winning = get_or_fetch_winning_number(db, draw_number)
         
@@ -625,56 +791,105 @@ async def get_winning_number_by_draw(
             detail="당첨 번호 조회 중 오류가 발생했습니다"
         )
 
-@app.get("/api/winning-numbers", response_model=WinningNumberListResponse)
-async def get_winning_numbers(
+# 목록 조회 한 번에 돌려주는 최대 회차 수
+WINNING_NUMBERS_MAX_LIMIT = 1000
+
+def _parse_date_param(name: str, value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name}는 YYYY-MM-DD 형식이어야 합니다"
+        )
+
+@app.get("/api/winning-numbers", response_model=WinningNumberListResponse, response_model_exclude_unset=True)
+def get_winning_numbers(
     limit: int = 10,
+    cursor: Optional[int] = None,
+    order: str = "desc",
+    from_draw: Optional[int] = None,
+    to_draw: Optional[int] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    최신 당첨 번호 N개 조회
+    당첨 번호 목록 조회 (기본: 최신 당첨 번호 N개)
+    
+    Args:
+        limit: 한 번에 받을 회차 수 (1~1000)
+        cursor: 이전 응답의 next_cursor (그 회차 다음부터 이어서, OFFSET 없이 draw_number 기준)
+        order: desc(최신순, 기본) / asc(과거순)
+        from_draw, to_draw: 회차 범위 (포함)
+        from_date, to_date: 추첨일 범위 (YYYY-MM-DD, 포함)
+        fields: 필요한 필드만 (쉼표 구분, 예: numbers,bonus_number) - draw_number는 항상 포함
+                지정하면 winning_numbers 항목에 고른 필드만 들어감 (예: {"draw_number": 1, "numbers": [...]})
+    
+    next_cursor가 null이면 마지막 페이지
     """
-    if limit < 1 or limit > 100:
+    if limit < 1 or limit > WINNING_NUMBERS_MAX_LIMIT:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="limit은 1~100 사이여야 합니다"
+            detail=f"limit은 1~{WINNING_NUMBERS_MAX_LIMIT} 사이여야 합니다"
+        )
+    if order not in ("desc", "asc"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="order는 desc 또는 asc여야 합니다"
         )
     
+    selected = list(WINNING_NUMBER_FIELDS)
+    if fields:
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested - set(WINNING_NUMBER_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"알 수 없는 필드: {', '.join(sorted(unknown))}"
+            )
+        requested.add("draw_number")
+        selected = [f for f in WINNING_NUMBER_FIELDS if f in requested]
+    
+    start_date = _parse_date_param("from_date", from_date)
+    end_date = _parse_date_param("to_date", to_date)
+    
     try:
-        winnings = get_latest_winning_numbers(db, limit)
-        
-        latest_draw = winnings[0].draw_number if winnings else None
-        
-        return WinningNumberListResponse(
-            success=True,
-            count=len(winnings),
-            latest_draw=latest_draw,
-            winning_numbers=[
-                WinningNumberResponse(
-                    draw_number=w.draw_number,
-                    numbers=[w.number1, w.number2, w.number3, w.number4, w.number5, w.number6],
-                    bonus_number=w.bonus_number,
-                    draw_date=w.draw_date,
-                    prize_1st=w.prize_1st,
-                    prize_2nd=w.prize_2nd,
-                    prize_3rd=w.prize_3rd,
-                    prize_4th=w.prize_4th,
-                    prize_5th=w.prize_5th,
-                    winners_1st=w.winners_1st,
-                    total_sales=w.total_sales
-                )
-                for w in winnings
-            ]
+        # 한 개 더 읽어서 다음 페이지 여부 확인
+        rows = list_winning_numbers(
+            db, selected, limit + 1,
+            descending=order == "desc",
+            after=cursor,
+            from_draw=from_draw,
+            to_draw=to_draw,
+            from_date=start_date,
+            to_date=end_date + timedelta(days=1) if end_date else None
         )
-        
+        latest_draw = get_draw_snapshot(db).latest_draw
     except Exception as e:
         logger.error(f"당첨 번호 목록 조회 오류: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="당첨 번호 목록 조회 중 오류가 발생했습니다"
         )
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # 고르지 않은 필드는 설정하지 않은 상태로 두어 응답에서 빠지게 함 (response_model_exclude_unset)
+    return WinningNumberListResponse(
+        success=True,
+        count=len(rows),
+        latest_draw=latest_draw,
+        order=order,
+        next_cursor=rows[-1]["draw_number"] if has_more else None,
+        winning_numbers=[WinningNumberFieldsResponse(**row) for row in rows]
+    )
 
 @app.post("/api/winning-numbers/sync", response_model=SyncResponse)
-async def sync_winning_numbers(
+def sync_winning_numbers(
     start_draw: int = 1,
     end_draw: Optional[int] = None,
     db: Session = Depends(get_db)
@@ -725,7 +940,7 @@ class ManualWinningNumberRequest(BaseModel):
     winners_1st: Optional[int] = Field(None, description="1등 당첨자 수")
 
 @app.post("/api/winning-numbers/manual")
-async def add_winning_number_manual(
+def add_winning_number_manual(
     request: ManualWinningNumberRequest,
     db: Session = Depends(get_db)
 ):
@@ -742,55 +957,49 @@ async def add_winning_number_manual(
     if not (1 <= request.bonus_number <= 45):
         raise HTTPException(status_code=400, detail="보너스 번호는 1~45 사이여야 합니다")
     
-    # 중복 확인
-    existing = db.query(WinningNumber).filter(WinningNumber.draw_number == request.draw_number).first()
-    if existing:
-        raise HTTPException(status_code=400, detail=f"{request.draw_number}회차 데이터가 이미 존재합니다")
+    try:
+        datetime.strptime(request.draw_date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="추첨일은 YYYY-MM-DD 형식이어야 합니다")
+    
+    sorted_numbers = sorted(request.numbers)
+    draw_data = {
+        "drwNo": request.draw_number,
+        "drwNoDate": request.draw_date,
+        **{f"drwtNo{i}": n for i, n in enumerate(sorted_numbers, start=1)},
+        "bnusNo": request.bonus_number,
+        "firstWinamnt": request.prize_1st,
+        "firstPrzwnerCo": request.winners_1st,
+    }
     
     try:
-        from datetime import datetime
-        sorted_numbers = sorted(request.numbers)
-        
-        winning = WinningNumber(
-            draw_number=request.draw_number,
-            draw_date=datetime.strptime(request.draw_date, "%Y-%m-%d").date(),
-            number1=sorted_numbers[0],
-            number2=sorted_numbers[1],
-            number3=sorted_numbers[2],
-            number4=sorted_numbers[3],
-            number5=sorted_numbers[4],
-            number6=sorted_numbers[5],
-            bonus_number=request.bonus_number,
-            prize_1st=request.prize_1st,
-            winners_1st=request.winners_1st
-        )
-        
-        db.add(winning)
-        db.commit()
-        
-        logger.info(f"✅ {request.draw_number}회차 당첨번호 수동 추가 완료: {sorted_numbers} + {request.bonus_number}")
-        
-        return {
-            "success": True,
-            "message": f"{request.draw_number}회차 당첨번호가 추가되었습니다",
-            "draw_number": request.draw_number,
-            "numbers": sorted_numbers,
-            "bonus_number": request.bonus_number
-        }
-        
+        result = upsert_winning_numbers(db, [draw_data])
     except Exception as e:
-        db.rollback()
         logger.error(f"❌ 당첨번호 수동 추가 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    # 이미 있는 회차면 ON CONFLICT DO NOTHING으로 건너뜀
+    if not result["inserted"]:
+        raise HTTPException(status_code=400, detail=f"{request.draw_number}회차 데이터가 이미 존재합니다")
+    
+    logger.info(f"✅ {request.draw_number}회차 당첨번호 수동 추가 완료: {sorted_numbers} + {request.bonus_number}")
+    
+    return {
+        "success": True,
+        "message": f"{request.draw_number}회차 당첨번호가 추가되었습니다",
+        "draw_number": request.draw_number,
+        "numbers": sorted_numbers,
+        "bonus_number": request.bonus_number
+    }
 
 # -----------------------------
 # 사용자 데이터 관련 엔드포인트
 # -----------------------------
 
 @app.post("/api/saved-numbers", response_model=SavedNumberResponse)
-async def save_number(
+def save_number(
     request: SavedNumberRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -841,9 +1050,21 @@ async def save_number(
         created_at=saved_number.created_at
     )
 
+def saved_number_response(saved: SavedNumber) -> SavedNumberResponse:
+    return SavedNumberResponse(
+        id=saved.id,
+        numbers=[saved.number1, saved.number2, saved.number3,
+                saved.number4, saved.number5, saved.number6],
+        nickname=saved.nickname,
+        memo=saved.memo,
+        is_favorite=saved.is_favorite if saved.is_favorite is not None else False,
+        recommendation_type=saved.recommendation_type,
+        created_at=saved.created_at
+    )
+
 @app.get("/api/saved-numbers", response_model=List[SavedNumberResponse])
-async def get_saved_numbers(
-    current_user: User = Depends(get_current_user),
+def get_saved_numbers(
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -859,17 +1080,7 @@ async def get_saved_numbers(
         results = []
         for saved in saved_numbers:
             try:
-                result = SavedNumberResponse(
-                    id=saved.id,
-                    numbers=[saved.number1, saved.number2, saved.number3,
-                            saved.number4, saved.number5, saved.number6],
-                    nickname=saved.nickname,
-                    memo=saved.memo,
-                    is_favorite=saved.is_favorite if saved.is_favorite is not None else False,
-                    recommendation_type=saved.recommendation_type,
-                    created_at=saved.created_at
-                )
-                results.append(result)
+                results.append(saved_number_response(saved))
             except Exception as e:
                 logger.error(f"❌ Error serializing SavedNumber ID {saved.id}: {e}")
                 logger.error(f"   Data: is_favorite={saved.is_favorite}, created_at={saved.created_at}")
@@ -883,9 +1094,9 @@ async def get_saved_numbers(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/saved-numbers/{number_id}")
-async def delete_saved_number(
+def delete_saved_number(
     number_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -908,10 +1119,10 @@ async def delete_saved_number(
     return {"message": "저장된 번호가 삭제되었습니다"}
 
 @app.put("/api/saved-numbers/{number_id}", response_model=SavedNumberResponse)
-async def update_saved_number(
+def update_saved_number(
     number_id: int,
     request: SavedNumberUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -982,9 +1193,9 @@ async def update_saved_number(
 # -----------------------------
 
 @app.post("/api/check-winning", response_model=CheckWinningResponse)
-async def check_winning_numbers(
+def check_winning_numbers(
     request: CheckWinningRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1037,19 +1248,7 @@ async def check_winning_numbers(
         )
         
         # 당첨금 계산 (실제 당첨금 또는 평균값)
-        actual_prize = None
-        if rank == 1:
-            actual_prize = winning.prize_1st
-        elif rank == 2:
-            actual_prize = winning.prize_2nd
-        elif rank == 3:
-            actual_prize = winning.prize_3rd
-        elif rank == 4:
-            actual_prize = winning.prize_4th
-        elif rank == 5:
-            actual_prize = winning.prize_5th
-        
-        prize_amount = estimate_prize_amount(rank, actual_prize)
+        prize_amount = estimate_prize_amount(rank, actual_prize_for_rank(winning, rank))
         
         # 메시지 생성
         message = get_rank_message(rank, matched_count, has_bonus)
@@ -1090,9 +1289,140 @@ async def check_winning_numbers(
             detail="당첨 확인 중 오류가 발생했습니다"
         )
 
+@app.post("/api/check-winning/batch", response_model=BatchCheckWinningResponse)
+def check_winning_batch(
+    request: BatchCheckWinningRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    여러 번호 세트를 여러 회차와 한 번에 당첨 확인
+    
+    - **tickets**: 번호 세트 목록 (최대 500개)
+    - **draw_numbers**: 회차 목록 (최대 20개, 없으면 최신 회차)
+    - **save_history**: 당첨 확인 기록 저장 여부 (한 번의 bulk insert)
+    """
+    # 번호 유효성 검사
+    tickets = []
+    for index, numbers in enumerate(request.tickets):
+        if len(numbers) != 6 or len(set(numbers)) != 6 or not all(1 <= n <= 45 for n in numbers):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{index + 1}번째 번호가 올바르지 않습니다 (1~45 사이의 서로 다른 번호 6개)"
+            )
+        tickets.append(sorted(numbers))
+    
+    # 회차 결정 (없으면 최신 회차)
+    draw_numbers = sorted(set(request.draw_numbers or []))
+    if not draw_numbers:
+        latest = get_draw_snapshot(db).latest_draw
+        if not latest:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="당첨번호 데이터가 없습니다."
+            )
+        draw_numbers = [latest]
+    if draw_numbers[0] < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="회차 번호는 1 이상이어야 합니다"
+        )
+    
+    try:
+        # 당첨 번호 한 번에 조회 (DB에 없는 회차만 개별 조회)
+        winnings = {
+            w.draw_number: w for w in db.query(WinningNumber).filter(
+                WinningNumber.draw_number.in_(draw_numbers)
+            ).all()
+        }
+        for draw_number in draw_numbers:
+            if draw_number not in winnings:
+                winning = get_or_fetch_winning_number(db, draw_number)
+                if not winning:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"{draw_number}회차 당첨 번호를 찾을 수 없습니다"
+                    )
+                winnings[draw_number] = winning
+        
+        draws = []
+        for draw_number in draw_numbers:
+            w = winnings[draw_number]
+            draws.append((draw_number, [w.number1, w.number2, w.number3,
+                                        w.number4, w.number5, w.number6], w.bonus_number))
+        
+        # 비트마스크 일괄 비교
+        checks = check_tickets(tickets, draws)
+        
+        draw_results = {
+            draw_number: BatchDrawResult(
+                draw_number=draw_number,
+                winning_numbers=winning_numbers,
+                bonus_number=bonus_number,
+                results=[]
+            )
+            for draw_number, winning_numbers, bonus_number in draws
+        }
+        rank_counts = Counter()
+        total_prize = 0
+        history_rows = []
+        for check in checks:
+            rank = check["rank"]
+            prize_amount = estimate_prize_amount(
+                rank, actual_prize_for_rank(winnings[check["draw_number"]], rank)
+            )
+            numbers = tickets[check["ticket_index"]]
+            draw_results[check["draw_number"]].results.append(BatchTicketResult(
+                ticket_index=check["ticket_index"],
+                numbers=numbers,
+                matched_count=check["matched_count"],
+                has_bonus=check["has_bonus"],
+                rank=rank,
+                prize_amount=prize_amount,
+                message=get_rank_message(rank, check["matched_count"], check["has_bonus"])
+            ))
+            if rank:
+                rank_counts[str(rank)] += 1
+                total_prize += prize_amount or 0
+            history_rows.append({
+                "user_id": current_user.id,
+                "numbers": numbers,
+                "draw_number": check["draw_number"],
+                "rank": rank,
+                "prize_amount": prize_amount,
+                "matched_count": check["matched_count"],
+                "has_bonus": check["has_bonus"]
+            })
+        
+        # 당첨 내역 DB에 한 번에 저장
+        if request.save_history and history_rows:
+            db.execute(insert(WinningCheck), history_rows)
+            db.commit()
+        
+        logger.info(f"🎯 일괄 당첨 확인: 사용자 {current_user.id}, {len(tickets)}개 x {len(draws)}회차, 당첨 {sum(rank_counts.values())}건")
+        
+        return BatchCheckWinningResponse(
+            success=True,
+            ticket_count=len(tickets),
+            draw_count=len(draws),
+            rank_counts=dict(rank_counts),
+            total_prize=total_prize,
+            draws=list(draw_results.values())
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"일괄 당첨 확인 오류: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="당첨 확인 중 오류가 발생했습니다"
+        )
+
 @app.get("/api/winning-history", response_model=List[Dict])
-async def get_winning_history(
-    current_user: User = Depends(get_current_user),
+def get_winning_history(
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
     limit: int = 20
 ):
@@ -1135,9 +1465,20 @@ async def get_winning_history(
 # 사용자 설정 엔드포인트
 # -----------------------------
 
+def user_settings_response(settings: UserSettings) -> UserSettingsResponse:
+    return UserSettingsResponse(
+        user_id=settings.user_id,
+        theme_mode=settings.theme_mode,
+        default_recommendation_type=settings.default_recommendation_type,
+        lucky_numbers=settings.lucky_numbers,
+        exclude_numbers=settings.exclude_numbers,
+        created_at=settings.created_at,
+        updated_at=settings.updated_at
+    )
+
 @app.get("/api/settings", response_model=UserSettingsResponse)
-async def get_user_settings(
-    current_user: User = Depends(get_current_user),
+def get_user_settings(
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1155,15 +1496,7 @@ async def get_user_settings(
             db.commit()
             db.refresh(settings)
         
-        return UserSettingsResponse(
-            user_id=settings.user_id,
-            theme_mode=settings.theme_mode,
-            default_recommendation_type=settings.default_recommendation_type,
-            lucky_numbers=settings.lucky_numbers,
-            exclude_numbers=settings.exclude_numbers,
-            created_at=settings.created_at,
-            updated_at=settings.updated_at
-        )
+        return user_settings_response(settings)
         
     except Exception as e:
         logger.error(f"설정 조회 오류: {e}")
@@ -1173,9 +1506,9 @@ async def get_user_settings(
         )
 
 @app.put("/api/settings", response_model=UserSettingsResponse)
-async def update_user_settings(
+def update_user_settings(
     request: UserSettingsRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1256,33 +1589,14 @@ async def update_user_settings(
 
 def calculate_frequency_from_db(db: Session) -> dict:
     """
-    DB에서 모든 당첨번호를 읽어 빈도수 계산
+    당첨번호 스냅샷에서 빈도수 계산 (보너스 번호 제외)
     """
-    from collections import Counter
-    
-    # 모든 당첨번호 조회
-    all_numbers = db.query(WinningNumber).all()
-    
-    if not all_numbers:
-        return {}
-    
-    # 모든 번호 수집
-    counter = Counter()
-    for record in all_numbers:
-        counter[record.number1] += 1
-        counter[record.number2] += 1
-        counter[record.number3] += 1
-        counter[record.number4] += 1
-        counter[record.number5] += 1
-        counter[record.number6] += 1
-        # 보너스 번호는 제외 (일반 번호와 다른 의미)
-    
-    return dict(counter)
+    return dict(get_draw_snapshot(db).frequency())
 
 @app.post("/api/recommend", response_model=RecommendResponse)
-async def recommend_numbers(
+def recommend_numbers(
     request: RecommendRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1294,9 +1608,8 @@ async def recommend_numbers(
     Returns:
         추천된 로또 번호 세트들 (사용자의 행운번호/제외번호 반영)
     """
-    from sqlalchemy import func
-    
-    # DB에서 실시간 빈도수 계산
+    # 스냅샷에서 빈도수 계산
+    snapshot = get_draw_snapshot(db)
     frequency = calculate_frequency_from_db(db)
     if not frequency:
         raise HTTPException(
@@ -1305,7 +1618,7 @@ async def recommend_numbers(
         )
     
     # 최신 회차 조회
-    max_draw = db.query(func.max(WinningNumber.draw_number)).scalar()
+    max_draw = snapshot.latest_draw
     if not max_draw:
         raise HTTPException(
             status_code=404,
@@ -1316,7 +1629,8 @@ async def recommend_numbers(
     stats = {
         "frequency": frequency,
         "last_draw": max_draw,
-        "include_bonus": False
+        "include_bonus": False,
+        "version": snapshot.version  # 가중치 샘플러 캐시 키
     }
     
     try:
@@ -1351,6 +1665,9 @@ async def recommend_numbers(
             sets=[LottoSet(numbers=s) for s in sets],
             include_bonus=stats.get("include_bonus", False)
         )
+    except InfeasibleConstraintsError as e:
+        # 행운/제외 번호 조합으로는 조건을 만족하는 번호가 없는 경우
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import traceback
         error_detail = f"번호 생성 중 오류: {str(e)}\n{traceback.format_exc()}"
@@ -1358,7 +1675,7 @@ async def recommend_numbers(
         raise HTTPException(status_code=500, detail=f"번호 생성 중 오류: {str(e)}")
 
 @app.get("/api/stats", response_model=StatsResponse)
-async def get_statistics(db: Session = Depends(get_db)):
+def get_statistics(db: Session = Depends(get_db)):
     """
     로또 번호 통계 조회 (DB에서 직접 계산)
     
@@ -1366,34 +1683,26 @@ async def get_statistics(db: Session = Depends(get_db)):
         각 번호의 출현 빈도 및 상위 번호 정보
     """
     try:
-        # DB에서 모든 당첨 번호 조회
-        winning_numbers = db.query(WinningNumber).order_by(WinningNumber.draw_number.desc()).all()
+        # 당첨 번호 스냅샷 조회
+        snapshot = get_draw_snapshot(db)
         
-        if not winning_numbers:
+        if not len(snapshot):
             raise HTTPException(
                 status_code=404,
                 detail="DB에 당첨 번호 데이터가 없습니다. 먼저 데이터를 동기화하세요."
             )
         
         # 최신 회차
-        latest_draw = winning_numbers[0].draw_number
-        
-        # 번호 출현 빈도 계산
-        frequency = Counter()
-        for winning in winning_numbers:
-            # 6개 번호를 리스트로 변환 (number1~number6 필드 사용)
-            numbers = [
-                winning.number1,
-                winning.number2,
-                winning.number3,
-                winning.number4,
-                winning.number5,
-                winning.number6
-            ]
-            frequency.update(numbers)
-            
-            # 보너스 번호도 포함 (선택적)
-            # frequency[winning.bonus_number] += 1
+        latest_draw = snapshot.latest_draw
+        
+        # 번호 출현 빈도 (보너스 번호 제외, 증분 집계 테이블에서 조회)
+        aggregates = get_draw_aggregates(
+            db,
+            cache_key=snapshot.version,
+            expected_count=len(snapshot),
+            expected_last_draw=latest_draw
+        )
+        frequency = aggregates.get(SCOPE_TOTAL, "number")
         
         # Dict[str, int] 형식으로 변환
         freq_dict = {str(num): count for num, count in frequency.items()}
@@ -1417,7 +1726,7 @@ async def get_statistics(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"통계 조회 중 오류: {str(e)}")
 
 @app.get("/api/dashboard", response_model=DashboardResponse)
-async def get_dashboard_analytics(
+def get_dashboard_analytics(
     recent_draws: int = 20,
     db: Session = Depends(get_db)
 ):
@@ -1437,27 +1746,33 @@ async def get_dashboard_analytics(
             detail="recent_draws는 5~100 사이 값이어야 합니다."
         )
     try:
-        # DB에서 모든 당첨 번호 조회
-        winning_numbers = db.query(WinningNumber).order_by(WinningNumber.draw_number.desc()).all()
+        # 당첨 번호 스냅샷 조회
+        snapshot = get_draw_snapshot(db)
         
-        if not winning_numbers:
+        if not len(snapshot):
             raise HTTPException(
                 status_code=404,
                 detail="DB에 당첨 번호 데이터가 없습니다. 먼저 데이터를 동기화하세요."
             )
         
-        total_draws = len(winning_numbers)
+        total_draws = len(snapshot)
+        actual_recent_draws = min(recent_draws, total_draws)
         
-        # 1. 번호 출현 빈도 계산
-        frequency = Counter()
-        for winning in winning_numbers:
-            numbers = [
-                winning.number1, winning.number2, winning.number3,
-                winning.number4, winning.number5, winning.number6
-            ]
-            frequency.update(numbers)
+        # 기본 회차 수는 증분 집계 테이블에서, 그 외는 스냅샷에서 집계
+        if recent_draws == AGGREGATE_RECENT_DRAWS:
+            aggregates = get_draw_aggregates(
+                db,
+                cache_key=snapshot.version,
+                expected_count=total_draws,
+                expected_last_draw=snapshot.latest_draw
+            )
+            frequency = aggregates.get(SCOPE_TOTAL, "number")
+            recent = {category: aggregates.get(SCOPE_RECENT, category) for category in CATEGORIES}
+        else:
+            frequency = snapshot.frequency()
+            recent = aggregate_draws(snapshot.iter_recent(actual_recent_draws))
         
-        # 빈도를 NumberFrequency 리스트로 변환
+        # 1. 번호 출현 빈도
         total_numbers = sum(frequency.values())
         frequency_list = [
             NumberFrequency(
@@ -1469,14 +1784,7 @@ async def get_dashboard_analytics(
         ]
         
         # 2. 핫/콜드 번호 (사용자 선택 회차 기준)
-        recent_frequency = Counter()
-        actual_recent_draws = min(recent_draws, total_draws)
-        for winning in winning_numbers[:actual_recent_draws]:
-            numbers = [
-                winning.number1, winning.number2, winning.number3,
-                winning.number4, winning.number5, winning.number6
-            ]
-            recent_frequency.update(numbers)
+        recent_frequency = Counter(recent["number"])
         
         # 모든 로또 번호(1-45)에 대해 빈도 초기화 (0회 출현 번호 포함)
         for num in range(1, 46):
@@ -1498,101 +1806,48 @@ async def get_dashboard_analytics(
                 count=count,
                 percentage=round((count / recent_total_numbers) * 100, 2) if recent_total_numbers > 0 else 0.0
             )
-            for num, count in sorted(recent_frequency.items(), key=lambda x: (-x[1], x[0]))
+            for num, count in sorted_recent
         ]
         
         # 3. 십의 자리 분포 (최근 N회차 기준)
-        decade_counter = Counter()
-        for num, count in recent_frequency.items():
-            if 1 <= num <= 10:
-                decade = "1-10"
-            elif 11 <= num <= 20:
-                decade = "11-20"
-            elif 21 <= num <= 30:
-                decade = "21-30"
-            elif 31 <= num <= 40:
-                decade = "31-40"
-            else:  # 41-45
-                decade = "41-45"
-            decade_counter[decade] += count
-        
+        decade_counter = recent["decade"]
         decade_total = sum(decade_counter.values())
         decade_distribution = [
             DecadeDistribution(
                 decade=decade,
-                count=count,
-                percentage=round((count / decade_total) * 100, 2)
+                count=decade_counter.get(decade, 0),
+                percentage=round((decade_counter.get(decade, 0) / decade_total) * 100, 2)
             )
-            for decade, count in sorted(decade_counter.items())
+            for decade in sorted(DECADE_LABELS)
         ]
         
         # 4. 홀짝 비율 (최근 N회차 기준)
-        even_count = sum(count for num, count in recent_frequency.items() if num % 2 == 0)
-        odd_count = sum(count for num, count in recent_frequency.items() if num % 2 == 1)
+        even_count = recent["parity"].get("even", 0)
+        odd_count = recent["parity"].get("odd", 0)
         total_count = even_count + odd_count
         even_odd_ratio = {
             "even": round((even_count / total_count) * 100, 2) if total_count > 0 else 0.0,
             "odd": round((odd_count / total_count) * 100, 2) if total_count > 0 else 0.0
         }
         
-        # 5. 당첨번호 합계 범위 (최근 N회차 기준)
-        sums = []
-        for winning in winning_numbers[:actual_recent_draws]:
-            numbers = [
-                winning.number1, winning.number2, winning.number3,
-                winning.number4, winning.number5, winning.number6
-            ]
-            sums.append(sum(numbers))
-        
+        # 5. 당첨번호 합계 범위 (최근 N회차 기준, 합계별 회차 수 히스토그램)
+        sum_histogram = recent["sum"]
+        sum_draws = sum(sum_histogram.values())
         sum_range = {
-            "min": min(sums) if sums else 0,
-            "max": max(sums) if sums else 0,
-            "avg": int(sum(sums) / len(sums)) if sums else 0
+            "min": min(sum_histogram) if sum_histogram else 0,
+            "max": max(sum_histogram) if sum_histogram else 0,
+            "avg": int(sum(total * count for total, count in sum_histogram.items()) / sum_draws) if sum_draws else 0
         }
         
         # 6. 연속번호 출현 통계 (최근 N회차 기준)
-        # 연속번호가 없는 경우, 2개 연속, 3개 연속 등을 카운트
-        no_consecutive = 0  # 연속번호 없음
-        has_2_consecutive = 0  # 2개 연속 (예: 5,6)
-        has_3_consecutive = 0  # 3개 연속 (예: 5,6,7)
-        has_4_or_more = 0  # 4개 이상 연속
-        
-        for winning in winning_numbers[:actual_recent_draws]:
-            numbers = sorted([
-                winning.number1, winning.number2, winning.number3,
-                winning.number4, winning.number5, winning.number6
-            ])
-            
-            # 연속된 번호 개수 세기
-            max_consecutive = 1
-            current_consecutive = 1
-            for i in range(1, len(numbers)):
-                if numbers[i] == numbers[i-1] + 1:
-                    current_consecutive += 1
-                    max_consecutive = max(max_consecutive, current_consecutive)
-                else:
-                    current_consecutive = 1
-            
-            # 분류
-            if max_consecutive == 1:
-                no_consecutive += 1
-            elif max_consecutive == 2:
-                has_2_consecutive += 1
-            elif max_consecutive == 3:
-                has_3_consecutive += 1
-            else:  # 4 이상
-                has_4_or_more += 1
-        
+        # 연속번호 없음, 2개 연속(예: 5,6), 3개 연속(예: 5,6,7), 4개 이상 연속
         consecutive_count = {
-            "none": no_consecutive,  # 연속 없음
-            "two": has_2_consecutive,  # 2개 연속
-            "three": has_3_consecutive,  # 3개 연속
-            "four_plus": has_4_or_more  # 4개 이상 연속
+            label: recent["consecutive"].get(label, 0)
+            for label in CONSECUTIVE_LABELS
         }
         
         # 최신 회차 정보
-        latest_winning = winning_numbers[0] if winning_numbers else None
-        last_draw = latest_winning.draw_number if latest_winning else None
+        last_draw = snapshot.latest_draw
         
         # 스케줄러 정보
         scheduler_running = scheduler.running if scheduler else False
@@ -1625,8 +1880,118 @@ async def get_dashboard_analytics(
         logger.error(f"대시보드 통계 조회 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"대시보드 통계 조회 중 오류: {str(e)}")
 
+# -----------------------------
+# 전체 조합 인덱스 엔드포인트
+# -----------------------------
+
+def _require_combination_index():
+    # 조합 인덱스는 numpy가 필요하므로 이 엔드포인트에서만 import (없으면 나머지 API는 그대로 동작)
+    try:
+        from combination_index import get_combination_index
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="조합 인덱스를 사용하려면 numpy가 필요합니다"
+        )
+    index = get_combination_index()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="조합 인덱스가 없습니다. 'python combination_index.py build'를 먼저 실행하세요."
+        )
+    return index
+
+@app.get("/api/combinations/count")
+def count_combinations(
+    sum_min: Optional[int] = None,
+    sum_max: Optional[int] = None,
+    evens_min: Optional[int] = None,
+    evens_max: Optional[int] = None,
+    max_run: Optional[int] = None,
+    max_per_decade: Optional[int] = None,
+    plausible_only: bool = False
+):
+    """
+    전체 8,145,060개 조합 중 조건을 만족하는 조합 수 (미리 만든 인덱스로 즉시 계산)
+    
+    - **sum_min / sum_max**: 번호 합계 범위
+    - **evens_min / evens_max**: 짝수 개수 범위
+    - **max_run**: 최장 연속 길이 상한
+    - **max_per_decade**: 구간(1-10, ..., 41-45)별 최대 개수
+    - **plausible_only**: 추천 필터(is_plausible)를 통과하는 조합만
+    """
+    index = _require_combination_index()
+    count = index.count(
+        sum_min=sum_min, sum_max=sum_max,
+        evens_min=evens_min, evens_max=evens_max,
+        max_run=max_run, max_per_decade=max_per_decade,
+        plausible_only=plausible_only
+    )
+    total = index.meta["total"]
+    return {
+        "success": True,
+        "total": total,
+        "count": count,
+        "ratio": round(count / total, 6)
+    }
+
+@app.get("/api/combinations/lookup")
+def lookup_combination(numbers: str):
+    """
+    번호 6개(쉼표 구분)의 조합 번호와 특성 조회
+    
+    예: /api/combinations/lookup?numbers=3,11,19,27,35,43
+    """
+    index = _require_combination_index()
+    try:
+        nums = [int(n) for n in numbers.split(",")]
+        info = index.describe(nums)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="1~45 사이의 서로 다른 번호 6개를 쉼표로 구분해 입력하세요"
+        )
+    return {"success": True, **info}
+
+# -----------------------------
+# 과거 회차 백테스트 엔드포인트
+# -----------------------------
+
+@app.post("/api/backtest")
+def backtest_numbers(request: BacktestRequest, db: Session = Depends(get_db)):
+    """
+    번호 세트들이 과거 전체(또는 지정 구간) 회차에서 몇 번 당첨됐을지 계산
+    
+    - **tickets**: 번호 세트 목록 (최대 1000개)
+    - **from_draw / to_draw**: 비교할 회차 구간
+    
+    Returns:
+        번호 세트별/전체 등수별 당첨 횟수, 예상 당첨금 합계, 구매 비용
+    """
+    for index, numbers in enumerate(request.tickets):
+        if len(numbers) != 6 or len(set(numbers)) != 6 or not all(1 <= n <= 45 for n in numbers):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{index + 1}번째 번호가 올바르지 않습니다 (1~45 사이의 서로 다른 번호 6개)"
+            )
+    if request.from_draw is not None and request.to_draw is not None and request.from_draw > request.to_draw:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_draw는 to_draw보다 클 수 없습니다"
+        )
+    
+    snapshot = get_draw_snapshot(db)
+    if not len(snapshot):
+        raise HTTPException(
+            status_code=404,
+            detail="당첨번호 데이터가 없습니다."
+        )
+    
+    result = backtest_tickets(snapshot, request.tickets, request.from_draw, request.to_draw)
+    return {"success": True, **result}
+
 @app.get("/api/latest-draw")
-async def get_latest_draw(db: Session = Depends(get_db)):
+def get_latest_draw(db: Session = Depends(get_db)):
     """
     저장된 최신 회차 정보 조회 (DB에서 직접 조회)
     """
@@ -1653,9 +2018,124 @@ async def get_latest_draw(db: Session = Depends(get_db)):
         logger.error(f"최신 회차 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="최신 회차 조회 중 오류가 발생했습니다.")
 
+# -----------------------------
+# 홈 화면 통합 조회
+# -----------------------------
+HOME_SECTIONS = ("health", "latest_draw", "winning_latest", "settings", "subscription", "saved_numbers")
+
+def section_etag(value) -> str:
+    """섹션 내용의 강한 ETag (같은 내용이면 같은 값)"""
+    body = json.dumps(jsonable_encoder(value), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:20] + '"'
+
+def _parse_section_etags(value: Optional[str]) -> Dict[str, str]:
+    """'섹션:etag,섹션:etag' 형식 쿼리 파라미터 파싱 (etag 따옴표는 있어도 없어도 됨)"""
+    known = {}
+    for item in (value or "").split(","):
+        name, _, etag = item.strip().partition(":")
+        if name and etag:
+            known[name] = etag if etag.startswith('"') else f'"{etag}"'
+    return known
+
+@app.get("/api/home")
+def get_home(
+    request: Request,
+    response: Response,
+    known: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    앱 시작 화면에 필요한 데이터를 한 번에 조회
+    (/api/health, /api/latest-draw, /api/winning-numbers/latest, /api/settings,
+     /api/subscription/status, /api/saved-numbers 를 한 요청으로)
+    
+    - 사용자 인증은 한 번 (캐시된 사용자 정보)
+    - 당첨 번호 관련 섹션은 메모리 스냅샷/캐시에서, 사용자 데이터는 쿼리 2번으로 조회
+    - sections.etags에 섹션별 ETag를 담아 보냄
+      known=섹션:etag,... 로 이전 ETag를 보내면 바뀌지 않은 섹션은 null + unchanged 목록으로 표시
+    - 응답 전체 ETag가 If-None-Match와 같으면 304
+    """
+    # 당첨 번호 (메모리 스냅샷 / 최신 회차 캐시, 새 회차 확인은 백그라운드)
+    snapshot = get_draw_snapshot(db)
+    latest = get_latest_winning(db)
+    latest_draw = None
+    if latest:
+        draw_date = latest.get("draw_date")
+        latest_draw = {
+            "success": True,
+            "last_draw": latest["draw_number"],
+            "generated_at": draw_date.isoformat() if draw_date else datetime.now(timezone.utc).isoformat(),
+            "include_bonus": False
+        }
+    
+    # 설정 + 구독: 사용자 기준 1:1 테이블이므로 한 번의 조인으로
+    settings, subscription = db.query(UserSettings, UserSubscription).select_from(User).outerjoin(
+        UserSettings, UserSettings.user_id == User.id
+    ).outerjoin(
+        UserSubscription, UserSubscription.user_id == User.id
+    ).filter(User.id == current_user.id).first() or (None, None)
+    
+    if settings is None:
+        settings = UserSettings(user_id=current_user.id)
+        db.add(settings)
+        db.commit()
+        db.refresh(settings)
+    if subscription is None:
+        subscription = get_or_create_subscription(db, current_user.id)
+    
+    saved_numbers = db.query(SavedNumber).filter(
+        SavedNumber.user_id == current_user.id
+    ).order_by(SavedNumber.created_at.desc()).all()
+    
+    sections = {
+        "health": health_response(snapshot.latest_draw),
+        "latest_draw": latest_draw,
+        "winning_latest": WinningNumberResponse(**latest) if latest else None,
+        "settings": user_settings_response(settings),
+        "subscription": build_subscription_status(db, subscription),
+        "saved_numbers": [saved_number_response(saved) for saved in saved_numbers],
+    }
+    etags = {name: section_etag(value) for name, value in sections.items()}
+    
+    # 응답 전체 ETag (섹션 ETag 조합)
+    etag = section_etag(etags)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    known_etags = _parse_section_etags(known)
+    unchanged = [name for name in HOME_SECTIONS if known_etags.get(name) == etags[name]]
+    for name in unchanged:
+        sections[name] = None
+    
+    return {
+        "success": True,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "user_id": current_user.id,
+        **sections,
+        "etags": etags,
+        "unchanged": unchanged,
+    }
+
 # -----------------------------
 # 자동 업데이트 함수
 # -----------------------------
+def schedule_winning_fanout(draw_number: int):
+    """
+    새 회차 저장 후 저장된 번호 전체 당첨 확인을 백그라운드 작업으로 예약
+    (스케줄러 스레드풀에서 즉시 실행, 같은 회차 작업은 하나만 유지)
+    """
+    scheduler.add_job(
+        func=run_winning_fanout,
+        args=[draw_number],
+        id=f"winning_fanout_{draw_number}",
+        name=f"{draw_number}회차 저장 번호 당첨 확인",
+        replace_existing=True
+    )
+    logger.info(f"🎯 {draw_number}회차 저장 번호 당첨 확인 작업 예약")
+
 def auto_update_lotto_data():
     """
     자동으로 로또 데이터를 업데이트하는 함수 (증분 업데이트)
@@ -1694,6 +2174,8 @@ def auto_update_lotto_data():
                 if result.get("success", True):
                     new_data_count = result.get("success_count", 0)
                     logger.info(f"✅ 자동 업데이트 완료! 새로운 {new_data_count}개 회차 데이터 추가 ({start_draw}~{latest_draw}회)")
+                    for draw_number in result.get("inserted_draws", []):
+                        schedule_winning_fanout(draw_number)
                 else:
                     logger.error(f"❌ 자동 업데이트 실패: {result.get('error')}")
             else:
@@ -1708,7 +2190,7 @@ def auto_update_lotto_data():
         logger.error(traceback.format_exc())
 
 @app.post("/api/update", response_model=UpdateResponse)
-async def manual_update(db: Session = Depends(get_db)):
+def manual_update(db: Session = Depends(get_db)):
     """
     수동으로 로또 데이터 업데이트 (증분 업데이트)
     
@@ -1746,6 +2228,8 @@ async def manual_update(db: Session = Depends(get_db)):
                 raise HTTPException(status_code=500, detail=result.get("error", "업데이트 실패"))
             
             new_data_count = result.get("success_count", 0)
+            for draw_number in result.get("inserted_draws", []):
+                schedule_winning_fanout(draw_number)
             message = f"✅ {new_data_count}개의 새로운 회차 데이터가 업데이트되었습니다 ({start_draw}~{latest_draw}회)"
         else:
             message = "ℹ️ 이미 최신 데이터입니다"
@@ -1809,7 +2293,6 @@ def setup_scheduler():
 # -----------------------------
 if __name__ == "__main__":
     import uvicorn
-    import os
     
     # DB 초기화는 lifespan에서 백그라운드로 실행됨
     
@@ -1,6 +1,7 @@
 """
 JWT 토큰 인증 시스템
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
@@ -9,6 +10,9 @@ from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 import os
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,14 +26,25 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+# 검증된 토큰 페이로드 캐시 (같은 토큰의 서명 검증을 반복하지 않음)
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "2048"))
+
 # 패스워드 해싱 (카카오 로그인에서는 직접 사용 안함)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_verified_tokens: "OrderedDict[str, dict]" = OrderedDict()
+_verified_lock = threading.Lock()
+
 class TokenManager:
     """
     JWT 토큰 관리 클래스
     """
     
+    @staticmethod
+    def _claims(expire: datetime) -> dict:
+        """공통 클레임 (만료, 발급 시각, 토큰 고유 ID)"""
+        return {"exp": expire, "iat": datetime.utcnow(), "jti": uuid.uuid4().hex}
+    
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         """
@@ -41,7 +56,7 @@ class TokenManager:
         else:
             expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
-        to_encode.update({"exp": expire})
+        to_encode.update(TokenManager._claims(expire))
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
     
@@ -52,7 +67,7 @@ class TokenManager:
         """
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-        to_encode.update({"exp": expire})
+        to_encode.update(TokenManager._claims(expire))
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
     
@@ -61,15 +76,29 @@ class TokenManager:
         """
         토큰 검증 및 페이로드 반환
         """
+        with _verified_lock:
+            payload = _verified_tokens.get(token)
+            if payload is not None:
+                if payload.get("exp", 0) > time.time():
+                    _verified_tokens.move_to_end(token)
+                    return payload
+                # 만료된 토큰은 아래에서 다시 검증 (만료 오류 발생)
+                del _verified_tokens[token]
+        
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return payload
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="토큰이 유효하지 않습니다",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        
+        with _verified_lock:
+            _verified_tokens[token] = payload
+            while len(_verified_tokens) > VERIFIED_TOKEN_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
+        return payload
     
     @staticmethod
     def get_user_id_from_token(token: str) -> int:
@@ -4,7 +4,7 @@
 """
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from models import WinningNumber
+from models import WinningNumber, DrawAggregate
 
 DATABASE_URL = "sqlite:///./lotto_app.db"
 
@@ -35,6 +35,7 @@ def clear_winning_numbers():
         
         # 모든 당첨번호 삭제
         deleted = db.query(WinningNumber).delete()
+        db.query(DrawAggregate).delete()  # 통계 집계도 함께 초기화
         db.commit()
         
         # 삭제 후 개수 확인
@@ -0,0 +1,279 @@
+"""
+로또 전체 조합(C(45,6) = 8,145,060개) 인덱스
+- rank/unrank: 조합 <-> 0 ~ 8,145,059 정수 (colex 순서의 조합 번호 체계)
+- 조합별 특성(합계, 짝수 개수, 최장 연속, 구간 분포)과 is_plausible 비트맵을
+  memory-mapped 파일로 미리 만들어 두고 조회/개수 계산에 사용
+
+빌드 (배포 전 1회, 약 10초):
+    python combination_index.py build [출력 디렉터리]
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from math import comb
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from plausible_sampler import MAX_RUN, MAX_PER_BLOCK, MIN_EVENS, MAX_EVENS, MIN_SUM, MAX_SUM
+
+logger = logging.getLogger(__name__)
+
+LOTTO_MAX = 45
+PICK = 6
+TOTAL_COMBINATIONS = comb(LOTTO_MAX, PICK)  # 8,145,060
+
+INDEX_DIR = Path(os.getenv("COMBINATION_INDEX_DIR", "combination_index"))
+FEATURES_FILE = "features.npy"
+BITMAP_FILE = "plausible_bitmap.npy"
+PLAUSIBLE_RANKS_FILE = "plausible_ranks.npy"
+HISTOGRAM_FILE = "feature_histogram.npy"
+META_FILE = "meta.json"
+
+BUILD_CHUNK = 1 << 20
+DECADE_COUNT = 5
+DECADE_BASE = PICK + 1  # 구간별 개수(0~6)를 7진수 자리로 인코딩
+
+FEATURE_DTYPE = np.dtype([
+    ("sum", np.uint8),        # 합계 (21~255)
+    ("evens", np.uint8),      # 짝수 개수
+    ("max_run", np.uint8),    # 최장 연속 길이
+    ("decades", np.uint16),   # 구간(1-10, ..., 41-45)별 개수, 7진수 인코딩
+])
+
+# 특성 조합별 개수 표의 축: (합계, 짝수 개수, 최장 연속, 구간 최대 개수, is_plausible)
+HISTOGRAM_SHAPE = (256, PICK + 1, PICK + 1, PICK + 1, 2)
+
+# _BINOM[k][x] = C(x, k)  (x = 0..45)
+_BINOM = np.array([[comb(x, k) for x in range(LOTTO_MAX + 1)] for k in range(PICK + 1)], dtype=np.int64)
+
+
+# -----------------------------
+# rank / unrank
+# -----------------------------
+def rank(numbers: List[int]) -> int:
+    """정렬 여부와 상관없이 번호 6개 -> 조합 번호 (colex)"""
+    nums = sorted(numbers)
+    if len(nums) != PICK or len(set(nums)) != PICK or nums[0] < 1 or nums[-1] > LOTTO_MAX:
+        raise ValueError("1~45 사이의 서로 다른 번호 6개가 필요합니다")
+    return sum(comb(n - 1, i + 1) for i, n in enumerate(nums))
+
+
+def unrank(r: int) -> List[int]:
+    """조합 번호 -> 정렬된 번호 6개"""
+    return unrank_many(np.array([r], dtype=np.int64))[0].tolist()
+
+
+def rank_many(sets) -> np.ndarray:
+    """(N, 6) 정렬된 번호 배열 -> 조합 번호 배열"""
+    sets = np.asarray(sets, dtype=np.int64) - 1
+    return sum(_BINOM[i + 1][sets[:, i]] for i in range(PICK))
+
+
+def unrank_many(ranks) -> np.ndarray:
+    """조합 번호 배열 -> (N, 6) 정렬된 번호 배열"""
+    r = np.array(ranks, dtype=np.int64)
+    if r.size and (r.min() < 0 or r.max() >= TOTAL_COMBINATIONS):
+        raise ValueError(f"조합 번호는 0 ~ {TOTAL_COMBINATIONS - 1} 범위여야 합니다")
+    out = np.empty((len(r), PICK), dtype=np.int64)
+    for i in range(PICK - 1, -1, -1):
+        # C(x, i+1) <= r 인 가장 큰 x
+        x = np.searchsorted(_BINOM[i + 1], r, side="right") - 1
+        out[:, i] = x + 1
+        r = r - _BINOM[i + 1][x]
+    return out
+
+
+# -----------------------------
+# 특성 계산 / 빌드
+# -----------------------------
+def compute_features(sets: np.ndarray) -> np.ndarray:
+    """(N, 6) 정렬 배열의 조합별 특성 (FEATURE_DTYPE)"""
+    features = np.empty(len(sets), dtype=FEATURE_DTYPE)
+    features["sum"] = sets.sum(axis=1)
+    features["evens"] = (sets % 2 == 0).sum(axis=1)
+
+    step = np.diff(sets, axis=1) == 1
+    run = np.ones(len(sets), dtype=np.int64)
+    max_run = run.copy()
+    for i in range(PICK - 1):
+        run = np.where(step[:, i], run + 1, 1)
+        max_run = np.maximum(max_run, run)
+    features["max_run"] = max_run
+
+    decades = np.minimum((sets - 1) // 10, DECADE_COUNT - 1)
+    features["decades"] = (DECADE_BASE ** decades).sum(axis=1)
+    return features
+
+
+def decade_counts(encoded) -> np.ndarray:
+    """7진수 인코딩된 구간 분포 -> (N, 5) 구간별 개수"""
+    encoded = np.asarray(encoded, dtype=np.int64)
+    return np.stack([(encoded // DECADE_BASE ** d) % DECADE_BASE for d in range(DECADE_COUNT)], axis=-1)
+
+
+def decades_within(encoded, limit: int) -> np.ndarray:
+    """모든 구간의 개수가 limit 이하인지 (큰 배열용, 구간별로 순회)"""
+    encoded = np.asarray(encoded, dtype=np.int32)
+    mask = np.ones(encoded.shape, dtype=bool)
+    for d in range(DECADE_COUNT):
+        mask &= (encoded // DECADE_BASE ** d) % DECADE_BASE <= limit
+    return mask
+
+
+def feature_histogram(features: np.ndarray, plausible: np.ndarray) -> np.ndarray:
+    """특성 조합별 조합 개수 (HISTOGRAM_SHAPE), count()는 이 표의 부분합으로 계산"""
+    max_decade = decade_counts(features["decades"]).max(axis=-1)
+    flat = np.ravel_multi_index(
+        (features["sum"], features["evens"], features["max_run"], max_decade, plausible.astype(np.int64)),
+        HISTOGRAM_SHAPE,
+    )
+    return np.bincount(flat, minlength=int(np.prod(HISTOGRAM_SHAPE))).reshape(HISTOGRAM_SHAPE)
+
+
+def plausible_from_features(features: np.ndarray) -> np.ndarray:
+    """lott.is_plausible과 같은 규칙을 특성 배열에 적용"""
+    return (
+        (features["max_run"] <= MAX_RUN) & decades_within(features["decades"], MAX_PER_BLOCK) &
+        (features["evens"] >= MIN_EVENS) & (features["evens"] <= MAX_EVENS) &
+        (features["sum"] >= MIN_SUM) & (features["sum"] <= MAX_SUM)
+    )
+
+
+def build_index(out_dir: Path = INDEX_DIR) -> dict:
+    """전체 조합을 청크 단위로 펼쳐 특성/비트맵/유효 조합 번호/특성별 개수 파일 생성"""
+    started = time.time()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    features = np.lib.format.open_memmap(
+        out_dir / FEATURES_FILE, mode="w+", dtype=FEATURE_DTYPE, shape=(TOTAL_COMBINATIONS,)
+    )
+    mask = np.empty(TOTAL_COMBINATIONS, dtype=bool)
+    histogram = np.zeros(HISTOGRAM_SHAPE, dtype=np.int64)
+    for start in range(0, TOTAL_COMBINATIONS, BUILD_CHUNK):
+        stop = min(start + BUILD_CHUNK, TOTAL_COMBINATIONS)
+        chunk = compute_features(unrank_many(np.arange(start, stop)))
+        features[start:stop] = chunk
+        mask[start:stop] = plausible_from_features(chunk)
+        histogram += feature_histogram(chunk, mask[start:stop])
+    features.flush()
+    del features
+
+    plausible_ranks = np.flatnonzero(mask).astype(np.uint32)
+    np.save(out_dir / BITMAP_FILE, np.packbits(mask))
+    np.save(out_dir / PLAUSIBLE_RANKS_FILE, plausible_ranks)
+    np.save(out_dir / HISTOGRAM_FILE, histogram)
+
+    meta = {
+        "total": TOTAL_COMBINATIONS,
+        "plausible": int(len(plausible_ranks)),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    (out_dir / META_FILE).write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info(f"🧮 조합 인덱스 생성 완료: 유효 조합 {meta['plausible']:,}개 ({time.time() - started:.1f}초)")
+    return meta
+
+
+# -----------------------------
+# 조회
+# -----------------------------
+class CombinationIndex:
+    """memory-mapped 조합 인덱스 (읽기 전용)"""
+
+    def __init__(self, index_dir: Path = INDEX_DIR):
+        index_dir = Path(index_dir)
+        self.meta = json.loads((index_dir / META_FILE).read_text(encoding="utf-8"))
+        self.features = np.load(index_dir / FEATURES_FILE, mmap_mode="r")
+        self.bitmap = np.load(index_dir / BITMAP_FILE, mmap_mode="r")
+        self.plausible_ranks = np.load(index_dir / PLAUSIBLE_RANKS_FILE, mmap_mode="r")
+        histogram_path = index_dir / HISTOGRAM_FILE
+        if histogram_path.exists():
+            self.histogram = np.load(histogram_path)
+        else:
+            # 예전 빌드에는 개수 표가 없으므로 로드할 때 한 번만 계산
+            plausible = np.unpackbits(self.bitmap, count=TOTAL_COMBINATIONS).astype(bool)
+            self.histogram = np.zeros(HISTOGRAM_SHAPE, dtype=np.int64)
+            for start in range(0, TOTAL_COMBINATIONS, BUILD_CHUNK):
+                stop = min(start + BUILD_CHUNK, TOTAL_COMBINATIONS)
+                self.histogram += feature_histogram(self.features[start:stop], plausible[start:stop])
+
+    @property
+    def plausible_count(self) -> int:
+        return len(self.plausible_ranks)
+
+    def is_plausible(self, r: int) -> bool:
+        return bool(self.bitmap[r >> 3] & (0x80 >> (r & 7)))
+
+    def describe(self, numbers: List[int]) -> dict:
+        """번호 6개의 조합 번호와 특성"""
+        r = rank(numbers)
+        f = self.features[r]
+        return {
+            "rank": r,
+            "numbers": unrank(r),
+            "sum": int(f["sum"]),
+            "evens": int(f["evens"]),
+            "max_run": int(f["max_run"]),
+            "decades": decade_counts(f["decades"]).tolist(),
+            "plausible": self.is_plausible(r),
+        }
+
+    def count(self,
+              sum_min: Optional[int] = None,
+              sum_max: Optional[int] = None,
+              evens_min: Optional[int] = None,
+              evens_max: Optional[int] = None,
+              max_run: Optional[int] = None,
+              max_per_decade: Optional[int] = None,
+              plausible_only: bool = False) -> int:
+        """
+        조건을 모두 만족하는 조합 개수 (지정하지 않은 조건은 무시)
+        빌드 때 만든 특성별 개수 표의 부분합이므로 조합 전체를 다시 훑지 않음
+        """
+        sums, evens, runs, decades, plausible = HISTOGRAM_SHAPE
+        selection = (
+            _axis_range(sum_min, sum_max, sums),
+            _axis_range(evens_min, evens_max, evens),
+            _axis_range(None, max_run, runs),
+            _axis_range(None, max_per_decade, decades),
+            slice(1, 2) if plausible_only else slice(0, plausible),
+        )
+        return int(self.histogram[selection].sum())
+
+
+def _axis_range(low: Optional[int], high: Optional[int], size: int) -> slice:
+    """이상/이하 조건 -> 개수 표 한 축의 slice (범위를 벗어나면 빈 slice)"""
+    start = 0 if low is None else min(max(low, 0), size)
+    stop = size if high is None else min(max(high + 1, 0), size)
+    return slice(start, max(start, stop))
+
+
+_index: Optional[CombinationIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_combination_index() -> Optional[CombinationIndex]:
+    """인덱스 파일이 있으면 한 번만 열어서 공유, 없으면 None"""
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None and (INDEX_DIR / META_FILE).exists():
+            _index = CombinationIndex(INDEX_DIR)
+            logger.info(f"🧮 조합 인덱스 로드: 유효 조합 {_index.plausible_count:,}개")
+        return _index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("사용법: python combination_index.py build [출력 디렉터리]")
+        sys.exit(1)
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else INDEX_DIR
+    meta = build_index(target)
+    print(f"✅ {target}: 전체 {meta['total']:,}개 중 유효 조합 {meta['plausible']:,}개")
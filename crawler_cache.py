@@ -0,0 +1,218 @@
+"""
+크롤러 응답 디스크 캐시
+발표된 회차의 당첨 번호는 바뀌지 않으므로 한 번 받은 원본 응답과 파싱 결과를 저장해 두고
+DB를 비운 뒤 재수집하거나 파서를 고친 뒤 다시 파싱할 때 네트워크 없이 사용
+
+디렉터리 구조 (CRAWLER_CACHE_DIR, 기본 crawler_cache/):
+    blobs/ab/abcdef....gz      원본 응답 (sha256 기준 content-addressed, gzip)
+    draws/naver/1205.json      회차별 메타데이터 + 파싱 결과
+
+메타데이터:
+    {"source", "draw_no", "url", "fetched_at", "sha256", "size", "complete",
+     "parser_version", "parsed"}
+
+사용:
+    python crawler_cache.py stats     # 저장된 회차 수 / 용량
+    python crawler_cache.py verify    # 원본 해시 검증
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from draw_files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# 빈 문자열이면 캐시 사용 안 함
+CACHE_DIR = os.getenv("CRAWLER_CACHE_DIR", "crawler_cache")
+BLOBS_DIR = "blobs"
+DRAWS_DIR = "draws"
+
+
+def cache_enabled() -> bool:
+    return bool(CACHE_DIR)
+
+
+def _root() -> Path:
+    return Path(CACHE_DIR)
+
+
+def _blob_path(digest: str) -> Path:
+    return _root() / BLOBS_DIR / digest[:2] / f"{digest}.gz"
+
+
+def _meta_path(source: str, draw_no: int) -> Path:
+    return _root() / DRAWS_DIR / source / f"{draw_no}.json"
+
+
+def _read_meta(source: str, draw_no: int) -> Optional[Dict]:
+    path = _meta_path(source, draw_no)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️ 캐시 메타데이터 손상 ({path}): {e}")
+        return None
+
+
+def _write_meta(meta: Dict):
+    data = json.dumps(meta, ensure_ascii=False, indent=1).encode("utf-8")
+    atomic_write(_meta_path(meta["source"], meta["draw_no"]), data)
+
+
+def store_draw(source: str,
+               draw_no: int,
+               url: str,
+               raw: str,
+               parsed: Dict,
+               parser_version: int,
+               complete: bool = True) -> Optional[Dict]:
+    """
+    원본 응답과 파싱 결과 저장
+    complete=False: 필요한 부분까지만 읽은 응답 (스트리밍 파서)
+    Returns: 저장한 메타데이터 (캐시 비활성/실패 시 None)
+    """
+    if not cache_enabled():
+        return None
+    try:
+        body = raw.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        blob = _blob_path(digest)
+        if not blob.exists():
+            atomic_write(blob, gzip.compress(body))
+
+        meta = {
+            "source": source,
+            "draw_no": draw_no,
+            "url": url,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "sha256": digest,
+            "size": len(body),
+            "complete": complete,
+            "parser_version": parser_version,
+            "parsed": parsed,
+        }
+        _write_meta(meta)
+        logger.info(f"🗄️ {draw_no}회차 응답 캐시 저장 ({source}, {len(body):,}바이트)")
+        return meta
+    except Exception as e:
+        logger.warning(f"⚠️ {draw_no}회차 응답 캐시 저장 실패: {e}")
+        return None
+
+
+def load_raw(meta: Dict) -> Optional[str]:
+    """메타데이터가 가리키는 원본 응답 (해시가 맞지 않으면 None)"""
+    try:
+        body = gzip.decompress(_blob_path(meta["sha256"]).read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️ 캐시 원본 읽기 실패 ({meta['sha256'][:12]}): {e}")
+        return None
+    if hashlib.sha256(body).hexdigest() != meta["sha256"]:
+        logger.warning(f"⚠️ 캐시 원본 해시 불일치 ({meta['source']} {meta['draw_no']}회)")
+        return None
+    return body.decode("utf-8")
+
+
+def get_cached_draw(source: str,
+                    draw_no: int,
+                    parser_version: int,
+                    parse: Optional[Callable[[str, int], Optional[Dict]]] = None) -> Optional[Dict]:
+    """
+    캐시된 파싱 결과
+    저장할 때의 파서 버전이 현재(parser_version)와 다르면 원본을 parse(raw, draw_no)로 다시 파싱해 갱신
+    (parse가 없거나 원본이 없으면 None → 호출한 쪽에서 새로 받음)
+    """
+    if not cache_enabled():
+        return None
+    meta = _read_meta(source, draw_no)
+    if meta is None:
+        return None
+    if meta.get("parser_version") == parser_version and meta.get("parsed"):
+        return meta["parsed"]
+    if parse is None:
+        return None
+
+    raw = load_raw(meta)
+    if raw is None:
+        return None
+    parsed = parse(raw, draw_no)
+    if not parsed:
+        logger.warning(f"⚠️ {draw_no}회차 캐시 원본 재파싱 실패 (파서 v{parser_version})")
+        return None
+
+    logger.info(f"♻️ {draw_no}회차 캐시 원본 재파싱 (파서 v{meta.get('parser_version')} → v{parser_version})")
+    meta["parser_version"] = parser_version
+    meta["parsed"] = parsed
+    try:
+        _write_meta(meta)
+    except Exception as e:
+        logger.warning(f"⚠️ {draw_no}회차 캐시 메타데이터 갱신 실패: {e}")
+    return parsed
+
+
+def cached_draw_numbers(source: str) -> List[int]:
+    """source로 저장된 회차 목록 (오름차순)"""
+    directory = _root() / DRAWS_DIR / source
+    if not cache_enabled() or not directory.exists():
+        return []
+    return sorted(int(p.stem) for p in directory.glob("*.json") if p.stem.isdigit())
+
+
+def cache_stats() -> Dict:
+    """소스별 회차 수와 원본 용량"""
+    root = _root()
+    sources = {}
+    if (root / DRAWS_DIR).exists():
+        for directory in sorted((root / DRAWS_DIR).iterdir()):
+            if directory.is_dir():
+                draws = cached_draw_numbers(directory.name)
+                sources[directory.name] = {
+                    "draws": len(draws),
+                    "first_draw": draws[0] if draws else None,
+                    "last_draw": draws[-1] if draws else None,
+                }
+    blobs = list((root / BLOBS_DIR).glob("*/*.gz")) if (root / BLOBS_DIR).exists() else []
+    return {
+        "dir": str(root),
+        "sources": sources,
+        "blobs": len(blobs),
+        "blob_bytes": sum(p.stat().st_size for p in blobs),
+    }
+
+
+def verify_cache() -> Dict:
+    """모든 회차의 원본 해시 검증 → {"ok", "missing", "corrupt"} 개수"""
+    result = {"ok": 0, "missing": 0, "corrupt": 0}
+    for source in cache_stats()["sources"]:
+        for draw_no in cached_draw_numbers(source):
+            meta = _read_meta(source, draw_no)
+            if meta is None:
+                result["corrupt"] += 1
+            elif not _blob_path(meta["sha256"]).exists():
+                result["missing"] += 1
+            elif load_raw(meta) is None:
+                result["corrupt"] += 1
+            else:
+                result["ok"] += 1
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "stats":
+        print(json.dumps(cache_stats(), ensure_ascii=False, indent=2))
+    elif command == "verify":
+        print(json.dumps(verify_cache(), ensure_ascii=False, indent=2))
+    else:
+        print("사용법: python crawler_cache.py [stats|verify]")
+        sys.exit(1)
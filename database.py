@@ -27,7 +27,14 @@ if DATABASE_URL.startswith("sqlite"):
     )
 else:
     # PostgreSQL, MySQL 등을 위한 설정
-    engine = create_engine(DATABASE_URL)
+    # API 핸들러는 스레드풀에서 동시에 실행되므로 커넥션 풀을 스레드 수에 맞춰 조정
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_pre_ping=True
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,237 @@
+"""
+당첨 번호 통계 집계 테이블 관리
+새 회차가 저장될 때 전체/최근 N회차 집계를 증분(delta)으로 갱신
+"""
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import DrawAggregate, WinningNumber
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_RECENT_DRAWS = 20  # 대시보드 기본 최근 회차 수
+
+SCOPE_TOTAL = "total"
+SCOPE_RECENT = "recent"
+
+CATEGORIES = ("number", "decade", "parity", "sum", "consecutive")
+INT_KEY_CATEGORIES = ("number", "sum")
+
+DECADE_LABELS = ("1-10", "11-20", "21-30", "31-40", "41-45")
+CONSECUTIVE_LABELS = ("none", "two", "three", "four_plus")
+
+
+def decade_label(number: int) -> str:
+    """번호가 속한 십의 자리 구간 (41~45는 한 구간)"""
+    return DECADE_LABELS[min((number - 1) // 10, 4)]
+
+
+def consecutive_label(numbers: List[int]) -> str:
+    """가장 긴 연속번호 길이로 분류 (none, two, three, four_plus)"""
+    s = sorted(numbers)
+    max_consecutive = 1
+    current_consecutive = 1
+    for i in range(1, len(s)):
+        if s[i] == s[i-1] + 1:
+            current_consecutive += 1
+            max_consecutive = max(max_consecutive, current_consecutive)
+        else:
+            current_consecutive = 1
+    return CONSECUTIVE_LABELS[min(max_consecutive, 4) - 1]
+
+
+def draw_keys(numbers: List[int]) -> List[Tuple[str, object]]:
+    """한 회차(번호 6개)가 기여하는 (category, key) 목록"""
+    keys = []
+    for n in numbers:
+        keys.append(("number", n))
+        keys.append(("decade", decade_label(n)))
+        keys.append(("parity", "even" if n % 2 == 0 else "odd"))
+    keys.append(("sum", sum(numbers)))
+    keys.append(("consecutive", consecutive_label(numbers)))
+    return keys
+
+
+def aggregate_draws(draws: Iterable[List[int]]) -> Dict[str, Counter]:
+    """
+    회차 목록을 카테고리별 Counter로 집계
+    number/sum 카테고리의 키는 int, 나머지는 문자열
+    """
+    result = {category: Counter() for category in CATEGORIES}
+    for numbers in draws:
+        for category, key in draw_keys(numbers):
+            result[category][key] += 1
+    return result
+
+
+# -----------------------------
+# 집계 테이블 갱신
+# -----------------------------
+def _load_rows(db: Session) -> Dict[Tuple[str, str, str], DrawAggregate]:
+    return {(row.scope, row.category, row.key): row for row in db.query(DrawAggregate).all()}
+
+
+def _add(db: Session, rows: Dict, scope: str, category: str, key, delta: int):
+    row_key = (scope, category, str(key))
+    row = rows.get(row_key)
+    if row is None:
+        row = DrawAggregate(scope=scope, category=category, key=str(key), count=0)
+        db.add(row)
+        rows[row_key] = row
+    row.count += delta
+
+
+def _set_meta(db: Session, rows: Dict, key: str, value: int):
+    _add(db, rows, SCOPE_TOTAL, "meta", key, 0)
+    rows[(SCOPE_TOTAL, "meta", key)].count = value
+
+
+def _apply_draw(db: Session, rows: Dict, scope: str, numbers: List[int], sign: int):
+    for category, key in draw_keys(numbers):
+        _add(db, rows, scope, category, key, sign)
+
+
+def _numbers_of(winning: WinningNumber) -> List[int]:
+    return [winning.number1, winning.number2, winning.number3,
+            winning.number4, winning.number5, winning.number6]
+
+
+def rebuild_aggregates(db: Session):
+    """
+    winning_numbers 전체를 다시 읽어 집계 테이블 재생성 (commit은 호출자가 수행)
+    최초 실행 또는 집계가 실제 데이터와 어긋났을 때만 사용
+    """
+    rows = db.query(
+        WinningNumber.draw_number,
+        WinningNumber.number1, WinningNumber.number2, WinningNumber.number3,
+        WinningNumber.number4, WinningNumber.number5, WinningNumber.number6
+    ).order_by(WinningNumber.draw_number.desc()).all()
+
+    draws = [list(row[1:7]) for row in rows]
+    scopes = {
+        SCOPE_TOTAL: aggregate_draws(draws),
+        SCOPE_RECENT: aggregate_draws(draws[:AGGREGATE_RECENT_DRAWS]),
+    }
+
+    db.query(DrawAggregate).delete()
+    for scope, categories in scopes.items():
+        for category, counter in categories.items():
+            for key, count in counter.items():
+                db.add(DrawAggregate(scope=scope, category=category, key=str(key), count=count))
+    db.add(DrawAggregate(scope=SCOPE_TOTAL, category="meta", key="draw_count", count=len(rows)))
+    db.add(DrawAggregate(scope=SCOPE_TOTAL, category="meta", key="last_draw",
+                         count=rows[0][0] if rows else 0))
+    db.flush()
+    logger.info(f"📊 통계 집계 테이블 재생성: {len(rows)}개 회차")
+
+
+def apply_new_draw(db: Session, winning: WinningNumber):
+    """
+    새로 추가된(flush된) 회차를 집계 테이블에 delta로 반영 (commit은 호출자가 수행)
+
+    - 전체 집계: 해당 회차만 더함
+    - 최근 N회차 집계: 새 회차를 더하고 윈도우 밖으로 밀려난 회차를 뺌
+    - 과거 회차 백필로 최근 윈도우가 바뀌거나 집계가 어긋나 있으면 재생성
+    """
+    db.flush()
+    rows = _load_rows(db)
+    draw_count = rows.get((SCOPE_TOTAL, "meta", "draw_count"))
+    last_draw = rows.get((SCOPE_TOTAL, "meta", "last_draw"))
+    actual_count = db.query(func.count(WinningNumber.id)).scalar()
+
+    if draw_count is None or last_draw is None or draw_count.count != actual_count - 1:
+        rebuild_aggregates(db)
+        return
+
+    if winning.draw_number < last_draw.count:
+        # 과거 회차 백필: 최근 윈도우에 들어가는 회차면 재생성
+        window_floor = db.query(WinningNumber.draw_number).order_by(
+            WinningNumber.draw_number.desc()
+        ).offset(AGGREGATE_RECENT_DRAWS).limit(1).scalar()
+        if window_floor is None or winning.draw_number > window_floor:
+            rebuild_aggregates(db)
+            return
+
+    numbers = _numbers_of(winning)
+    _apply_draw(db, rows, SCOPE_TOTAL, numbers, +1)
+    _set_meta(db, rows, "draw_count", actual_count)
+
+    if winning.draw_number > last_draw.count:
+        _apply_draw(db, rows, SCOPE_RECENT, numbers, +1)
+        dropped = db.query(WinningNumber).order_by(
+            WinningNumber.draw_number.desc()
+        ).offset(AGGREGATE_RECENT_DRAWS).first()
+        if dropped is not None:
+            _apply_draw(db, rows, SCOPE_RECENT, _numbers_of(dropped), -1)
+        _set_meta(db, rows, "last_draw", winning.draw_number)
+    db.flush()
+
+
+# -----------------------------
+# 집계 조회
+# -----------------------------
+class DrawAggregates:
+    """조회용 집계 결과 (scope별 카테고리 Counter + 메타 정보)"""
+
+    def __init__(self, scopes: Dict[str, Dict[str, Counter]], draw_count: int, last_draw: int):
+        self.scopes = scopes
+        self.draw_count = draw_count
+        self.last_draw = last_draw
+
+    def get(self, scope: str, category: str) -> Counter:
+        return self.scopes.get(scope, {}).get(category, Counter())
+
+
+_cache: Optional[Tuple[object, DrawAggregates]] = None
+_cache_lock = threading.Lock()
+
+
+def _read_aggregates(db: Session) -> DrawAggregates:
+    scopes = defaultdict(lambda: defaultdict(Counter))
+    meta = {}
+    for scope, category, key, count in db.query(
+        DrawAggregate.scope, DrawAggregate.category, DrawAggregate.key, DrawAggregate.count
+    ).all():
+        if category == "meta":
+            meta[key] = count
+            continue
+        if not count:
+            continue
+        scopes[scope][category][int(key) if category in INT_KEY_CATEGORIES else key] = count
+    return DrawAggregates(scopes, meta.get("draw_count", -1), meta.get("last_draw", -1))
+
+
+def get_draw_aggregates(db: Session, cache_key=None,
+                        expected_count: Optional[int] = None,
+                        expected_last_draw: Optional[int] = None) -> DrawAggregates:
+    """
+    집계 테이블 조회 (cache_key가 같으면 메모리 결과 재사용)
+    기대값(회차 수/최신 회차)과 다르면 집계를 재생성
+    """
+    global _cache
+    cached = _cache
+    if cache_key is not None and cached is not None and cached[0] == cache_key:
+        return cached[1]
+
+    with _cache_lock:
+        aggregates = _read_aggregates(db)
+        stale = (
+            (expected_count is not None and aggregates.draw_count != expected_count) or
+            (expected_last_draw is not None and aggregates.last_draw != (expected_last_draw or 0))
+        )
+        if stale:
+            try:
+                rebuild_aggregates(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            aggregates = _read_aggregates(db)
+        if cache_key is not None:
+            _cache = (cache_key, aggregates)
+        return aggregates
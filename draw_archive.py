@@ -0,0 +1,213 @@
+"""
+지난 회차 당첨 번호 아카이브
+발표가 끝난 회차(최신 회차보다 이전)는 다시 바뀌지 않으므로
+회차별 응답과 100회차 단위 묶음(bundle)을 한 번만 JSON으로 렌더링해 두고
+Cache-Control: immutable 로 내려보냄 (클라이언트/프록시/CDN이 영구 캐시)
+
+최신 회차는 당첨금/당첨자 수가 나중에 채워질 수 있으므로 기존처럼 동적으로 응답
+
+    python draw_archive.py export [디렉터리]   # 정적 파일로 내보내기 (CDN 업로드용, 기본 archive_export/)
+"""
+import hashlib
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy.orm import Session
+
+from models import WinningNumber
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_SIZE = 100  # 묶음 하나에 들어가는 회차 수
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MUTABLE_CACHE_CONTROL = "public, max-age=60"
+
+
+def winning_number_dict(winning: WinningNumber) -> Dict:
+    """WinningNumberResponse와 같은 모양의 딕셔너리"""
+    return {
+        "draw_number": winning.draw_number,
+        "numbers": [winning.number1, winning.number2, winning.number3,
+                    winning.number4, winning.number5, winning.number6],
+        "bonus_number": winning.bonus_number,
+        "draw_date": winning.draw_date,
+        "prize_1st": winning.prize_1st,
+        "prize_2nd": winning.prize_2nd,
+        "prize_3rd": winning.prize_3rd,
+        "prize_4th": winning.prize_4th,
+        "prize_5th": winning.prize_5th,
+        "winners_1st": winning.winners_1st,
+        "total_sales": winning.total_sales,
+    }
+
+
+def render_json(content) -> bytes:
+    """response_model을 거친 FastAPI 응답과 같은 형식으로 직렬화 (UTC 시각은 ...Z)"""
+    return json.dumps(
+        to_jsonable_python(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def body_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class Rendered:
+    """렌더링된 응답 본문 + ETag"""
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = body_etag(body)
+
+
+def bundle_range(bundle_no: int) -> Tuple[int, int]:
+    """bundle_no(1부터)번 묶음의 첫/마지막 회차 (1 → 1~100회)"""
+    first = (bundle_no - 1) * BUNDLE_SIZE + 1
+    return first, first + BUNDLE_SIZE - 1
+
+
+def is_archived(draw_no: int, latest_draw: Optional[int]) -> bool:
+    """최신 회차보다 이전 회차면 더 이상 바뀌지 않는 것으로 봄"""
+    return latest_draw is not None and 1 <= draw_no < latest_draw
+
+
+# 지난 회차만 보관하므로 새 회차가 저장돼도 비우지 않음
+_draws: Dict[int, Rendered] = {}
+_bundles: Dict[int, Rendered] = {}
+_lock = threading.Lock()
+
+
+def get_archived_draw(db: Session, draw_no: int, latest_draw: Optional[int]) -> Optional[Rendered]:
+    """
+    지난 회차 응답 (처음 한 번만 DB에서 읽어 렌더링)
+    최신 회차이거나 DB에 없으면 None → 호출한 쪽에서 동적으로 처리
+    """
+    if not is_archived(draw_no, latest_draw):
+        return None
+    rendered = _draws.get(draw_no)
+    if rendered is not None:
+        return rendered
+
+    winning = db.query(WinningNumber).filter(WinningNumber.draw_number == draw_no).first()
+    if winning is None:
+        return None
+    rendered = Rendered(render_json(winning_number_dict(winning)))
+    with _lock:
+        _draws[draw_no] = rendered
+    return rendered
+
+
+def get_bundle(db: Session, bundle_no: int, latest_draw: Optional[int]) -> Tuple[Optional[Rendered], bool]:
+    """
+    bundle_no번 묶음 응답
+
+    Returns:
+        (렌더링 결과 또는 None(해당 범위에 회차 없음), 고정 여부)
+        묶음의 모든 회차가 지난 회차로 채워져 있어야 고정(immutable)으로 보관
+    """
+    first, last = bundle_range(bundle_no)
+    rendered = _bundles.get(bundle_no)
+    if rendered is not None:
+        return rendered, True
+
+    winnings = db.query(WinningNumber).filter(
+        WinningNumber.draw_number.between(first, last)
+    ).order_by(WinningNumber.draw_number.asc()).all()
+    if not winnings:
+        return None, False
+
+    complete = len(winnings) == BUNDLE_SIZE and is_archived(last, latest_draw)
+    rendered = Rendered(render_json({
+        "bundle": bundle_no,
+        "first_draw": first,
+        "last_draw": last,
+        "complete": complete,
+        "count": len(winnings),
+        "winning_numbers": [winning_number_dict(w) for w in winnings],
+    }))
+    if complete:
+        with _lock:
+            _bundles[bundle_no] = rendered
+    return rendered, complete
+
+
+def bundle_index(db: Session, latest_draw: Optional[int], url_prefix: str) -> Dict:
+    """전체 묶음 목록 (고정된 묶음은 ETag 포함)"""
+    bundles: List[Dict] = []
+    if latest_draw:
+        for bundle_no in range(1, (latest_draw - 1) // BUNDLE_SIZE + 2):
+            first, last = bundle_range(bundle_no)
+            rendered, complete = get_bundle(db, bundle_no, latest_draw)
+            bundles.append({
+                "bundle": bundle_no,
+                "first_draw": first,
+                "last_draw": min(last, latest_draw),
+                "complete": complete,
+                "url": f"{url_prefix}/{bundle_no}",
+                "etag": rendered.etag if complete else None,
+            })
+    return {
+        "bundle_size": BUNDLE_SIZE,
+        "latest_draw": latest_draw,
+        "bundles": bundles,
+    }
+
+
+def invalidate_draw_archive(draw_numbers: Optional[List[int]] = None):
+    """
+    지난 회차를 고쳐 저장했을 때 호출 (수동 덮어쓰기 등)
+    이미 immutable로 내려간 응답은 클라이언트 캐시에 남으므로 서버 쪽만 다시 렌더링됨
+    """
+    with _lock:
+        if draw_numbers is None:
+            _draws.clear()
+            _bundles.clear()
+            return
+        for draw_no in draw_numbers:
+            _draws.pop(draw_no, None)
+            _bundles.pop((draw_no - 1) // BUNDLE_SIZE + 1, None)
+
+
+def export_archive(db: Session, directory: Path) -> Dict:
+    """고정된 묶음과 목록을 정적 파일로 저장 (index.json, bundle-0001.json ...)"""
+    from sqlalchemy import func
+
+    directory.mkdir(parents=True, exist_ok=True)
+    latest_draw = db.query(func.max(WinningNumber.draw_number)).scalar()
+    index = bundle_index(db, latest_draw, url_prefix=".")
+    written = 0
+    for item in index["bundles"]:
+        if not item["complete"]:
+            continue
+        rendered, _ = get_bundle(db, item["bundle"], latest_draw)
+        filename = f"bundle-{item['bundle']:04d}.json"
+        (directory / filename).write_bytes(rendered.body)
+        item["url"] = f"./{filename}"
+        written += 1
+    (directory / "index.json").write_bytes(render_json(index))
+    return {"directory": str(directory), "bundles": written, "latest_draw": latest_draw}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 2 or sys.argv[1] != "export":
+        print("사용법: python draw_archive.py export [디렉터리]")
+        sys.exit(1)
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        target = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("archive_export")
+        print(json.dumps(export_archive(db, target), ensure_ascii=False))
+    finally:
+        db.close()
@@ -0,0 +1,83 @@
+"""
+번들 당첨 번호 파일(lotto_draws.json)로 빈 DB 일괄 적재
+{"1": {drwNo, drwtNo1~6, bnusNo, ...}, "2": {...}} 형식 또는 lott.py 수집기의 JSONL 로그를
+회차 단위로 읽어 UPSERT_CHUNK_SIZE개씩 일괄 저장 → 나머지 회차만 네트워크로 수집
+(파일 전체를 메모리에 올리지 않음)
+
+    python draw_bootstrap.py [파일 경로]
+"""
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from lotto_crawler import UPSERT_CHUNK_SIZE, upsert_winning_numbers
+from draw_files import iter_draw_file
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_DRAWS_PATH = Path(os.getenv("BUNDLED_DRAWS_PATH", Path(__file__).parent / "lotto_draws.json"))
+
+_NUMBER_KEYS = ("drwtNo1", "drwtNo2", "drwtNo3", "drwtNo4", "drwtNo5", "drwtNo6", "bnusNo")
+
+
+def _is_valid_draw(draw: Dict) -> bool:
+    if draw.get("returnValue", "success") != "success" or not isinstance(draw.get("drwNo"), int):
+        return False
+    numbers = [draw.get(key) for key in _NUMBER_KEYS]
+    return all(isinstance(n, int) and 1 <= n <= 45 for n in numbers)
+
+
+def load_bundled_draws(db: Session, path: Optional[Path] = None, chunk_size: int = UPSERT_CHUNK_SIZE) -> Dict:
+    """
+    번들 파일의 회차를 읽는 대로 chunk_size개씩 DB에 저장 (이미 있는 회차는 건너뜀)
+    청크마다 commit하므로 중간에 실패해도 다시 실행하면 남은 회차부터 이어서 저장
+
+    Returns:
+        {"loaded", "invalid", "last_draw", "elapsed"} (파일이 없으면 loaded=0)
+    """
+    path = Path(path or BUNDLED_DRAWS_PATH)
+    started = time.time()
+    if not path.exists():
+        logger.info(f"ℹ️ 번들 당첨 번호 파일 없음: {path}")
+        return {"loaded": 0, "invalid": 0, "last_draw": None, "elapsed": 0.0}
+
+    loaded = 0
+    invalid = 0
+    last_draw = None
+    chunk: List[Dict] = []
+    for draw in iter_draw_file(path):
+        if not _is_valid_draw(draw):
+            invalid += 1
+            continue
+        chunk.append(draw)
+        last_draw = max(last_draw or 0, draw["drwNo"])
+        if len(chunk) >= chunk_size:
+            loaded += upsert_winning_numbers(db, chunk, chunk_size=chunk_size)["inserted"]
+            chunk.clear()
+    if chunk:
+        loaded += upsert_winning_numbers(db, chunk, chunk_size=chunk_size)["inserted"]
+
+    elapsed = time.time() - started
+    logger.info(f"📦 번들 파일에서 {loaded}개 회차 적재 (마지막 {last_draw}회, "
+                f"잘못된 항목 {invalid}개, {elapsed:.2f}초)")
+    return {"loaded": loaded, "invalid": invalid, "last_draw": last_draw, "elapsed": elapsed}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from database import SessionLocal, engine
+    from models import Base
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        result = load_bundled_draws(db, Path(sys.argv[1]) if len(sys.argv) > 1 else None)
+        print(json.dumps(result, ensure_ascii=False))
+    finally:
+        db.close()
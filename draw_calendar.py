@@ -0,0 +1,45 @@
+"""
+로또 추첨 일정 계산
+1회차(2002-12-07)부터 매주 토요일 추첨 → 날짜만으로 현재 회차를 추정할 수 있음
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+KST = timezone(timedelta(hours=9))
+
+FIRST_DRAW_DATE = date(2002, 12, 7)   # 1회차 추첨일 (토요일)
+DRAW_RESULT_TIME = time(20, 45)       # 추첨 결과 발표 시각 (KST)
+DRAW_INTERVAL = timedelta(days=7)
+
+
+def _now_kst(now: Optional[datetime] = None) -> datetime:
+    if now is None:
+        return datetime.now(KST)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=KST)
+    return now.astimezone(KST)
+
+
+def draw_datetime(draw_no: int) -> datetime:
+    """draw_no회차 결과 발표 시각 (KST)"""
+    day = FIRST_DRAW_DATE + DRAW_INTERVAL * (draw_no - 1)
+    return datetime.combine(day, DRAW_RESULT_TIME, tzinfo=KST)
+
+
+def draw_date(draw_no: int) -> date:
+    """draw_no회차 추첨일"""
+    return FIRST_DRAW_DATE + DRAW_INTERVAL * (draw_no - 1)
+
+
+def expected_latest_draw(now: Optional[datetime] = None) -> int:
+    """now 시점에 결과가 발표됐어야 하는 마지막 회차 (1회차 이전이면 0)"""
+    now = _now_kst(now)
+    first = draw_datetime(1)
+    if now < first:
+        return 0
+    return (now - first) // DRAW_INTERVAL + 1
+
+
+def next_draw_datetime(now: Optional[datetime] = None) -> datetime:
+    """now 이후 다음 결과 발표 시각"""
+    return draw_datetime(expected_latest_draw(now) + 1)
@@ -0,0 +1,256 @@
+"""
+회차 데이터 파일 입출력 (lott.py 수집기 / draw_bootstrap 공용)
+
+- lotto_draws.json  : {"1": {...}, "2": {...}} 형식 (예전 수집기 / 번들 파일)
+- lotto_draws.jsonl : 한 줄에 회차 하나씩 추가만 하는 로그 (수집 중 바로 기록)
+  + lotto_draws.index.json : 마지막 회차 / 회차 수 / 기록된 바이트 수
+
+파일 전체를 메모리에 올리지 않고 회차 단위로 읽고 씀
+"""
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Union
+
+_READ_CHUNK = 1 << 16
+INDEX_EVERY = 20  # 회차 n개를 추가할 때마다 인덱스 갱신
+
+
+def atomic_write(path: Path, data: Union[bytes, str]):
+    """
+    임시 파일에 쓴 뒤 교체 (동시에 쓰거나 중간에 죽어도 깨진 파일이 남지 않고 이전 파일이 그대로 남음)
+    data가 str이면 UTF-8로 저장, 상위 디렉터리가 없으면 만듦
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def iter_keyed_draws(path: Path, chunk_size: int = _READ_CHUNK) -> Iterator[Dict]:
+    """
+    {"회차": {...}, ...} 형식 파일에서 회차 딕셔너리를 하나씩 읽음
+    파일 전체를 한 번에 json.loads 하지 않고 chunk_size씩 읽어 항목 단위로 디코딩
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            """버퍼에 다음 조각 추가 (이미 처리한 앞부분은 버림)"""
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def next_char() -> str:
+            """공백을 건너뛴 다음 문자 (pos는 그 문자 위치)"""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ""
+
+        def decode():
+            """pos 위치의 JSON 값 하나 디코딩 (값이 조각 경계에 걸리면 더 읽음)"""
+            nonlocal pos
+            next_char()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # 숫자/문자열이 버퍼 끝에서 잘렸을 수 있으므로 끝에 닿았으면 더 읽고 다시 시도
+                    if end < len(buffer) or eof:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                if not fill():
+                    value, pos = decoder.raw_decode(buffer, pos)
+                    return value
+
+        if next_char() != "{":
+            raise ValueError(f"{path}: 회차별 객체 형식이 아닙니다")
+        pos += 1
+        while True:
+            char = next_char()
+            if char == "}":
+                return
+            if char == ",":
+                pos += 1
+                continue
+            key = decode()
+            if next_char() != ":":
+                raise ValueError(f"{path}: {key} 항목 형식이 올바르지 않습니다")
+            pos += 1
+            value = decode()
+            if isinstance(value, dict):
+                yield value
+
+
+def iter_draw_log(path: Path) -> Iterator[Dict]:
+    """JSONL 로그에서 회차를 한 줄씩 읽음 (중간에 끊긴 마지막 줄은 건너뜀)"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                return
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_draw_file(path: Path) -> Iterator[Dict]:
+    """확장자에 따라 JSONL 로그 또는 회차별 객체 파일을 읽음"""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        return iter_draw_log(path)
+    return iter_keyed_draws(path)
+
+
+class DrawLog:
+    """
+    추가만 하는 JSONL 회차 로그 + 마지막 회차 인덱스
+
+        with DrawLog(path) as log:
+            if drw_no not in log:
+                log.append(obj)   # 바로 파일에 기록 (flush)
+
+    비정상 종료로 마지막 줄이 끊겼으면 열 때 잘라내고,
+    인덱스가 파일 크기와 맞으면 로그를 다시 읽지 않고 마지막 회차를 알 수 있음
+    """
+
+    def __init__(self, path: Path, index_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else self.path.with_suffix(".index.json")
+        self._file = None
+        self._draws: Optional[Set[int]] = None
+        self._since_index = 0
+        self.last_draw = 0
+        self.count = 0
+
+        self._recover()
+        index = self._read_index()
+        if index and index.get("size") == self._size():
+            self.last_draw = index.get("last_draw", 0)
+            self.count = index.get("count", 0)
+        else:
+            self._scan()
+
+    # -- 열기/닫기 --
+    def __enter__(self) -> "DrawLog":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.write_index()
+
+    # -- 조회 --
+    def __contains__(self, draw_no: int) -> bool:
+        return draw_no in self.draw_numbers()
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not self.path.exists():
+            return iter(())
+        return iter_draw_log(self.path)
+
+    def draw_numbers(self) -> Set[int]:
+        """기록된 회차 번호 (처음 필요할 때 한 번만 로그를 훑음)"""
+        if self._draws is None:
+            self._scan()
+        return self._draws
+
+    # -- 기록 --
+    def append(self, draw: Dict):
+        """회차 하나를 로그 끝에 기록 (이미 있는 회차면 무시)"""
+        draw_no = draw.get("drwNo")
+        if draw_no in self.draw_numbers():
+            return
+        self._file.write(json.dumps(draw, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._draws.add(draw_no)
+        self.count += 1
+        self.last_draw = max(self.last_draw, draw_no)
+        self._since_index += 1
+        if self._since_index >= INDEX_EVERY:
+            self.write_index()
+
+    def extend(self, draws: Iterable[Dict]) -> int:
+        before = self.count
+        for draw in draws:
+            self.append(draw)
+        return self.count - before
+
+    def write_index(self):
+        if self._file is not None:
+            self._file.flush()
+        atomic_write(self.index_path, json.dumps({
+            "last_draw": self.last_draw,
+            "count": self.count,
+            "size": self._size(),
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }, ensure_ascii=False))
+        self._since_index = 0
+
+    # -- 내부 --
+    def _size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def _read_index(self) -> Optional[Dict]:
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def _scan(self):
+        self._draws = {draw.get("drwNo") for draw in self}
+        self._draws.discard(None)
+        self.count = len(self._draws)
+        self.last_draw = max(self._draws, default=0)
+
+    def _recover(self):
+        """마지막 줄이 줄바꿈 없이 끊겼으면 잘라냄"""
+        size = self._size()
+        if size == 0:
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            # 뒤에서부터 마지막 줄바꿈 위치를 찾아 그 뒤를 잘라냄
+            position = size
+            while position > 0:
+                step = min(_READ_CHUNK, position)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b"\n")
+                if newline >= 0:
+                    f.truncate(position + newline + 1)
+                    return
+            f.truncate(0)
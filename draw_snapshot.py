@@ -0,0 +1,152 @@
+"""
+당첨 번호 메모리 스냅샷
+전체 회차를 (회차 x 7) 정수 배열로 한 번만 읽어두고 통계 API들이 공유
+"""
+import logging
+import threading
+import uuid
+from array import array
+from collections import Counter
+from typing import Optional, List
+
+from sqlalchemy.orm import Session
+
+from models import WinningNumber
+
+logger = logging.getLogger(__name__)
+
+NUMBERS_PER_DRAW = 7  # 당첨 번호 6개 + 보너스 1개
+PRIZE_RANKS = 5       # 1~5등 당첨금 (없으면 0)
+
+
+class DrawSnapshot:
+    """
+    회차 오름차순으로 정렬된 당첨 번호 스냅샷 (읽기 전용)
+
+    numbers는 회차마다 [번호1~6, 보너스] 7칸씩 이어 붙인 unsigned byte 배열
+    prizes는 회차마다 [1등~5등 당첨금] 5칸씩 이어 붙인 배열 (저장된 값이 없으면 0)
+    """
+
+    def __init__(self, version: int, draw_numbers: array, numbers: array,
+                 latest_draw_date=None, prizes: Optional[array] = None):
+        self.version = version
+        self.draw_numbers = draw_numbers
+        self.numbers = numbers
+        self.prizes = prizes if prizes is not None else array("q", bytes(8 * PRIZE_RANKS * len(draw_numbers)))
+        self.latest_draw_date = latest_draw_date
+        self._total_frequency: Optional[Counter] = None
+
+    def __len__(self) -> int:
+        return len(self.draw_numbers)
+
+    @property
+    def latest_draw(self) -> Optional[int]:
+        return self.draw_numbers[-1] if self.draw_numbers else None
+
+    def main_numbers(self, index: int) -> List[int]:
+        """index번째 회차의 당첨 번호 6개 (보너스 제외)"""
+        offset = index * NUMBERS_PER_DRAW
+        return list(self.numbers[offset:offset + 6])
+
+    def bonus_number(self, index: int) -> int:
+        return self.numbers[index * NUMBERS_PER_DRAW + 6]
+
+    def prize(self, index: int, rank: int) -> int:
+        """index번째 회차의 rank등 1게임 당첨금 (저장된 값이 없으면 0)"""
+        return self.prizes[index * PRIZE_RANKS + rank - 1]
+
+    def iter_recent(self, last_n: Optional[int] = None):
+        """최신 회차부터 last_n개 회차의 당첨 번호 6개씩 반환"""
+        total = len(self)
+        count = total if last_n is None else min(last_n, total)
+        for index in range(total - 1, total - 1 - count, -1):
+            yield self.main_numbers(index)
+
+    def frequency(self, last_n: Optional[int] = None) -> Counter:
+        """번호별 출현 빈도 (보너스 제외, last_n이 있으면 최근 N회차만)"""
+        if last_n is None and self._total_frequency is not None:
+            return Counter(self._total_frequency)
+        total = len(self)
+        count = total if last_n is None else min(last_n, total)
+        counter = Counter()
+        start = (total - count) * NUMBERS_PER_DRAW
+        for offset in range(start, total * NUMBERS_PER_DRAW, NUMBERS_PER_DRAW):
+            counter.update(self.numbers[offset:offset + 6])
+        if last_n is None:
+            # 스냅샷은 불변이므로 전체 빈도는 한 번만 계산
+            self._total_frequency = Counter(counter)
+        return counter
+
+
+_snapshot: Optional[DrawSnapshot] = None
+_snapshot_dirty = True
+_snapshot_version = 0
+_snapshot_lock = threading.Lock()
+# 프로세스마다 다른 값 (재시작 후 같은 버전 번호가 다른 데이터를 가리키지 않도록)
+_process_id = uuid.uuid4().hex[:8]
+
+
+def load_draw_snapshot(db: Session) -> DrawSnapshot:
+    """DB에서 당첨 번호 컬럼만 읽어 새 스냅샷 생성"""
+    global _snapshot_version
+    rows = db.query(
+        WinningNumber.draw_number,
+        WinningNumber.number1, WinningNumber.number2, WinningNumber.number3,
+        WinningNumber.number4, WinningNumber.number5, WinningNumber.number6,
+        WinningNumber.bonus_number,
+        WinningNumber.draw_date,
+        WinningNumber.prize_1st, WinningNumber.prize_2nd, WinningNumber.prize_3rd,
+        WinningNumber.prize_4th, WinningNumber.prize_5th
+    ).order_by(WinningNumber.draw_number.asc()).all()
+
+    draw_numbers = array("I")
+    numbers = array("B")
+    prizes = array("q")
+    for row in rows:
+        draw_numbers.append(row[0])
+        numbers.extend(row[1:8])
+        prizes.extend(p or 0 for p in row[9:14])
+
+    _snapshot_version += 1
+    latest_draw_date = rows[-1][8] if rows else None
+    logger.info(f"📦 당첨 번호 스냅샷 로드: {len(draw_numbers)}개 회차 (v{_snapshot_version})")
+    return DrawSnapshot(_snapshot_version, draw_numbers, numbers, latest_draw_date, prizes)
+
+
+def get_draw_snapshot(db: Session) -> DrawSnapshot:
+    """
+    프로세스 공용 스냅샷 반환
+    최초 호출 또는 새 회차가 저장된 뒤에만 DB를 다시 읽음
+    """
+    global _snapshot, _snapshot_dirty
+    snapshot = _snapshot
+    if snapshot is not None and not _snapshot_dirty:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot_dirty:
+            # 로드 도중 들어온 무효화를 놓치지 않도록 먼저 플래그를 내림
+            _snapshot_dirty = False
+            try:
+                _snapshot = load_draw_snapshot(db)
+            except Exception:
+                _snapshot_dirty = True
+                raise
+        return _snapshot
+
+
+def invalidate_draw_snapshot():
+    """새 회차 저장 후 호출 - 다음 조회 시 스냅샷을 다시 로드"""
+    global _snapshot_dirty
+    _snapshot_dirty = True
+
+
+def draw_data_tag() -> Optional[str]:
+    """
+    현재 스냅샷 기준 당첨 번호 데이터 태그 (응답 캐시 키)
+    새 회차가 저장되면 바뀜, 스냅샷이 아직 없거나 무효화/재로드 중이면 None (DB 조회 없음)
+    """
+    snapshot = _snapshot
+    if snapshot is None or _snapshot_dirty or _snapshot_lock.locked():
+        return None
+    return f"{_process_id}-{snapshot.version}"
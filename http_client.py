@@ -0,0 +1,196 @@
+"""
+크롤러 공용 HTTP 클라이언트
+httpx.AsyncClient 하나를 전용 이벤트 루프 스레드에서 공유해 keep-alive 연결과 TLS 세션을 재사용
+(h2 패키지가 있으면 HTTP/2로 한 연결에서 여러 요청을 동시에 처리)
+
+- 호스트별 동시 요청 수 제한 + 토큰 버킷 속도 제한 (rate_limiter)
+- 네트워크 오류/429/5xx는 지터를 준 지수 백오프로 재시도
+- 본문은 필요한 부분까지만 받고 연결을 끊음 (stream_text)
+
+조건부 요청(ETag/Last-Modified)은 하지 않음: 본문을 끝까지 받지 않으므로
+304를 받아도 재사용할 본문이 없음 (응답 재사용은 crawler_cache가 담당)
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+from typing import Awaitable, Callable, Dict, Optional, Protocol, Tuple, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+from rate_limiter import wait_for_slot
+
+# h2가 없으면 HTTP/1.1 keep-alive로 동작
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except Exception:
+    HTTP2_ENABLED = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+# 연결 풀 / 재시도 설정
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+PER_HOST_CONCURRENCY = int(os.getenv("HTTP_PER_HOST_CONCURRENCY", "4"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = 0.5   # 첫 재시도 최대 대기 (초), 시도마다 2배
+BACKOFF_MAX = 8.0    # 재시도 대기 상한 (초)
+DEFAULT_TIMEOUT = 15.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+
+class TextConsumer(Protocol):
+    def feed(self, chunk: str) -> bool:
+        """본문 조각 처리, 더 읽을 필요가 없으면 True"""
+        ...
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+# 아래 객체들은 모두 _loop 스레드에서만 사용
+_client: Optional[httpx.AsyncClient] = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """HTTP 전용 이벤트 루프 스레드 (처음 요청할 때 한 번만 시작)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="http-client-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True
+        )
+        logger.info(f"🌐 공용 HTTP 클라이언트 생성 (HTTP/2: {'사용' if HTTP2_ENABLED else '미사용'}, "
+                    f"최대 연결 {MAX_CONNECTIONS}개, 호스트당 동시 {PER_HOST_CONCURRENCY}개)")
+    return _client
+
+
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(PER_HOST_CONCURRENCY)
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
+def _backoff_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Retry-After가 있으면 따르고, 없으면 full jitter 지수 백오프"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+async def _with_retries(url: str, send: Callable[[], Awaitable[T]]) -> T:
+    """
+    호스트 동시 요청 제한 + 속도 제한 안에서 send()를 실행하고
+    네트워크 오류/재시도 대상 상태 코드면 백오프 후 다시 시도 (HTTP 루프 스레드에서 실행)
+    """
+    loop = asyncio.get_running_loop()
+    async with _host_semaphore(urlparse(url).hostname or url):
+        for attempt in range(MAX_RETRIES + 1):
+            # 토큰 버킷 대기는 블로킹이므로 루프 밖에서
+            await loop.run_in_executor(None, wait_for_slot, url)
+            response = None
+            try:
+                return await send()
+            except _RetryableStatus as e:
+                response = e.response
+                error: Exception = httpx.HTTPStatusError(
+                    str(e), request=response.request, response=response)
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt == MAX_RETRIES:
+                raise error
+            delay = _backoff_delay(attempt, response)
+            logger.warning(f"⚠️ 요청 실패 ({error}) - {delay:.1f}초 후 재시도 ({attempt + 1}/{MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
+
+async def _stream(url: str,
+                  new_consumer: Callable[[], TextConsumer],
+                  headers: Optional[Dict[str, str]],
+                  timeout: float) -> Tuple[TextConsumer, int]:
+    """본문을 조각 단위로 consumer.feed()에 넘기고 True가 나오면 연결을 끊음"""
+    client = _get_client()
+
+    async def send() -> Tuple[TextConsumer, int]:
+        consumer = new_consumer()  # 재시도마다 새로 시작
+        async with client.stream("GET", url, headers=headers, timeout=timeout) as response:
+            if response.status_code in RETRY_STATUS:
+                raise _RetryableStatus(response)
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                if consumer.feed(chunk):
+                    break
+            return consumer, response.num_bytes_downloaded
+
+    return await _with_retries(url, send)
+
+
+def stream_text(url: str,
+                new_consumer: Callable[[], TextConsumer],
+                headers: Optional[Dict[str, str]] = None,
+                timeout: float = DEFAULT_TIMEOUT) -> Tuple[TextConsumer, int]:
+    """
+    본문을 끝까지 받지 않고 필요한 부분만 읽는 GET (동기 호출용)
+    new_consumer()로 만든 객체의 feed()가 True를 반환하면 즉시 연결을 끊음
+
+    Returns:
+        (consumer, 실제로 받은 바이트 수)
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        _stream(url, new_consumer, headers, timeout), _ensure_loop())
+    return future.result()
+
+
+async def _close():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def close_http_client():
+    """연결 풀 정리 (다음 요청 때 새로 연결)"""
+    loop = _loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close(), loop).result(timeout=5)
+    except Exception as e:
+        logger.warning(f"⚠️ HTTP 클라이언트 정리 실패: {e}")
@@ -2,6 +2,7 @@
 """
 Railway 배포 시 실행할 초기화 스크립트
 - 데이터베이스 테이블 생성
+- 빈 DB는 번들 파일(lotto_draws.json)로 일괄 적재
 - 최신 당첨 번호 크롤링 및 저장
 """
 import sys
@@ -13,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from database import engine, SessionLocal
 from models import Base, WinningNumber
 from lotto_crawler import sync_all_winning_numbers, get_latest_draw_number
+from draw_bootstrap import load_bundled_draws
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -33,11 +35,15 @@ def init_database():
             existing_count = db.query(WinningNumber).count()
             
             if existing_count == 0:
-                # DB가 비어있음 → 전체 크롤링
+                # DB가 비어있음 → 번들 파일로 먼저 일괄 적재 (네트워크 없이 수 초)
+                logger.info("📦 번들 당첨 번호 파일에서 일괄 적재 중 (전체 데이터 없음)")
+                existing_count = load_bundled_draws(db)["loaded"]
+            
+            if existing_count == 0:
+                # 번들 파일도 없음 → 전체 크롤링
                 logger.info("🔄 당첨 번호 데이터 크롤링 중 (전체 데이터 없음)")
-                latest = 1193  # 현재 알려진 최신 회차 (수동 업데이트 필요)
-                logger.info(f"📊 1회 ~ {latest}회 전체 크롤링 시작 (약 5-10분 소요)")
-                sync_all_winning_numbers(db, start_draw=1, end_draw=latest)
+                logger.info("📊 1회 ~ 최신 회차 전체 크롤링 시작 (약 5-10분 소요)")
+                sync_all_winning_numbers(db, start_draw=1)
                 logger.info("✅ 당첨 번호 데이터 저장 완료")
             else:
                 # DB에 데이터가 있음 → 마지막 데이터의 날짜 확인
@@ -48,7 +54,10 @@ def init_database():
                 
                 if last_draw and last_draw.draw_date:
                     # 마지막 추첨일과 현재 날짜 비교
-                    days_diff = (datetime.now(timezone.utc) - last_draw.draw_date).days
+                    last_date = last_draw.draw_date
+                    if last_date.tzinfo is None:
+                        last_date = last_date.replace(tzinfo=timezone.utc)  # SQLite는 timezone 정보 없이 저장됨
+                    days_diff = (datetime.now(timezone.utc) - last_date).days
                     
                     logger.info(f"ℹ️ 이미 {existing_count}개의 당첨 번호가 존재합니다")
                     logger.info(f"📅 마지막 회차: {last_draw.draw_number}회 ({last_draw.draw_date.strftime('%Y-%m-%d')})")
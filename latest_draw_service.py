@@ -0,0 +1,129 @@
+"""
+최신 회차 당첨 번호 서비스
+요청 경로에서는 메모리 캐시/DB만 읽고, 외부 사이트 확인은 백그라운드에서 처리
+(stale-while-revalidate: 오래된 값을 바로 응답하고 갱신은 뒤에서 한 번만 실행)
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import WinningNumber
+from draw_snapshot import get_draw_snapshot
+from draw_calendar import expected_latest_draw
+from lotto_crawler import get_latest_draw_number, sync_all_winning_numbers
+
+logger = logging.getLogger(__name__)
+
+REFRESH_MIN_INTERVAL = 60  # 백그라운드 갱신 시도 최소 간격 (초)
+
+# (스냅샷 버전, 최신 회차 데이터)
+_cached: Optional[Tuple[int, Optional[Dict]]] = None
+
+_refresh_lock = threading.Lock()
+_refreshing = False
+_last_refresh_attempt = 0.0
+_on_new_draw: Optional[Callable[[int], None]] = None
+
+
+def set_new_draw_callback(callback: Optional[Callable[[int], None]]):
+    """백그라운드 갱신으로 새 회차가 저장됐을 때 호출할 함수 (예: 당첨 확인 작업 예약)"""
+    global _on_new_draw
+    _on_new_draw = callback
+
+
+def _to_dict(winning: WinningNumber) -> Dict:
+    return {
+        "draw_number": winning.draw_number,
+        "numbers": [winning.number1, winning.number2, winning.number3,
+                    winning.number4, winning.number5, winning.number6],
+        "bonus_number": winning.bonus_number,
+        "draw_date": winning.draw_date,
+        "prize_1st": winning.prize_1st,
+        "prize_2nd": winning.prize_2nd,
+        "prize_3rd": winning.prize_3rd,
+        "prize_4th": winning.prize_4th,
+        "prize_5th": winning.prize_5th,
+        "winners_1st": winning.winners_1st,
+        "total_sales": winning.total_sales,
+    }
+
+
+def get_latest_winning(db: Session) -> Optional[Dict]:
+    """
+    DB에 저장된 최신 회차 당첨 정보 (네트워크 요청 없음)
+    달력상 더 새로운 회차가 있어야 하면 백그라운드 갱신만 예약하고 현재 값을 바로 반환
+    """
+    global _cached
+    snapshot = get_draw_snapshot(db)
+    cached = _cached
+    if cached is not None and cached[0] == snapshot.version:
+        data = cached[1]
+    else:
+        data = None
+        if snapshot.latest_draw:
+            winning = db.query(WinningNumber).filter(
+                WinningNumber.draw_number == snapshot.latest_draw
+            ).first()
+            data = _to_dict(winning) if winning else None
+        _cached = (snapshot.version, data)
+
+    refresh_if_stale(snapshot.latest_draw or 0)
+    return data
+
+
+def is_stale(latest_draw: int) -> bool:
+    """추첨 달력상 latest_draw보다 새 회차가 발표됐어야 하면 True"""
+    return expected_latest_draw() > latest_draw
+
+
+def refresh_if_stale(latest_draw: int) -> bool:
+    """
+    오래된 경우 백그라운드 갱신 시작 (동시에 하나만 실행, 최소 간격 유지)
+    Returns: 새로 갱신을 시작했으면 True
+    """
+    global _refreshing, _last_refresh_attempt
+    if not is_stale(latest_draw):
+        return False
+
+    with _refresh_lock:
+        now = time.time()
+        if _refreshing or now - _last_refresh_attempt < REFRESH_MIN_INTERVAL:
+            return False
+        _refreshing = True
+        _last_refresh_attempt = now
+
+    threading.Thread(target=_refresh, name="latest-draw-refresh", daemon=True).start()
+    return True
+
+
+def _refresh():
+    """외부 사이트에서 최신 회차를 확인하고 누락 회차 저장"""
+    global _refreshing
+    db = SessionLocal()
+    try:
+        db_latest = db.query(func.max(WinningNumber.draw_number)).scalar()
+        if not db_latest:
+            # 빈 DB는 init_database가 전체 수집을 담당
+            logger.info("ℹ️ DB가 비어 있어 최신 회차 갱신을 건너뜀 (초기화 대기)")
+            return
+
+        latest_draw = get_latest_draw_number(start_from=db_latest)
+        if not latest_draw or latest_draw <= db_latest:
+            return
+
+        logger.info(f"🔄 최신 회차 백그라운드 갱신: {db_latest + 1}회 ~ {latest_draw}회")
+        result = sync_all_winning_numbers(db, db_latest + 1, latest_draw)
+        if _on_new_draw is not None:
+            for draw_number in result.get("inserted_draws", []):
+                _on_new_draw(draw_number)
+    except Exception as e:
+        logger.error(f"❌ 최신 회차 백그라운드 갱신 실패: {e}")
+    finally:
+        db.close()
+        with _refresh_lock:
+            _refreshing = False
@@ -2,11 +2,14 @@
 import json
 import time
 import random
+import argparse
 import urllib.request
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Dict, Tuple
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlparse
 
 # tqdm이 없으면 깔끔히 fallback
 try:
@@ -15,9 +18,24 @@ except Exception:
     def tqdm(x, **kwargs):
         return x
 
+# numpy가 없으면 순수 파이썬 샘플링으로 fallback
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from draw_calendar import expected_latest_draw
+from draw_files import DrawLog, iter_keyed_draws, atomic_write
+from lotto_sampler import AliasSampler, get_sampler, sampler_cache_key, frequency_version
+from rate_limiter import DEFAULT_RATE, get_rate_limiter
+
+if np is not None:
+    from plausible_sampler import get_plausible_sampler
+
 API_URL = "https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo={drw_no}"
 STATS_PATH = Path("lotto_stats.json")   # 빈도/메타 저장
-DRAWS_PATH = Path("lotto_draws.json")   # 회차별 원본 JSON 저장 (옵션)
+DRAWS_PATH = Path("lotto_draws.json")   # 회차별 원본 (예전 형식, 번들 파일)
+DRAW_LOG_PATH = Path("lotto_draws.jsonl")  # 회차별 원본 로그 (한 줄에 한 회차, 추가만 함)
 LOTTO_MIN, LOTTO_MAX = 1, 45
 
 # -----------------------------
@@ -41,83 +59,128 @@ def extract_main_numbers(draw_obj: dict) -> List[int]:
 def extract_bonus_number(draw_obj: dict) -> Optional[int]:
     return draw_obj.get("bnusNo")
 
+def _open_draw_log() -> DrawLog:
+    """
+    회차 로그 열기
+    로그가 아직 없고 예전 형식(lotto_draws.json)이 있으면 먼저 로그로 옮겨 이어서 수집
+    """
+    log = DrawLog(DRAW_LOG_PATH)
+    if log.count == 0 and DRAWS_PATH.exists():
+        try:
+            with log:
+                moved = log.extend(iter_keyed_draws(DRAWS_PATH))
+            print(f"📦 {DRAWS_PATH}에서 {moved}개 회차를 {DRAW_LOG_PATH}로 옮겼습니다")
+        except Exception as e:
+            print(f"⚠️ {DRAWS_PATH} 읽기 실패 (처음부터 수집): {e}")
+    return log
+
+def frequency_from_log(log: DrawLog, include_bonus: bool = False) -> Counter:
+    """로그를 한 줄씩 읽어 번호별 출현 빈도 계산"""
+    freq = Counter()
+    for obj in log:
+        freq.update(extract_main_numbers(obj))
+        if include_bonus:
+            bn = extract_bonus_number(obj)
+            if bn is not None:
+                freq.update([bn])
+    return freq
+
+def _collect_concurrent(log: DrawLog, upper: int, workers: int, rate: float):
+    """
+    1~upper 중 로그에 없는 회차를 workers개 스레드로 동시에 수집
+    요청 간격은 호스트별 토큰 버킷(초당 rate회)이 전체 스레드에 걸쳐 맞춰 주므로
+    전체 소요 시간은 왕복 지연이 아니라 속도 제한으로 정해짐
+    로그 기록은 현재 스레드에서만 (받은 순서대로 추가)
+    """
+    missing = [n for n in range(1, upper + 1) if n not in log]
+    if not missing:
+        return
+    bucket = get_rate_limiter(urlparse(API_URL).hostname, rate=rate, burst=max(1, workers))
+
+    def fetch(drw_no: int) -> Optional[dict]:
+        bucket.acquire()
+        return fetch_draw_json(drw_no)
+
+    workers = max(1, min(workers, len(missing)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch, n) for n in missing]
+        for future in tqdm(as_completed(futures), total=len(futures),
+                           desc=f"로또 회차 동시 수집(~{upper}회, {workers}개 스레드, 초당 {rate:g}회)"):
+            obj = future.result()
+            if obj:
+                log.append(obj)
+
 def collect_stats(max_draw: Optional[int] = None,
                   include_bonus: bool = False,
                   rest_every: int = 50,
-                  rest_sec: float = 0.3) -> Tuple[Counter, int, Dict[int, Dict]]:
+                  rest_sec: float = 0.3,
+                  workers: int = 1,
+                  rate: float = DEFAULT_RATE) -> Tuple[Counter, int]:
     """
-    max_draw=None이면 1회부터 '연속 실패 n회' 발생 시 종료(최신까지 추정) 방식.
-    max_draw가 숫자면 1~max_draw까지 수집.
+    max_draw=None이면 로그의 마지막 회차 다음부터 '연속 실패 n회' 발생 시 종료(최신까지 추정) 방식.
+    max_draw가 숫자면 1~max_draw 중 로그에 없는 회차만 수집.
+
+    workers > 1이면 동시 수집 모드: 마지막 회차를 실패가 날 때까지 찔러 보는 대신
+    추첨 일정(draw_calendar)으로 최신 회차를 계산하고, 빠진 회차를 초당 rate회 속도 제한 안에서 병렬로 받음
+
+    받은 회차는 DRAW_LOG_PATH(JSONL)에 바로 한 줄씩 추가되므로
+    중간에 멈추거나 차단돼도 다시 실행하면 이미 받은 회차는 건너뛰고 이어서 수집.
+    빈도는 수집이 끝난 뒤 로그를 한 줄씩 읽어 계산 (전체 회차를 메모리에 들고 있지 않음)
     """
-    freq = Counter()
-    draws_store: Dict[int, Dict] = {}
-    last_success_draw = 0
-
-    # 수집 범위 결정
-    if max_draw is None:
-        # 연속 실패가 몇 번 누적되면(예: 5회) 더 이상 회차가 없다고 판단
-        fail_streak = 0
-        drw_no = 1
-        with tqdm(total=0, desc="로또 회차 자동 수집(최신까지 추정)") as _:
-            while True:
-                obj = fetch_draw_json(drw_no)
-                if not obj:
-                    fail_streak += 1
-                    if fail_streak >= 5:
-                        break
-                else:
-                    fail_streak = 0
-                    last_success_draw = drw_no
-                    draws_store[drw_no] = obj
-                    freq.update(extract_main_numbers(obj))
-                    if include_bonus:
-                        bn = extract_bonus_number(obj)
-                        if bn is not None:
-                            freq.update([bn])
+    log = _open_draw_log()
+
+    with log:
+        if workers > 1:
+            upper = max_draw if max_draw is not None else expected_latest_draw()
+            _collect_concurrent(log, upper, workers, rate)
+        elif max_draw is None:
+            # 연속 실패가 몇 번 누적되면(예: 5회) 더 이상 회차가 없다고 판단
+            fail_streak = 0
+            drw_no = log.last_draw + 1
+            with tqdm(total=0, desc=f"로또 회차 자동 수집({drw_no}회부터, 최신까지 추정)") as _:
+                while True:
+                    obj = fetch_draw_json(drw_no)
+                    if not obj:
+                        fail_streak += 1
+                        if fail_streak >= 5:
+                            break
+                    else:
+                        fail_streak = 0
+                        log.append(obj)
 
+                    if drw_no % rest_every == 0:
+                        time.sleep(rest_sec)
+                    drw_no += 1
+        else:
+            missing = [n for n in range(1, max_draw + 1) if n not in log]
+            for drw_no in tqdm(missing, desc="로또 회차 수집 중"):
+                obj = fetch_draw_json(drw_no)
+                if obj:
+                    log.append(obj)
                 if drw_no % rest_every == 0:
                     time.sleep(rest_sec)
-                drw_no += 1
-    else:
-        for drw_no in tqdm(range(1, max_draw + 1), desc="로또 회차 수집 중"):
-            obj = fetch_draw_json(drw_no)
-            if not obj:
-                continue
-            last_success_draw = drw_no
-            draws_store[drw_no] = obj
-            freq.update(extract_main_numbers(obj))
-            if include_bonus:
-                bn = extract_bonus_number(obj)
-                if bn is not None:
-                    freq.update([bn])
-            if drw_no % rest_every == 0:
-                time.sleep(rest_sec)
-
-    return freq, last_success_draw, draws_store
+
+    return frequency_from_log(log, include_bonus), log.last_draw
 
 # -----------------------------
 # 2) 저장/로드
 # -----------------------------
-def save_stats(freq: Counter, last_draw: int, include_bonus: bool, draws_store: Dict[int, Dict]):
+def save_stats(freq: Counter, last_draw: int, include_bonus: bool):
+    """통계 파일 저장 (회차 원본은 수집 중 DRAW_LOG_PATH에 이미 기록됨)"""
     stats = {
         "generated_at": datetime.now().isoformat(timespec="seconds"),
         "include_bonus": include_bonus,
         "last_draw": last_draw,
         "frequency": dict(freq),  # {번호: 빈도}
     }
-    STATS_PATH.write_text(json.dumps(stats, ensure_ascii=False, indent=2))
-
-    # 원본 회차 데이터는 용량이 크면 생략 가능
-    try:
-        DRAWS_PATH.write_text(json.dumps(draws_store, ensure_ascii=False))
-    except Exception:
-        pass
+    atomic_write(STATS_PATH, json.dumps(stats, ensure_ascii=False, indent=2))
 
 def load_stats() -> Optional[dict]:
     if not STATS_PATH.exists():
         return None
     try:
-        return json.loads(STATS_PATH.read_text(encoding="utf-8"))
+        with open(STATS_PATH, encoding="utf-8") as f:
+            return json.load(f)
     except Exception:
         return None
 
@@ -230,6 +293,72 @@ def build_weights_from_frequency(freq_map: Dict[str, int]) -> List[float]:
     weights = [weights_dict[n] for n in range(LOTTO_MIN, LOTTO_MAX+1)]
     return weights
 
+def build_mode_weights(freq_map: Dict,
+                       mode: str = "ai",
+                       exclude_numbers: Optional[List[int]] = None) -> List[float]:
+    """
+    추천 모드별 1~45번 가중치 리스트 (제외 번호는 0)
+
+    mode:
+        - "ai": AI 추천 (기본, 상위 30개 가중치)
+        - "random": 완전 랜덤
+        - "conservative": 보수적 (상위 15개만)
+        - "aggressive": 공격적 (하위 번호도 포함)
+    """
+    population = [n for n in range(LOTTO_MIN, LOTTO_MAX+1)
+                  if not exclude_numbers or n not in exclude_numbers]
+
+    # 키 타입 확인 (문자열인지 정수인지)
+    is_str_key = isinstance(next(iter(freq_map.keys())), str) if freq_map else False
+
+    if mode == "random":
+        # 완전 랜덤: 모든 번호 동일 가중치
+        return [1.0 if n in population else 0.0 for n in range(LOTTO_MIN, LOTTO_MAX+1)]
+
+    if mode in ("conservative", "aggressive"):
+        freq_list = [(n, freq_map.get(str(n), 0) if is_str_key else freq_map.get(n, 0))
+                     for n in population]
+        freq_list.sort(key=lambda x: x[1], reverse=True)
+        weights_dict = {}
+        for i, (num, count) in enumerate(freq_list):
+            if mode == "conservative":
+                # 보수적: 상위 15개만 높은 가중치
+                weights_dict[num] = (count ** 2) + 50 if i < 15 else 0.01
+            else:
+                # 공격적: 상위 35개 + 하위 10개도 선택 가능
+                weights_dict[num] = count + 5 if i < 35 else 3.0
+        return [weights_dict.get(n, 0.0) for n in range(LOTTO_MIN, LOTTO_MAX+1)]
+
+    # "ai" (기본)
+    base_weights = build_weights_from_frequency(freq_map)
+    # 제외 번호가 있으면 해당 번호의 가중치를 0으로
+    if exclude_numbers:
+        for n in exclude_numbers:
+            if LOTTO_MIN <= n <= LOTTO_MAX:
+                base_weights[n - LOTTO_MIN] = 0.0
+    return base_weights
+
+# -----------------------------
+# 3-1) NumPy 추천 엔진 (조건부 정확 샘플링)
+# -----------------------------
+ATTEMPTS_PER_SET = 300      # 순수 파이썬 버전의 세트당 최대 시도
+
+def _recommend_sets_numpy(sampler: AliasSampler,
+                          sampler_key: tuple,
+                          lucky_numbers: List[int],
+                          n_sets: int,
+                          seed: Optional[int]) -> List[List[int]]:
+    """
+    is_plausible 조건을 만족하는 조합만을 대상으로 가중치 곱에 비례해 직접 추첨.
+    거부 샘플링이 아니므로 항상 유효한 세트를 일정 시간 안에 반환하며,
+    조건을 만족하는 조합이 없으면 InfeasibleConstraintsError(ValueError) 발생
+    """
+    if len(lucky_numbers) >= 6:
+        return [sorted(lucky_numbers[:6]) for _ in range(n_sets)]
+
+    plausible = get_plausible_sampler(sampler_key, sampler.weights, lucky_numbers)
+    return plausible.sample(n_sets, np.random.default_rng(seed))
+
 def recommend_sets(
     stats: dict, 
     n_sets: int = 5, 
@@ -240,6 +369,11 @@ def recommend_sets(
 ) -> List[List[int]]:
     """
     빈도 기반 가중 샘플링 + 휴리스틱 필터로 6개 번호 x n_sets 추천.
+    numpy가 있으면 조건을 만족하는 조합만 직접 추첨하는 DP 엔진
+    (조건 충족 불가 시 InfeasibleConstraintsError), 없으면 한 세트씩
+    뽑아 필터로 거르는 순수 파이썬 버전 사용.
+    가중치/alias 테이블은 (mode, stats["version"], 제외 번호) 별로 캐싱되며
+    version이 없으면 빈도표 해시를 버전으로 사용.
     
     mode:
         - "ai": AI 추천 (기본, 상위 30개 가중치)
@@ -250,9 +384,6 @@ def recommend_sets(
     lucky_numbers: 행운 번호 (우선적으로 포함)
     exclude_numbers: 제외 번호 (추천에서 제외)
     """
-    if seed is not None:
-        random.seed(seed)
-
     freq_map = stats["frequency"]
     population = list(range(LOTTO_MIN, LOTTO_MAX+1))
     
@@ -265,78 +396,40 @@ def recommend_sets(
     if lucky_numbers:
         valid_lucky_numbers = [n for n in lucky_numbers if n in population]
     
-    # 키 타입 확인 (문자열인지 정수인지)
-    is_str_key = isinstance(next(iter(freq_map.keys())), str) if freq_map else False
-    
-    # 모드별 가중치 설정
-    if mode == "random":
-        # 완전 랜덤: 모든 번호 동일 가중치
-        base_weights = [1.0 if n in population else 0.0 for n in range(LOTTO_MIN, LOTTO_MAX+1)]
-    elif mode == "conservative":
-        # 보수적: 상위 15개만 높은 가중치
-        freq_list = [(n, freq_map.get(str(n), 0) if is_str_key else freq_map.get(n, 0))
-                     for n in range(LOTTO_MIN, LOTTO_MAX+1) if n in population]
-        freq_list.sort(key=lambda x: x[1], reverse=True)
-        weights_dict = {}
-        for i, (num, count) in enumerate(freq_list):
-            if i < 15:  # 상위 15개
-                weights_dict[num] = (count ** 2) + 50
-            else:
-                weights_dict[num] = 0.01
-        base_weights = [weights_dict.get(n, 0.0) for n in range(LOTTO_MIN, LOTTO_MAX+1)]
-    elif mode == "aggressive":
-        # 공격적: 하위 번호도 적극 활용
-        freq_list = [(n, freq_map.get(str(n), 0) if is_str_key else freq_map.get(n, 0))
-                     for n in range(LOTTO_MIN, LOTTO_MAX+1) if n in population]
-        freq_list.sort(key=lambda x: x[1], reverse=True)
-        weights_dict = {}
-        for i, (num, count) in enumerate(freq_list):
-            if i < 35:  # 상위 35개
-                weights_dict[num] = count + 5
-            else:  # 하위 10개도 선택 가능
-                weights_dict[num] = 3.0
-        base_weights = [weights_dict.get(n, 0.0) for n in range(LOTTO_MIN, LOTTO_MAX+1)]
-    else:  # "ai" (기본)
-        base_weights = build_weights_from_frequency(freq_map)
-        # 제외 번호가 있으면 해당 번호의 가중치를 0으로
-        if exclude_numbers:
-            for n in exclude_numbers:
-                if LOTTO_MIN <= n <= LOTTO_MAX:
-                    base_weights[n - LOTTO_MIN] = 0.0
+    # 모드별 가중치 샘플러 (캐시에 없을 때만 가중치 계산)
+    version = stats.get("version")
+    if version is None:
+        version = frequency_version(freq_map)
+    sampler = get_sampler(
+        mode, version, exclude_numbers,
+        lambda: build_mode_weights(freq_map, mode, exclude_numbers)
+    )
+
+    if np is not None:
+        return _recommend_sets_numpy(
+            sampler, sampler_cache_key(mode, version, exclude_numbers),
+            valid_lucky_numbers, n_sets, seed
+        )
+
+    if seed is not None:
+        random.seed(seed)
 
     results = []
-    attempts_cap = 300  # 각 세트당 최대 시도
+    attempts_cap = ATTEMPTS_PER_SET  # 각 세트당 최대 시도
     for _ in range(n_sets):
         ok = False
         attempts = 0
         while not ok and attempts < attempts_cap:
             attempts += 1
             
-            # 행운 번호가 있으면 우선 포함
-            if valid_lucky_numbers:
-                # 행운 번호를 먼저 선택
-                nums_to_fill = 6 - len(valid_lucky_numbers)
-                if nums_to_fill > 0:
-                    # 행운 번호를 제외한 나머지 번호 풀
-                    remaining_pop = [n for n in population if n not in valid_lucky_numbers]
-                    remaining_weights = [base_weights[n - LOTTO_MIN] for n in remaining_pop]
-                    
-                    if sum(remaining_weights) > 0:
-                        additional_nums = weighted_sample_without_replacement(
-                            remaining_pop, remaining_weights, nums_to_fill
-                        )
-                        nums = valid_lucky_numbers + additional_nums
-                    else:
-                        # 가중치가 모두 0이면 랜덤 샘플링
-                        additional_nums = random.sample(remaining_pop, min(nums_to_fill, len(remaining_pop)))
-                        nums = valid_lucky_numbers + additional_nums
-                else:
-                    # 행운 번호가 6개 이상이면 처음 6개만 사용
-                    nums = valid_lucky_numbers[:6]
+            # 행운 번호가 있으면 우선 포함하고 나머지는 alias 샘플러로 채움
+            if len(valid_lucky_numbers) >= 6:
+                # 행운 번호가 6개 이상이면 처음 6개만 사용
+                nums = valid_lucky_numbers[:6]
             else:
-                # population에 맞게 weights 필터링
-                filtered_weights = [base_weights[n - LOTTO_MIN] for n in population]
-                nums = weighted_sample_without_replacement(population, filtered_weights, 6)
+                nums = valid_lucky_numbers + sampler.sample(
+                    6 - len(valid_lucky_numbers), exclude=valid_lucky_numbers
+                )
             
             nums = sorted(nums)
             if is_plausible(nums):
@@ -366,9 +459,11 @@ def print_recommendations(sets: List[List[int]], last_draw: int):
 # -----------------------------
 # 5) 메뉴/메인 진입점
 # -----------------------------
-def run_collect_and_save(max_draw: Optional[int] = None, include_bonus: bool = False):
-    freq, last_draw, draws_store = collect_stats(max_draw=max_draw, include_bonus=include_bonus)
-    save_stats(freq, last_draw, include_bonus, draws_store)
+def run_collect_and_save(max_draw: Optional[int] = None, include_bonus: bool = False,
+                         workers: int = 1, rate: float = DEFAULT_RATE):
+    freq, last_draw = collect_stats(max_draw=max_draw, include_bonus=include_bonus,
+                                    workers=workers, rate=rate)
+    save_stats(freq, last_draw, include_bonus)
     print_rank(freq, last_draw, include_bonus, top_n=20)
     print("\n✅ 수집/저장 완료:", STATS_PATH.resolve())
 
@@ -380,12 +475,25 @@ def run_recommend():
     sets = recommend_sets(stats, n_sets=5)
     print_recommendations(sets, stats.get("last_draw", 0))
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="로또 회차 수집/번호 추천")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="동시 수집 스레드 수 (2 이상이면 추첨 일정 기준 동시 수집 모드)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"동시 수집 시 초당 최대 요청 수 (기본 {DEFAULT_RATE:g})")
+    parser.add_argument("--max-draw", type=int, default=None,
+                        help="이 회차까지만 수집 (기본: 최신까지)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    collect = dict(max_draw=args.max_draw, include_bonus=False, workers=args.workers, rate=args.rate)
+
     # 첫 실행: 파일 없으면 자동 수집 유도
     if not STATS_PATH.exists():
         print("처음 실행으로 감지되었습니다. 회차 데이터를 수집/저장합니다.")
         # max_draw=None → 1회부터 최신까지 추정
-        run_collect_and_save(max_draw=None, include_bonus=False)
+        run_collect_and_save(**collect)
         return
 
     # 이후 실행: 메뉴 제공
@@ -397,7 +505,7 @@ def main():
 
     if choice == "1":
         # 최신까지 갱신: None으로 두면 자동으로 이어서 최신 추정 수집
-        run_collect_and_save(max_draw=None, include_bonus=False)
+        run_collect_and_save(**collect)
     elif choice == "2":
         run_recommend()
     else:
@@ -0,0 +1,181 @@
+"""
+과거 회차 백테스트: "이 번호로 샀다면 몇 번 당첨됐을까?"
+번호 세트 여러 개를 전체(또는 일부 구간) 회차와 한 번에 비교한다.
+
+회차별 당첨 번호를 64비트 마스크 배열로 미리 만들어 두고
+(번호 세트 x 회차) 행렬의 AND popcount로 맞춘 개수를 계산
+"""
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from draw_snapshot import DrawSnapshot, NUMBERS_PER_DRAW, PRIZE_RANKS
+from lotto_checker import (
+    numbers_to_mask,
+    check_winning_mask,
+    estimate_prize_amount
+)
+
+# numpy가 없으면 회차별로 하나씩 비교
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+TICKET_PRICE = 1000  # 1게임 가격 (원)
+NOTABLE_RANK = 3     # 이 등수 이상이면 당첨 회차 목록에 포함
+
+
+class DrawMasks:
+    """스냅샷에서 만든 회차별 마스크/보너스/등수별 당첨금 배열"""
+
+    def __init__(self, snapshot: DrawSnapshot):
+        self.version = snapshot.version
+        self.draw_numbers = np.frombuffer(snapshot.draw_numbers, dtype=np.uint32).astype(np.int64)
+        numbers = np.frombuffer(snapshot.numbers, dtype=np.uint8).reshape(-1, NUMBERS_PER_DRAW).astype(np.uint64)
+        self.masks = np.bitwise_or.reduce(np.left_shift(np.uint64(1), numbers[:, :6]), axis=1)
+        self.bonus = numbers[:, 6]
+
+        # prize_table[회차, 등수] (0열 = 미당첨), 저장된 당첨금이 없으면 평균 추정값
+        stored = np.frombuffer(snapshot.prizes, dtype=np.int64).reshape(-1, PRIZE_RANKS)
+        self.prize_table = np.zeros((len(stored), PRIZE_RANKS + 1), dtype=np.int64)
+        for rank in range(1, PRIZE_RANKS + 1):
+            self.prize_table[:, rank] = np.where(stored[:, rank - 1] > 0, stored[:, rank - 1],
+                                                 estimate_prize_amount(rank))
+
+
+_masks: Optional[DrawMasks] = None
+_masks_lock = threading.Lock()
+
+
+def get_draw_masks(snapshot: DrawSnapshot) -> DrawMasks:
+    """스냅샷 버전별로 한 번만 마스크 배열 생성"""
+    global _masks
+    masks = _masks
+    if masks is not None and masks.version == snapshot.version:
+        return masks
+    with _masks_lock:
+        if _masks is None or _masks.version != snapshot.version:
+            _masks = DrawMasks(snapshot)
+        return _masks
+
+
+# (맞춘 개수 * 2 + 보너스 여부) -> 등수 (0 = 미당첨)
+_RANK_LOOKUP = [0] * 14
+_RANK_LOOKUP[3 * 2] = _RANK_LOOKUP[3 * 2 + 1] = 5
+_RANK_LOOKUP[4 * 2] = _RANK_LOOKUP[4 * 2 + 1] = 4
+_RANK_LOOKUP[5 * 2] = 3
+_RANK_LOOKUP[5 * 2 + 1] = 2
+_RANK_LOOKUP[6 * 2] = 1
+
+
+def _rank_matrix(ticket_masks, masks: DrawMasks, lo: int, hi: int):
+    """(번호 세트 x 회차) 등수 행렬 (0 = 미당첨)"""
+    matched = np.bitwise_count(ticket_masks[:, None] & masks.masks[None, lo:hi])
+    has_bonus = (ticket_masks[:, None] >> masks.bonus[None, lo:hi]) & np.uint64(1)
+    return np.asarray(_RANK_LOOKUP, dtype=np.intp)[matched.astype(np.intp) * 2 + has_bonus.astype(np.intp)]
+
+
+def _draw_range(draw_numbers, from_draw: Optional[int], to_draw: Optional[int]) -> Tuple[int, int]:
+    """회차 구간 -> 오름차순 배열의 [lo, hi) 인덱스"""
+    lo = 0 if from_draw is None else int(np.searchsorted(draw_numbers, from_draw, side="left"))
+    hi = len(draw_numbers) if to_draw is None else int(np.searchsorted(draw_numbers, to_draw, side="right"))
+    return lo, max(lo, hi)
+
+
+def backtest_tickets(snapshot: DrawSnapshot,
+                     tickets: List[List[int]],
+                     from_draw: Optional[int] = None,
+                     to_draw: Optional[int] = None) -> Dict:
+    """
+    번호 세트들을 from_draw ~ to_draw 회차(기본 전체)와 비교
+
+    Returns:
+        {
+            "draw_count", "first_draw", "last_draw",
+            "tickets": [{"numbers", "rank_counts", "total_prize", "best_rank", "notable_wins"}],
+            "rank_counts", "total_prize", "total_cost"
+        }
+        rank_counts 키는 "1"~"5", notable_wins는 3등 이상 당첨 (회차, 등수) 목록
+    """
+    if np is None:
+        return _backtest_python(snapshot, tickets, from_draw, to_draw)
+
+    masks = get_draw_masks(snapshot)
+    lo, hi = _draw_range(masks.draw_numbers, from_draw, to_draw)
+    ticket_masks = np.array([numbers_to_mask(t) for t in tickets], dtype=np.uint64)
+    ranks = _rank_matrix(ticket_masks, masks, lo, hi)
+
+    prizes = masks.prize_table[lo:hi][np.arange(hi - lo)[None, :], ranks]
+    offsets = np.arange(len(tickets))[:, None] * (PRIZE_RANKS + 1)
+    counts = np.bincount((offsets + ranks).ravel(),
+                         minlength=len(tickets) * (PRIZE_RANKS + 1)).reshape(-1, PRIZE_RANKS + 1)
+    totals = prizes.sum(axis=1)
+
+    best = np.where(ranks > 0, ranks, PRIZE_RANKS + 1).min(axis=1, initial=PRIZE_RANKS + 1)
+    notable = [[] for _ in tickets]
+    for i, j in zip(*np.nonzero((ranks > 0) & (ranks <= NOTABLE_RANK))):
+        notable[i].append((int(masks.draw_numbers[lo + j]), int(ranks[i, j])))
+
+    counts_list = counts.tolist()
+    totals_list = totals.tolist()
+    results = [
+        _ticket_result(numbers, counts_list[i], totals_list[i],
+                       int(best[i]) if best[i] <= PRIZE_RANKS else None, notable[i])
+        for i, numbers in enumerate(tickets)
+    ]
+    return _summary(results, hi - lo,
+                    int(masks.draw_numbers[lo]) if hi > lo else None,
+                    int(masks.draw_numbers[hi - 1]) if hi > lo else None)
+
+
+def _backtest_python(snapshot: DrawSnapshot, tickets, from_draw, to_draw) -> Dict:
+    """numpy 없이 회차별 비트마스크 비교 (느리지만 같은 결과)"""
+    indexes = [i for i, d in enumerate(snapshot.draw_numbers)
+               if (from_draw is None or d >= from_draw) and (to_draw is None or d <= to_draw)]
+    draws = [(i, numbers_to_mask(snapshot.main_numbers(i)), snapshot.bonus_number(i)) for i in indexes]
+    results = []
+    for numbers in tickets:
+        user_mask = numbers_to_mask(numbers)
+        counts = [0] * (PRIZE_RANKS + 1)
+        total = 0
+        notable = []
+        for i, draw_mask, bonus in draws:
+            _, _, rank = check_winning_mask(user_mask, draw_mask, bonus)
+            if rank is None:
+                counts[0] += 1
+                continue
+            counts[rank] += 1
+            total += estimate_prize_amount(rank, snapshot.prize(i, rank))
+            if rank <= NOTABLE_RANK:
+                notable.append((snapshot.draw_numbers[i], rank))
+        best = min((r for r in range(1, PRIZE_RANKS + 1) if counts[r]), default=None)
+        results.append(_ticket_result(numbers, counts, total, best, notable))
+    return _summary(results, len(draws),
+                    snapshot.draw_numbers[indexes[0]] if indexes else None,
+                    snapshot.draw_numbers[indexes[-1]] if indexes else None)
+
+
+def _ticket_result(numbers, counts, total_prize: int, best_rank, notable) -> Dict:
+    return {
+        "numbers": sorted(numbers),
+        "rank_counts": {str(r): int(counts[r]) for r in range(1, PRIZE_RANKS + 1)},
+        "total_prize": total_prize,
+        "best_rank": best_rank,
+        "notable_wins": [{"draw_number": d, "rank": r} for d, r in notable],
+    }
+
+
+def _summary(results: List[Dict], draw_count: int, first_draw, last_draw) -> Dict:
+    rank_counts = Counter()
+    for result in results:
+        rank_counts.update(result["rank_counts"])
+    return {
+        "draw_count": draw_count,
+        "first_draw": first_draw,
+        "last_draw": last_draw,
+        "tickets": results,
+        "rank_counts": {str(r): rank_counts.get(str(r), 0) for r in range(1, PRIZE_RANKS + 1)},
+        "total_prize": sum(r["total_prize"] for r in results),
+        "total_cost": TICKET_PRICE * draw_count * len(results),
+    }
@@ -6,6 +6,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 등수별 실제 당첨금 컬럼 (models.WinningNumber)
+PRIZE_FIELDS = {
+    1: "prize_1st",
+    2: "prize_2nd",
+    3: "prize_3rd",
+    4: "prize_4th",
+    5: "prize_5th",
+}
+
 def calculate_rank(matched_count: int, has_bonus: bool) -> Optional[int]:
     """
     맞춘 번호 개수와 보너스 번호 포함 여부로 등수 계산
@@ -30,6 +39,34 @@ def calculate_rank(matched_count: int, has_bonus: bool) -> Optional[int]:
     else:
         return None  # 미당첨
 
+def numbers_to_mask(numbers: List[int]) -> int:
+    """
+    번호 목록을 비트마스크로 변환 (n번 -> 1 << n, 1~45번이 64비트 안에 들어감)
+    두 마스크의 AND를 popcount 하면 맞춘 개수
+    """
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+def check_winning_mask(
+    user_mask: int,
+    winning_mask: int,
+    bonus_number: int
+) -> Tuple[int, bool, Optional[int]]:
+    """
+    비트마스크로 당첨 확인 (대량 확인용, 로그 없음)
+    
+    Returns:
+        (맞춘 개수, 보너스 포함 여부, 등수)
+    """
+    matched_count = (user_mask & winning_mask).bit_count()
+    
+    # 보너스 번호 확인 (5개 맞았을 때만 의미 있음)
+    has_bonus = matched_count == 5 and bool(user_mask >> bonus_number & 1)
+    
+    return matched_count, has_bonus, calculate_rank(matched_count, has_bonus)
+
 def check_winning(
     user_numbers: List[int],
     winning_numbers: List[int],
@@ -46,23 +83,54 @@ def check_winning(
     Returns:
         (맞춘 개수, 보너스 포함 여부, 등수)
     """
-    # 집합으로 변환하여 교집합 계산
-    user_set = set(user_numbers)
-    winning_set = set(winning_numbers)
+    matched_count, has_bonus, rank = check_winning_mask(
+        numbers_to_mask(user_numbers),
+        numbers_to_mask(winning_numbers),
+        bonus_number
+    )
     
-    # 맞춘 개수
-    matched_count = len(user_set & winning_set)
-    
-    # 보너스 번호 확인 (5개 맞았을 때만 의미 있음)
-    has_bonus = bonus_number in user_set and matched_count == 5
-    
-    # 등수 계산
-    rank = calculate_rank(matched_count, has_bonus)
-    
-    logger.info(f"당첨 확인: {user_numbers} vs {winning_numbers}+{bonus_number} → {matched_count}개 맞음, 보너스={has_bonus}, 등수={rank}")
+    logger.debug(f"당첨 확인: {user_numbers} vs {winning_numbers}+{bonus_number} → {matched_count}개 맞음, 보너스={has_bonus}, 등수={rank}")
     
     return matched_count, has_bonus, rank
 
+def check_tickets(
+    tickets: List[List[int]],
+    draws: List[Tuple[int, List[int], int]]
+) -> List[Dict]:
+    """
+    여러 장의 번호를 여러 회차와 한 번에 비교
+    
+    Args:
+        tickets: 번호 6개짜리 목록들
+        draws: (회차, 당첨 번호 6개, 보너스 번호) 목록
+        
+    Returns:
+        회차 x 번호 순서의 결과 목록
+        {"draw_number", "ticket_index", "matched_count", "has_bonus", "rank"}
+    """
+    ticket_masks = [numbers_to_mask(t) for t in tickets]
+    results = []
+    for draw_number, winning_numbers, bonus_number in draws:
+        winning_mask = numbers_to_mask(winning_numbers)
+        for index, user_mask in enumerate(ticket_masks):
+            matched_count, has_bonus, rank = check_winning_mask(user_mask, winning_mask, bonus_number)
+            results.append({
+                "draw_number": draw_number,
+                "ticket_index": index,
+                "matched_count": matched_count,
+                "has_bonus": has_bonus,
+                "rank": rank,
+            })
+    return results
+
+def actual_prize_for_rank(winning, rank: Optional[int]) -> Optional[int]:
+    """
+    WinningNumber 레코드에 저장된 해당 등수의 실제 당첨금 (없으면 None)
+    """
+    if rank is None:
+        return None
+    return getattr(winning, PRIZE_FIELDS[rank], None)
+
 def get_rank_message(rank: Optional[int], matched_count: int, has_bonus: bool) -> str:
     """
     등수에 따른 메시지 생성
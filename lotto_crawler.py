@@ -1,27 +1,43 @@
 """
 로또 당첨 번호 크롤링 및 DB 저장 유틸리티
 """
-import requests
+import httpx
 import json
 import logging
+import os
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, List
+from urllib.parse import quote
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
 from models import WinningNumber
+from draw_snapshot import invalidate_draw_snapshot
+from draw_archive import invalidate_draw_archive
+from draw_aggregates import apply_new_draw, rebuild_aggregates
+from rate_limiter import DEFAULT_RATE
+from http_client import stream_text, close_http_client
+from naver_parser import NaverLottoParser, parse_naver_lotto, PARSER_VERSION
+from crawler_cache import get_cached_draw, store_draw
+from draw_calendar import expected_latest_draw, next_draw_datetime, draw_date as draw_calendar_date
 
 logger = logging.getLogger(__name__)
 
 API_URL = "https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo={drw_no}"
 MAIN_PAGE_URL = "https://www.dhlottery.co.kr/common.do?method=main"
 NAVER_SEARCH_URL = "https://search.naver.com/search.naver?query=로또+{draw_no}회+당첨번호"
+NAVER_SOURCE = "naver"  # 응답 캐시 소스 이름
 
-# 세션 재사용 (연결 풀링 및 쿠키 유지)
-_session = None
-_session_initialized = False
-_last_request_time = 0
+# 동기화 설정 (동시 요청 수는 호스트별 속도 제한과 함께 적용됨)
+# 처리량은 SYNC_WORKERS개 스레드와 호스트별 초당 요청 수(rate_limiter.DEFAULT_RATE,
+# 환경변수 CRAWLER_RATE_LIMIT) 중 작은 쪽에 묶임
+# 기본값(4개, 초당 2회)이면 누락 회차 1000개당 약 8분 → 대량 수집은 두 값을 함께 올릴 것
+SYNC_WORKERS = int(os.getenv("CRAWLER_WORKERS", "4"))
+SYNC_BATCH_SIZE = 50  # 한 번에 commit 하는 회차 수
+UPSERT_CHUNK_SIZE = 500  # INSERT 한 문장에 넣는 회차 수 (파라미터 수 제한 고려)
 
 # Selenium 드라이버 (필요 시 lazy 초기화)
 _driver = None
@@ -29,47 +45,77 @@ _use_selenium = False  # 봇 차단 시 자동으로 True로 전환
 _use_main_page_scraping = False  # API 차단 시 메인 페이지 스크래핑 사용
 _use_naver_search = False  # Selenium 실패 시 네이버 검색 사용
 
-def get_session():
-    """HTTP 세션 가져오기 (싱글톤)"""
-    global _session, _session_initialized
-    if _session is None:
-        _session = requests.Session()
-        _session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Connection': 'keep-alive',
-        })
-    
-    # 첫 API 호출 전에 메인 페이지 방문하여 쿠키 받기
-    if not _session_initialized:
-        try:
-            logger.info("🔄 동행복권 사이트 초기 연결 중...")
-            _session.get('https://www.dhlottery.co.kr/', timeout=10)
-            time.sleep(0.5)
-            _session_initialized = True
-            logger.info("✅ 사이트 연결 완료 (쿠키 설정됨)")
-        except Exception as e:
-            logger.warning(f"⚠️ 사이트 초기 연결 실패 (계속 진행): {e}")
-            _session_initialized = True
-    
-    return _session
-
 def reset_session():
     """세션을 초기화하여 새로운 연결 시도 (봇 차단 해결용)"""
-    global _session, _session_initialized, _use_selenium, _use_main_page_scraping, _use_naver_search
-    _session = None
-    _session_initialized = False
+    global _use_selenium, _use_main_page_scraping, _use_naver_search
     _use_selenium = False
     _use_main_page_scraping = False
     _use_naver_search = False
+    close_http_client()
     logger.info("🔄 세션 초기화됨")
 
+def naver_result_to_draw(parsed: Optional[Dict], draw_no: int) -> Optional[Dict]:
+    """
+    네이버 파서 결과를 동행복권 API 형식 딕셔너리로 변환
+    번호가 잘못됐거나 검색결과 회차가 요청 회차와 다르면 None
+    """
+    if not parsed:
+        return None
+    
+    numbers = parsed["numbers"]
+    bonus = parsed["bonus"]
+    prize_1st = parsed["prize_1st"]
+    winners_1st = parsed["winners_1st"]
+    
+    # 유효성 검사
+    if not all(1 <= n <= 45 for n in numbers) or not (1 <= bonus <= 45):
+        logger.warning(f"⚠️ 파싱된 번호가 유효하지 않음: {numbers} + {bonus}")
+        return None
+    
+    # 요청한 회차와 검색결과 회차가 다르면 실패 처리
+    # (네이버는 항상 최신 회차만 보여주므로, 과거/미래 회차 요청 시 불일치)
+    draw_found = parsed["draw_no"]
+    if draw_found is not None and draw_found != draw_no:
+        logger.warning(f"⚠️ 요청 회차({draw_no})와 검색결과 회차({draw_found})가 다름 - 해당 회차 없음")
+        return None
+    
+    # 회차를 찾지 못했으면 요청 회차 사용
+    if draw_found is None:
+        draw_found = draw_no
+    
+    # 추첨일이 페이지에 없으면 추첨 달력으로 계산
+    draw_date = parsed["draw_date"] or draw_calendar_date(draw_found).isoformat()
+    
+    result = {
+        'drwNo': draw_found,
+        'drwNoDate': draw_date,
+        'drwtNo1': numbers[0],
+        'drwtNo2': numbers[1],
+        'drwtNo3': numbers[2],
+        'drwtNo4': numbers[3],
+        'drwtNo5': numbers[4],
+        'drwtNo6': numbers[5],
+        'bnusNo': bonus,
+        'returnValue': 'success'
+    }
+    
+    # 당첨금 정보 추가 (있으면)
+    if prize_1st:
+        result['firstWinamnt'] = prize_1st
+    if winners_1st:
+        result['firstPrzwnerCo'] = winners_1st
+    
+    return result
+
+def _parse_naver_html(html: str, draw_no: int) -> Optional[Dict]:
+    """저장된 네이버 원본 응답 재파싱 (응답 캐시용)"""
+    return naver_result_to_draw(parse_naver_lotto(html), draw_no)
+
 def fetch_from_naver_search(draw_no: int) -> Optional[Dict]:
     """
-    네이버 검색에서 로또 당첨번호 가져오기 (Selenium 없이 requests 사용)
+    네이버 검색에서 로또 당첨번호 가져오기 (Selenium 없이 공용 HTTP 클라이언트 사용)
     동행복권 API 차단 시 대안으로 사용
+    이미 받아 둔 회차는 응답 캐시(crawler_cache)에서 네트워크 없이 반환
     
     Args:
         draw_no: 로또 회차 번호
@@ -77,15 +123,16 @@ def fetch_from_naver_search(draw_no: int) -> Optional[Dict]:
     Returns:
         당첨 번호 정보 딕셔너리 또는 None
     """
+    cached = get_cached_draw(NAVER_SOURCE, draw_no, PARSER_VERSION, _parse_naver_html)
+    if cached:
+        logger.info(f"🗄️ {draw_no}회차 응답 캐시 사용 (네트워크 요청 없음)")
+        return cached
+    
     try:
         logger.info(f"🔍 네이버 검색에서 {draw_no}회차 당첨번호 조회 중...")
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Referer': 'https://www.naver.com/',
-        }
+        # 공용 클라이언트 기본 헤더(User-Agent 등)에 Referer만 추가
+        headers = {'Referer': 'https://www.naver.com/'}
         
         # 네이버 검색 URL - "로또 당첨번호" 또는 "복권 당첨번호"
         search_queries = [
@@ -94,173 +141,52 @@ def fetch_from_naver_search(draw_no: int) -> Optional[Dict]:
             f"로또 {draw_no}회 당첨번호"
         ]
         
-        html = None
+        parsed = None
         for query in search_queries:
             try:
-                url = f"https://search.naver.com/search.naver?query={requests.utils.quote(query)}"
-                response = requests.get(url, headers=headers, timeout=15)
-                response.raise_for_status()
-                html = response.text
+                # 연결 재사용/속도 제한/재시도는 공용 HTTP 클라이언트가 처리
+                # 당첨 번호 블록까지만 읽고 나머지 본문은 받지 않음 (읽은 부분은 캐시 저장용으로 보관)
+                url = f"https://search.naver.com/search.naver?query={quote(query)}"
+                parser, bytes_read = stream_text(url, lambda: NaverLottoParser(record=True),
+                                                 headers=headers, timeout=15)
+                stopped_early = parser.done
+                parser.close()
+                parsed = parser.result()
+                logger.debug(f"📥 네이버 응답 {bytes_read:,}바이트 읽음 ({query})")
                 
-                # win_number_box가 있으면 성공
-                if 'win_number_box' in html or 'winning_number' in html:
+                # 당첨 번호를 찾았으면 성공
+                if parsed:
                     logger.info(f"✅ 네이버 검색 성공: {query}")
                     break
             except Exception as e:
                 logger.warning(f"⚠️ 검색 실패 ({query}): {e}")
                 continue
         
-        if not html:
-            logger.warning("⚠️ 네이버 검색 결과를 가져올 수 없음")
+        if not parsed:
+            logger.warning("⚠️ 네이버 검색 결과에서 당첨번호를 찾을 수 없음")
             return None
         
-        # 방법 1: 새로운 네이버 검색 결과 패턴 (win_number_box 구조)
-        # <div class="win_number_box">
-        #   <div class="winning_number"> <span class="ball type1">1</span>... </div>
-        #   <div class="bonus_number"> <span class="ball type1">2</span> </div>
-        #   <p class="win_text">1등 당첨금 <strong>3,226,386,263</strong>원 (당첨 복권수 10개)</p>
-        # </div>
-        
-        numbers = []
-        bonus = None
-        prize_1st = None
-        winners_1st = None
-        
-        # 당첨번호 추출 - winning_number 영역
-        winning_pattern = r'winning_number["\']?\s*>([^<]*(?:<[^>]*>[^<]*)*?)</div>'
-        winning_match = re.search(winning_pattern, html, re.DOTALL | re.IGNORECASE)
-        
-        if winning_match:
-            winning_html = winning_match.group(1)
-            # ball 클래스에서 숫자 추출: <span class="ball type1">1</span>
-            ball_pattern = r'ball[^"]*"[^>]*>(\d+)</span>'
-            balls = re.findall(ball_pattern, winning_html, re.IGNORECASE)
-            numbers = [int(b) for b in balls if 1 <= int(b) <= 45]
-            logger.info(f"📊 winning_number에서 추출: {numbers}")
-        
-        # 보너스 번호 추출 - bonus_number 영역
-        bonus_pattern = r'bonus_number["\']?\s*>([^<]*(?:<[^>]*>[^<]*)*?)</div>'
-        bonus_match = re.search(bonus_pattern, html, re.DOTALL | re.IGNORECASE)
-        
-        if bonus_match:
-            bonus_html = bonus_match.group(1)
-            ball_pattern = r'ball[^"]*"[^>]*>(\d+)</span>'
-            bonus_balls = re.findall(ball_pattern, bonus_html, re.IGNORECASE)
-            if bonus_balls:
-                bonus = int(bonus_balls[0])
-                logger.info(f"📊 bonus_number에서 추출: {bonus}")
-        
-        # 당첨금 및 당첨자 수 추출
-        # "1등 당첨금 <strong class="emphasis">3,226,386,263</strong>원 (당첨 복권수 10개)"
-        prize_pattern = r'1등\s*당첨금[^<]*<strong[^>]*>([0-9,]+)</strong>원[^(]*\(당첨[^0-9]*(\d+)'
-        prize_match = re.search(prize_pattern, html, re.IGNORECASE)
-        
-        if prize_match:
-            prize_str = prize_match.group(1).replace(',', '')
-            prize_1st = int(prize_str)
-            winners_1st = int(prize_match.group(2))
-            logger.info(f"💰 당첨금: {prize_1st:,}원, 당첨자: {winners_1st}명")
-        
-        # 방법 2: 번호를 찾지 못했으면 더 유연한 패턴 시도
-        if len(numbers) < 6 or bonus is None:
-            logger.info("🔄 대체 패턴으로 번호 추출 시도...")
-            
-            # win_ball 전체 영역에서 ball 태그 찾기
-            win_ball_pattern = r'win_ball["\']?\s*>([^<]*(?:<[^>]*>[^<]*)*?)</div>\s*</div>'
-            win_ball_match = re.search(win_ball_pattern, html, re.DOTALL | re.IGNORECASE)
-            
-            if win_ball_match:
-                win_ball_html = win_ball_match.group(1)
-                ball_pattern = r'ball[^"]*"[^>]*>(\d+)</span>'
-                all_balls = re.findall(ball_pattern, win_ball_html, re.IGNORECASE)
-                all_balls = [int(b) for b in all_balls if 1 <= int(b) <= 45]
-                
-                if len(all_balls) >= 7:
-                    numbers = all_balls[:6]
-                    bonus = all_balls[6]
-                    logger.info(f"📊 win_ball에서 추출: {numbers} + 보너스 {bonus}")
-        
-        # 방법 3: 여전히 못 찾았으면 전체 HTML에서 ball 클래스 찾기
-        if len(numbers) < 6 or bonus is None:
-            ball_pattern = r'<span[^>]*class="ball[^"]*"[^>]*>(\d+)</span>'
-            all_balls = re.findall(ball_pattern, html, re.IGNORECASE)
-            all_balls = [int(b) for b in all_balls if 1 <= int(b) <= 45]
-            
-            if len(all_balls) >= 7:
-                numbers = all_balls[:6]
-                bonus = all_balls[6]
-                logger.info(f"📊 전체 HTML에서 추출: {numbers} + 보너스 {bonus}")
-        
-        # 유효성 검사
-        if len(numbers) < 6:
-            logger.warning(f"⚠️ 당첨번호 부족: {numbers}")
-            return None
-        
-        if bonus is None:
-            logger.warning("⚠️ 보너스 번호를 찾을 수 없음")
-            return None
-        
-        if not all(1 <= n <= 45 for n in numbers) or not (1 <= bonus <= 45):
-            logger.warning(f"⚠️ 파싱된 번호가 유효하지 않음: {numbers} + {bonus}")
-            return None
+        logger.info(f"📊 당첨번호 추출: {parsed['numbers']} + 보너스 {parsed['bonus']} ({parsed['draw_no']}회)")
+        if parsed["prize_1st"]:
+            logger.info(f"💰 당첨금: {parsed['prize_1st']:,}원, 당첨자: {parsed['winners_1st']}명")
         
-        # 회차 번호 확인 - 네이버 검색 결과에서 실제 회차 추출
-        draw_found = None
-        draw_date = None
-        
-        # 회차 패턴: "1205회" 또는 "1205회차"
-        draw_no_pattern = r'(\d{4})회'
-        draw_no_match = re.search(draw_no_pattern, html)
-        if draw_no_match:
-            draw_found = int(draw_no_match.group(1))
-            logger.info(f"📊 검색결과 회차: {draw_found}회")
-        
-        # 요청한 회차와 검색결과 회차가 다르면 실패 처리
-        # (네이버는 항상 최신 회차만 보여주므로, 과거/미래 회차 요청 시 불일치)
-        if draw_found is not None and draw_found != draw_no:
-            logger.warning(f"⚠️ 요청 회차({draw_no})와 검색결과 회차({draw_found})가 다름 - 해당 회차 없음")
+        result = naver_result_to_draw(parsed, draw_no)
+        if result is None:
             return None
         
-        # 회차를 찾지 못했으면 요청 회차 사용
-        if draw_found is None:
-            draw_found = draw_no
-        
-        # 날짜 패턴: "2026.01.03" 또는 "(2026.01.03 추첨)"
-        date_pattern = r'\((\d{4}\.\d{2}\.\d{2})\s*추첨?\)'
-        date_match = re.search(date_pattern, html)
-        if date_match:
-            draw_date = date_match.group(1).replace('.', '-')
+        # 발표된 회차는 바뀌지 않으므로 원본과 함께 캐시
+        # 페이지에서 회차를 확인하지 못했으면 저장하지 않음 (네이버는 최신 회차만 보여주므로
+        # 요청 회차로 가정한 결과가 지난 회차 번호로 영구히 남을 수 있음)
+        if parsed["draw_no"] == draw_no:
+            store_draw(NAVER_SOURCE, draw_no, url, parser.text(), result, PARSER_VERSION,
+                       complete=not stopped_early)
         else:
-            # 날짜가 없으면 오늘 또는 직전 토요일 계산
-            from datetime import datetime, timedelta
-            today = datetime.now()
-            days_since_saturday = (today.weekday() + 2) % 7
-            last_saturday = today - timedelta(days=days_since_saturday)
-            draw_date = last_saturday.strftime('%Y-%m-%d')
-        
-        result = {
-            'drwNo': draw_found,
-            'drwNoDate': draw_date,
-            'drwtNo1': numbers[0],
-            'drwtNo2': numbers[1],
-            'drwtNo3': numbers[2],
-            'drwtNo4': numbers[3],
-            'drwtNo5': numbers[4],
-            'drwtNo6': numbers[5],
-            'bnusNo': bonus,
-            'returnValue': 'success'
-        }
-        
-        # 당첨금 정보 추가 (있으면)
-        if prize_1st:
-            result['firstWinamnt'] = prize_1st
-        if winners_1st:
-            result['firstPrzwnerCo'] = winners_1st
-        
-        logger.info(f"✅ {draw_found}회차 네이버에서 가져오기 성공: {numbers} + 보너스 {bonus}")
+            logger.info(f"ℹ️ 검색결과에 회차 표시가 없어 {draw_no}회차 응답은 캐시하지 않음")
+        
+        logger.info(f"✅ {draw_no}회차 네이버에서 가져오기 성공: {parsed['numbers']} + 보너스 {parsed['bonus']}")
         return result
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"❌ 네이버 검색 네트워크 오류: {e}")
         return None
     except Exception as e:
@@ -447,6 +373,161 @@ def fetch_winning_number_from_cache(draw_no: int) -> Optional[Dict]:
         logger.info(f"ℹ️ {draw_no}회차가 캐시에 없음 - 네이버 검색 시도")
         return fetch_from_naver_search(draw_no)
 
+def winning_number_row(draw_data: Dict) -> Dict:
+    """
+    동행복권 API 형식(drwNo, drwtNo1~6, bnusNo, ...)의 회차 정보를 winning_numbers 컬럼 딕셔너리로 변환
+    (bulk insert와 build_winning_number가 같은 매핑을 사용)
+    """
+    # 추첨일 파싱
+    draw_date_str = draw_data.get("drwNoDate")  # "2024-01-06" 형식
+    draw_date = None
+    if draw_date_str:
+        try:
+            draw_date = datetime.strptime(draw_date_str, "%Y-%m-%d")
+        except:
+            pass
+    
+    return {
+        "draw_number": draw_data.get("drwNo"),
+        "number1": draw_data.get("drwtNo1"),
+        "number2": draw_data.get("drwtNo2"),
+        "number3": draw_data.get("drwtNo3"),
+        "number4": draw_data.get("drwtNo4"),
+        "number5": draw_data.get("drwtNo5"),
+        "number6": draw_data.get("drwtNo6"),
+        "bonus_number": draw_data.get("bnusNo"),
+        "prize_1st": draw_data.get("firstWinamnt"),
+        "prize_2nd": draw_data.get("secondWinamnt"),
+        "prize_3rd": draw_data.get("thirdWinamnt"),
+        "prize_4th": draw_data.get("fourthWinamnt"),
+        "prize_5th": draw_data.get("fifthWinamnt"),
+        "winners_1st": draw_data.get("firstPrzwnerCo"),
+        "winners_2nd": draw_data.get("secondPrzwnerCo"),
+        "winners_3rd": draw_data.get("thirdPrzwnerCo"),
+        "winners_4th": draw_data.get("fourthPrzwnerCo"),
+        "winners_5th": draw_data.get("fifthPrzwnerCo"),
+        "total_sales": draw_data.get("totSellamnt"),
+        "draw_date": draw_date
+    }
+
+def build_winning_number(draw_data: Dict) -> WinningNumber:
+    """
+    동행복권 API 형식의 회차 정보를 WinningNumber 객체로 변환
+    (DB에 추가하지는 않음)
+    """
+    return WinningNumber(**winning_number_row(draw_data))
+
+def _dialect_insert(db: Session):
+    """DB 종류별 INSERT 구성 함수 (ON CONFLICT 지원 DB만, 아니면 None)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        return dialect_insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        return dialect_insert
+    return None
+
+# ON CONFLICT DO UPDATE 시 덮어쓰지 않는 컬럼
+_UPSERT_KEEP_COLUMNS = {"id", "draw_number", "created_at", "updated_at"}
+
+def upsert_winning_numbers(db: Session,
+                           draws: Iterable[Dict],
+                           update: bool = False,
+                           chunk_size: int = UPSERT_CHUNK_SIZE) -> Dict[str, object]:
+    """
+    여러 회차를 한 트랜잭션으로 저장
+    
+    - PostgreSQL/SQLite: chunk_size개씩 INSERT ... ON CONFLICT (draw_number) DO NOTHING
+      (update=True면 DO UPDATE로 기존 회차 덮어씀) + RETURNING으로 실제 저장된 회차 확인
+    - 그 밖의 DB: 한 번의 SELECT로 기존 회차를 거른 뒤 executemany
+    - 통계 집계는 새 회차 하나면 delta, 그 이상이거나 기존 회차를 덮어썼으면 재생성
+    
+    Args:
+        draws: 동행복권 API 형식(drwNo, drwtNo1~6, bnusNo, ...) 회차 정보
+    
+    Returns:
+        {"inserted", "updated", "skipped", "inserted_draws"}
+        (실패 시 롤백 후 예외 전달)
+    """
+    rows_by_draw: Dict[int, Dict] = {}
+    for draw_data in draws:
+        row = winning_number_row(draw_data)
+        rows_by_draw.setdefault(row["draw_number"], row)
+    rows = [rows_by_draw[n] for n in sorted(rows_by_draw)]
+    
+    inserted: List[int] = []
+    updated: List[int] = []
+    if not rows:
+        return {"inserted": 0, "updated": 0, "skipped": 0, "inserted_draws": inserted}
+    
+    dialect_insert = _dialect_insert(db)
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            if dialect_insert is None:
+                chunk_draws = [row["draw_number"] for row in chunk]
+                existing = {
+                    n for (n,) in db.query(WinningNumber.draw_number).filter(
+                        WinningNumber.draw_number.in_(chunk_draws)
+                    )
+                }
+                new_rows = [row for row in chunk if row["draw_number"] not in existing]
+                if new_rows:
+                    db.execute(insert(WinningNumber), new_rows)
+                inserted.extend(row["draw_number"] for row in new_rows)
+                continue
+            
+            stmt = dialect_insert(WinningNumber).values(chunk)
+            if update:
+                # DO UPDATE는 새 행/덮어쓴 행 모두 돌려주므로 기존 회차는 미리 확인
+                existing = {
+                    n for (n,) in db.query(WinningNumber.draw_number).filter(
+                        WinningNumber.draw_number.in_([row["draw_number"] for row in chunk])
+                    )
+                }
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[WinningNumber.draw_number],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in chunk[0] if column not in _UPSERT_KEEP_COLUMNS
+                    } | {"updated_at": func.now()},
+                )
+            else:
+                existing = set()
+                stmt = stmt.on_conflict_do_nothing(index_elements=[WinningNumber.draw_number])
+            
+            returned = [n for (n,) in db.execute(stmt.returning(WinningNumber.draw_number))]
+            inserted.extend(n for n in returned if n not in existing)
+            updated.extend(n for n in returned if n in existing)
+        
+        if len(inserted) == 1 and not updated:
+            apply_new_draw(db, db.query(WinningNumber).filter(
+                WinningNumber.draw_number == inserted[0]
+            ).one())
+        elif inserted or updated:
+            rebuild_aggregates(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    inserted.sort()
+    if updated:
+        # 지난 회차를 덮어썼으면 미리 렌더링해 둔 아카이브 응답도 다시 만듦
+        invalidate_draw_archive(updated)
+    if inserted or updated:
+        invalidate_draw_snapshot()
+        logger.info(f"💾 회차 일괄 저장 완료: 신규 {len(inserted)}개"
+                    + (f" ({inserted[0]}~{inserted[-1]}회)" if inserted else "")
+                    + (f", 갱신 {len(updated)}개" if updated else ""))
+    return {
+        "inserted": len(inserted),
+        "updated": len(updated),
+        "skipped": len(rows) - len(inserted) - len(updated),
+        "inserted_draws": inserted,
+    }
+
 def save_winning_number_to_db(db: Session, draw_data: Dict) -> Optional[WinningNumber]:
     """
     동행복권 API 응답을 DB에 저장
@@ -456,113 +537,113 @@ def save_winning_number_to_db(db: Session, draw_data: Dict) -> Optional[WinningN
         draw_data: API에서 받은 회차 정보
         
     Returns:
-        저장된 WinningNumber 객체 또는 None
+        저장된(또는 이미 있던) WinningNumber 객체 또는 None
     """
+    draw_no = draw_data.get("drwNo")
     try:
-        draw_no = draw_data.get("drwNo")
-        
-        # 이미 DB에 있는지 확인
-        existing = db.query(WinningNumber).filter(
-            WinningNumber.draw_number == draw_no
-        ).first()
-        
-        if existing:
-            logger.info(f"⏭️  {draw_no}회차는 이미 DB에 저장되어 있음")
-            return existing
-        
-        # 추첨일 파싱
-        draw_date_str = draw_data.get("drwNoDate")  # "2024-01-06" 형식
-        draw_date = None
-        if draw_date_str:
-            try:
-                draw_date = datetime.strptime(draw_date_str, "%Y-%m-%d")
-            except:
-                pass
-        
-        # WinningNumber 객체 생성
-        winning_number = WinningNumber(
-            draw_number=draw_no,
-            number1=draw_data.get("drwtNo1"),
-            number2=draw_data.get("drwtNo2"),
-            number3=draw_data.get("drwtNo3"),
-            number4=draw_data.get("drwtNo4"),
-            number5=draw_data.get("drwtNo5"),
-            number6=draw_data.get("drwtNo6"),
-            bonus_number=draw_data.get("bnusNo"),
-            prize_1st=draw_data.get("firstWinamnt"),
-            prize_2nd=draw_data.get("secondWinamnt"),
-            prize_3rd=draw_data.get("thirdWinamnt"),
-            prize_4th=draw_data.get("fourthWinamnt"),
-            prize_5th=draw_data.get("fifthWinamnt"),
-            winners_1st=draw_data.get("firstPrzwnerCo"),
-            winners_2nd=draw_data.get("secondPrzwnerCo"),
-            winners_3rd=draw_data.get("thirdPrzwnerCo"),
-            winners_4th=draw_data.get("fourthPrzwnerCo"),
-            winners_5th=draw_data.get("fifthPrzwnerCo"),
-            total_sales=draw_data.get("totSellamnt"),
-            draw_date=draw_date
-        )
-        
-        db.add(winning_number)
-        db.commit()
-        db.refresh(winning_number)
-        
-        logger.info(f"💾 {draw_no}회차 DB 저장 완료: [{winning_number.number1}, {winning_number.number2}, {winning_number.number3}, {winning_number.number4}, {winning_number.number5}, {winning_number.number6}] + 보너스 {winning_number.bonus_number}")
-        
-        return winning_number
-        
+        result = upsert_winning_numbers(db, [draw_data])
     except Exception as e:
         logger.error(f"❌ DB 저장 실패: {e}")
-        db.rollback()
         return None
+    
+    if not result["inserted"]:
+        logger.info(f"⏭️  {draw_no}회차는 이미 DB에 저장되어 있음")
+    return db.query(WinningNumber).filter(WinningNumber.draw_number == draw_no).first()
+
+def save_winning_numbers_batch(db: Session, draws: List[Dict]) -> int:
+    """
+    여러 회차를 한 트랜잭션으로 저장 (이미 있는 회차는 건너뜀)
+    
+    Returns:
+        새로 저장한 회차 수 (실패 시 롤백 후 예외 전달)
+    """
+    return upsert_winning_numbers(db, draws)["inserted"]
+
+# 확인된 최신 회차 캐시: (회차, 만료 시각 epoch)
+_latest_draw_cache = None
+LATEST_DRAW_RETRY_SECONDS = 600  # 발표 지연 시 재확인 간격
+
+def _resolve_latest_draw(estimate: int, floor: int) -> int:
+    """
+    달력 추정 회차부터 확인 (보통 요청 1번)
+    없으면 아래로 1, 2, 4, ... 칸씩 건너뛰며(galloping) 존재하는 회차를 찾고
+    존재/부재 사이를 이진 탐색으로 좁힘. floor(이미 아는 회차) 아래로는 내려가지 않음
+    """
+    def exists(draw_no: int) -> bool:
+        return fetch_winning_number(draw_no) is not None
+    
+    if estimate <= floor:
+        return floor
+    if exists(estimate):
+        return estimate
+    
+    missing = estimate
+    found = floor
+    step = 1
+    while estimate - step > floor:
+        probe = estimate - step
+        if exists(probe):
+            found = probe
+            break
+        missing = probe
+        step *= 2
+    
+    while missing - found > 1:
+        mid = (found + missing) // 2
+        if exists(mid):
+            found = mid
+        else:
+            missing = mid
+    return found
 
 def get_latest_draw_number(start_from: Optional[int] = None) -> Optional[int]:
     """
-    현재 최신 회차 번호 추정 (네이버 검색 기반)
+    현재 최신 회차 번호 (추첨 달력 추정 + 네이버 검색 확인)
+    
+    매주 토요일 추첨 일정으로 현재 회차를 추정한 뒤 확인하고,
+    확인된 값은 다음 추첨 결과 발표 시각까지 캐시 (대부분 요청 0~1번)
     
     Args:
-        start_from: 검색 시작 회차 (None이면 1회차부터, 값이 있으면 해당 회차+1부터 검색)
+        start_from: DB에 이미 있는 최신 회차 (이보다 아래는 확인하지 않음)
     
     Returns:
         최신 회차 번호 또는 None
     """
-    # start_from이 있으면 그 다음 회차부터 검색 (증분 업데이트용)
-    if start_from and start_from > 0:
-        start_draw = start_from + 1
-        logger.info(f"🔍 최신 회차 검색 ({start_draw}회차부터)")
+    global _latest_draw_cache
+    floor = start_from if start_from and start_from > 0 else 0
+    now = time.time()
+    
+    cached = _latest_draw_cache
+    if cached and now < cached[1]:
+        latest = max(cached[0], floor)
+        logger.info(f"🎯 최신 회차 (캐시): {latest}회")
+        return latest if latest > 0 else start_from
+    
+    estimate = expected_latest_draw()
+    logger.info(f"🔍 최신 회차 확인 (달력 추정: {estimate}회, 기준: {floor}회)")
+    latest = _resolve_latest_draw(estimate, floor)
+    
+    if latest >= estimate:
+        # 다음 추첨 결과 발표 전까지는 바뀌지 않음
+        expires = next_draw_datetime().timestamp()
     else:
-        start_draw = 1
-        logger.info(f"🔍 최신 회차 검색 (1회차부터)")
-    
-    last_success_draw = start_from if start_from else 0
-    drw_no = start_draw
-    
-    while True:
-        data = fetch_winning_number(drw_no)
-        if not data:
-            # 실패 = 해당 회차 없음 (아직 추첨 전)
-            if last_success_draw > 0:
-                logger.info(f"🎯 최신 회차 확정: {last_success_draw}회")
-            else:
-                logger.info(f"ℹ️ 새로운 회차 없음 (현재 최신: {start_from}회)")
-            break
-        else:
-            last_success_draw = drw_no
-            if drw_no % 100 == 0 or (start_from and drw_no == start_draw):
-                logger.info(f"  ✅ {drw_no}회차 확인됨...")
-        
-        drw_no += 1
-        
-        # 무한루프 방지
-        if drw_no > 2000:
-            logger.warning(f"⚠️ 2000회차 도달, 검색 중단")
-            break
+        # 결과 발표 지연 (또는 조회 실패) - 잠시 후 다시 확인
+        logger.info(f"ℹ️ {estimate}회차 결과 미확인, {LATEST_DRAW_RETRY_SECONDS}초 후 재확인")
+        expires = now + LATEST_DRAW_RETRY_SECONDS
     
-    return last_success_draw if last_success_draw > 0 else start_from
+    if latest > 0:
+        _latest_draw_cache = (latest, expires)
+        logger.info(f"🎯 최신 회차 확정: {latest}회")
+        return latest
+    
+    logger.info(f"ℹ️ 새로운 회차 없음 (현재 최신: {start_from}회)")
+    return start_from
 
 def sync_all_winning_numbers(db: Session, start_draw: int = 1, end_draw: Optional[int] = None) -> Dict:
     """
     특정 범위의 당첨 번호를 모두 DB에 동기화
+    누락 회차만 여러 스레드로 동시에 조회하고 (호스트별 속도 제한 적용)
+    SYNC_BATCH_SIZE개씩 모아 한 번에 저장
     
     Args:
         db: SQLAlchemy DB 세션
@@ -570,7 +651,7 @@ def sync_all_winning_numbers(db: Session, start_draw: int = 1, end_draw: Optiona
         end_draw: 종료 회차 (None이면 최신 회차까지)
         
     Returns:
-        통계 정보 딕셔너리
+        통계 정보 딕셔너리 (inserted_draws: 새로 저장된 회차 목록, 오름차순)
     """
     if end_draw is None:
         end_draw = get_latest_draw_number()
@@ -580,34 +661,59 @@ def sync_all_winning_numbers(db: Session, start_draw: int = 1, end_draw: Optiona
     
     logger.info(f"🔄 {start_draw}회 ~ {end_draw}회 동기화 시작")
     
+    # 이미 있는 회차는 한 번의 SELECT로 확인
+    existing = {
+        row[0] for row in db.query(WinningNumber.draw_number).filter(
+            WinningNumber.draw_number.between(start_draw, end_draw)
+        ).all()
+    }
+    missing = [n for n in range(start_draw, end_draw + 1) if n not in existing]
+    skip_count = len(existing)
+    
     success_count = 0
-    skip_count = 0
     fail_count = 0
+    inserted_draws: List[int] = []
+    pending: List[Dict] = []
     
-    for draw_no in range(start_draw, end_draw + 1):
-        # DB에 이미 있는지 확인
-        existing = db.query(WinningNumber).filter(
-            WinningNumber.draw_number == draw_no
-        ).first()
-        
-        if existing:
-            skip_count += 1
-            if draw_no % 100 == 0:
-                logger.info(f"⏭️  {draw_no}회차 스킵 (이미 존재)")
-            continue
-        
-        # API에서 가져오기
-        draw_data = fetch_winning_number(draw_no)
-        if not draw_data:
-            fail_count += 1
-            continue
-        
-        # DB에 저장
-        result = save_winning_number_to_db(db, draw_data)
-        if result:
-            success_count += 1
-        else:
-            fail_count += 1
+    def flush_pending():
+        nonlocal success_count, skip_count, fail_count
+        if not pending:
+            return
+        try:
+            result = upsert_winning_numbers(db, pending)
+            success_count += result["inserted"]
+            skip_count += result["skipped"]
+            inserted_draws.extend(result["inserted_draws"])
+        except Exception as e:
+            logger.error(f"❌ DB 일괄 저장 실패: {e}")
+            fail_count += len(pending)
+        pending.clear()
+    
+    if missing:
+        workers = max(1, min(SYNC_WORKERS, len(missing)))
+        logger.info(f"🌐 누락 회차 {len(missing)}개 수집 (동시 {workers}개, 호스트당 초당 {DEFAULT_RATE:g}회, "
+                    f"최소 약 {len(missing) / DEFAULT_RATE:.0f}초)")
+        
+        # 네트워크 조회만 병렬로, DB 저장은 현재 스레드에서 배치로
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch_winning_number, n): n for n in missing}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    draw_data = future.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ {futures[future]}회차 조회 실패: {e}")
+                    draw_data = None
+                
+                if draw_data:
+                    pending.append(draw_data)
+                else:
+                    fail_count += 1
+                
+                if len(pending) >= SYNC_BATCH_SIZE:
+                    flush_pending()
+                if done % 100 == 0:
+                    logger.info(f"  📥 {done}/{len(missing)}개 회차 조회...")
+        flush_pending()
     
     logger.info(f"✅ 동기화 완료: 성공 {success_count}개, 스킵 {skip_count}개, 실패 {fail_count}개")
     
@@ -616,6 +722,7 @@ def sync_all_winning_numbers(db: Session, start_draw: int = 1, end_draw: Optiona
         "success_count": success_count,
         "skip_count": skip_count,
         "fail_count": fail_count,
+        "inserted_draws": sorted(inserted_draws),
         "total": end_draw - start_draw + 1
     }
 
@@ -663,3 +770,63 @@ def get_latest_winning_numbers(db: Session, count: int = 10) -> List[WinningNumb
     return db.query(WinningNumber).order_by(
         WinningNumber.draw_number.desc()
     ).limit(count).all()
+
+# 목록 조회에서 선택할 수 있는 필드 → 컬럼 (numbers는 번호 6개)
+WINNING_NUMBER_FIELDS = {
+    "draw_number": (WinningNumber.draw_number,),
+    "numbers": (WinningNumber.number1, WinningNumber.number2, WinningNumber.number3,
+                WinningNumber.number4, WinningNumber.number5, WinningNumber.number6),
+    "bonus_number": (WinningNumber.bonus_number,),
+    "draw_date": (WinningNumber.draw_date,),
+    "prize_1st": (WinningNumber.prize_1st,),
+    "prize_2nd": (WinningNumber.prize_2nd,),
+    "prize_3rd": (WinningNumber.prize_3rd,),
+    "prize_4th": (WinningNumber.prize_4th,),
+    "prize_5th": (WinningNumber.prize_5th,),
+    "winners_1st": (WinningNumber.winners_1st,),
+    "total_sales": (WinningNumber.total_sales,),
+}
+
+def list_winning_numbers(db: Session,
+                         fields: List[str],
+                         limit: int,
+                         descending: bool = True,
+                         after: Optional[int] = None,
+                         from_draw: Optional[int] = None,
+                         to_draw: Optional[int] = None,
+                         from_date: Optional[datetime] = None,
+                         to_date: Optional[datetime] = None) -> List[Dict]:
+    """
+    회차 범위/추첨일 조건으로 당첨 번호 조회 (keyset 페이지네이션)
+    
+    - after: 이전 페이지 마지막 회차 (OFFSET 없이 draw_number 인덱스로 이어서 조회)
+    - fields: 필요한 필드만 SELECT (WINNING_NUMBER_FIELDS의 키)
+    - from_date 이상, to_date 미만
+    
+    Returns:
+        fields 순서의 딕셔너리 리스트 (최대 limit개)
+    """
+    columns = [column for field in fields for column in WINNING_NUMBER_FIELDS[field]]
+    query = db.query(*columns)
+    if after is not None:
+        query = query.filter(WinningNumber.draw_number < after if descending else WinningNumber.draw_number > after)
+    if from_draw is not None:
+        query = query.filter(WinningNumber.draw_number >= from_draw)
+    if to_draw is not None:
+        query = query.filter(WinningNumber.draw_number <= to_draw)
+    if from_date is not None:
+        query = query.filter(WinningNumber.draw_date >= from_date)
+    if to_date is not None:
+        query = query.filter(WinningNumber.draw_date < to_date)
+    order = WinningNumber.draw_number.desc() if descending else WinningNumber.draw_number.asc()
+    
+    results = []
+    for row in query.order_by(order).limit(limit):
+        item = {}
+        index = 0
+        for field in fields:
+            width = len(WINNING_NUMBER_FIELDS[field])
+            item[field] = list(row[index:index + width]) if field == "numbers" else row[index]
+            index += width
+        results.append(item)
+    return results
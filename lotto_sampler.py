@@ -0,0 +1,126 @@
+"""
+가중치 번호 샘플러 (Walker/Vose alias method)
+(모드, 빈도 버전, 제외 번호) 조합별로 테이블을 한 번만 만들고 LRU로 캐싱
+"""
+import random
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, List, Optional
+
+LOTTO_MIN, LOTTO_MAX = 1, 45
+SAMPLER_CACHE_SIZE = 64
+MAX_REJECTIONS = 64  # 연속 거부가 이만큼 쌓이면 남은 가중치로 직접 추첨
+
+
+class InfeasibleConstraintsError(ValueError):
+    """행운/제외 번호 때문에 조건을 만족하는 조합이 하나도 없을 때 (numpy 없이도 import 가능하도록 여기 둠)"""
+
+
+class AliasSampler:
+    """
+    1~45번 가중치에 대한 alias 테이블.
+    draw()는 O(1), 비복원 추출은 이미 뽑힌 번호를 거부하는 방식으로 구현
+    (거부 후 재추첨 = 남은 번호들 사이의 가중 추첨과 같은 분포)
+    """
+
+    def __init__(self, weights: List[float]):
+        n = len(weights)
+        self.weights = [float(w) if w > 0 else 0.0 for w in weights]
+        self.numbers = list(range(LOTTO_MIN, LOTTO_MIN + n))
+        self.support = [i for i, w in enumerate(self.weights) if w > 0]
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+
+        total = sum(self.weights)
+        if total <= 0:
+            return
+
+        # Vose: 평균보다 작은 칸을 큰 칸의 남는 확률로 채움
+        scaled = [w * n / total for w in self.weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def draw(self, rng=random) -> int:
+        """번호 하나를 가중치 비율로 추첨 (복원)"""
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        if i >= len(self.prob):
+            i = len(self.prob) - 1
+        return self.numbers[i] if (u - i) < self.prob[i] else self.numbers[self.alias[i]]
+
+    def sample(self, k: int, rng=random, exclude: Iterable[int] = ()) -> List[int]:
+        """
+        비복원으로 최대 k개 추첨 (exclude 번호는 뽑지 않음)
+        가중치가 0보다 큰 번호가 부족하면 가능한 만큼만 반환
+        """
+        taken = set(exclude)
+        available = [i for i in self.support if self.numbers[i] not in taken]
+        k = min(k, len(available))
+        chosen = []
+        rejections = 0
+        while len(chosen) < k:
+            if rejections >= MAX_REJECTIONS:
+                # 남은 번호의 가중치 합이 너무 작으면 선형 스캔으로 한 개 추첨
+                rest = [i for i in available if self.numbers[i] not in taken]
+                r = rng.random() * sum(self.weights[i] for i in rest)
+                pick = self.numbers[rest[-1]]
+                for i in rest:
+                    r -= self.weights[i]
+                    if r <= 0:
+                        pick = self.numbers[i]
+                        break
+            else:
+                pick = self.draw(rng)
+                if pick in taken:
+                    rejections += 1
+                    continue
+            taken.add(pick)
+            chosen.append(pick)
+            rejections = 0
+        return chosen
+
+
+_samplers: "OrderedDict[Hashable, AliasSampler]" = OrderedDict()
+_samplers_lock = threading.Lock()
+
+
+def sampler_cache_key(mode: str, version: Hashable, exclude_numbers: Optional[Iterable[int]]) -> tuple:
+    return (mode, version, frozenset(exclude_numbers or ()))
+
+
+def get_sampler(mode: str,
+                version: Hashable,
+                exclude_numbers: Optional[Iterable[int]],
+                build_weights: Callable[[], List[float]]) -> AliasSampler:
+    """
+    (mode, 빈도 버전, 제외 번호) 별 샘플러 반환
+    캐시에 없을 때만 build_weights()로 가중치를 계산해 테이블 생성
+    """
+    key = sampler_cache_key(mode, version, exclude_numbers)
+    with _samplers_lock:
+        sampler = _samplers.get(key)
+        if sampler is not None:
+            _samplers.move_to_end(key)
+            return sampler
+
+    sampler = AliasSampler(build_weights())
+    with _samplers_lock:
+        _samplers[key] = sampler
+        _samplers.move_to_end(key)
+        while len(_samplers) > SAMPLER_CACHE_SIZE:
+            _samplers.popitem(last=False)
+    return sampler
+
+
+def frequency_version(freq_map: dict) -> int:
+    """빈도 버전이 주어지지 않았을 때(파일 기반 통계) 쓰는 빈도표 해시"""
+    return hash(tuple(sorted((str(k), v) for k, v in freq_map.items())))
@@ -23,6 +23,13 @@ def migrate_db():
             )
             session.commit()
             print(f"✅ {result.rowcount}개 사용자의 테마를 light로 업데이트")
+            
+            # 회차별 당첨 확인 인덱스 (기존 테이블에는 create_all이 추가하지 않음)
+            session.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_winning_checks_draw_user ON winning_checks (draw_number, user_id)")
+            )
+            session.commit()
+            print("✅ winning_checks (draw_number, user_id) 인덱스 확인")
         
         print("\n🎉 마이그레이션 완료!")
         
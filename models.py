@@ -1,7 +1,7 @@
 """
 데이터베이스 모델 정의
 """
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, ForeignKey, JSON, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -104,6 +104,24 @@ class WinningNumber(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class DrawAggregate(Base):
+    """
+    당첨 번호 통계 집계 (새 회차 저장 시 증분 갱신)
+    """
+    __tablename__ = "draw_aggregates"
+    __table_args__ = (
+        UniqueConstraint("scope", "category", "key", name="uq_draw_aggregates_scope_category_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(20), nullable=False)  # total(전체 회차), recent(최근 N회차)
+    category = Column(String(20), nullable=False)  # number, decade, parity, sum, consecutive, meta
+    key = Column(String(20), nullable=False)  # 번호, "1-10", "even", 합계, "two" 등
+    count = Column(BigInteger, nullable=False, default=0)
+    
+    # 메타데이터
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class SavedNumber(Base):
     """
     사용자가 저장한 로또 번호
@@ -155,6 +173,11 @@ class WinningCheck(Base):
     
     # 관계
     user = relationship("User", back_populates="winning_checks")
+    
+    # 회차별 일괄 당첨 확인 시 중복 체크용
+    __table_args__ = (
+        Index("ix_winning_checks_draw_user", "draw_number", "user_id"),
+    )
 
 class UserSettings(Base):
     """
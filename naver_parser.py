@@ -0,0 +1,175 @@
+"""
+네이버 로또 검색 결과 페이지 파서
+페이지 전체(수백 KB)에 큰 정규식을 돌리는 대신, 받은 조각을 순서대로 훑어
+win_number_box 블록이 끝나는 즉시 멈춘다 (나머지 본문은 읽지 않아도 됨)
+
+    parser = NaverLottoParser()
+    for chunk in chunks:
+        if parser.feed(chunk):
+            break
+    draw = parser.result()
+"""
+import re
+from typing import Dict, List, Optional
+
+# 선택된 회차 탭: "1205회차 (2026.01.03.)"
+_SELECTED_DRAW_RE = re.compile(r'(\d{1,4})회차\s*\((\d{4})\.(\d{2})\.(\d{2})\.?\)')
+# 제목/검색어의 회차: "로또 1205회 당첨번호"
+_TITLE_DRAW_RE = re.compile(r'(\d{4})회')
+# 예전 형식 추첨일: "(2026.01.03 추첨)"
+_DRAW_DATE_RE = re.compile(r'\((\d{4})\.(\d{2})\.(\d{2})\s*추첨?\)')
+_BALL_RE = re.compile(r'class="ball[^"]*"[^>]*>(\d{1,2})</span>')
+_PRIZE_RE = re.compile(r'1등\s*당첨금[^<]*<strong[^>]*>([\d,]+)</strong>원[^(<]*\(당첨[^\d<]*(\d+)')
+
+_BOX_START = 'win_number_box'
+_BONUS_START = 'bonus_number'
+_BOX_END_RE = re.compile(r'</p>\s*</div>')
+MAX_BOX_CHARS = 8192  # 닫는 태그를 못 찾아도 이 길이가 모이면 블록이 끝난 것으로 처리
+
+# 조각 경계에 걸친 패턴을 놓치지 않도록 남겨 두는 앞 조각 꼬리 길이
+_OVERLAP = 256
+
+BALLS_PER_DRAW = 7  # 당첨 번호 6개 + 보너스
+
+# 추출 규칙을 바꾸면 올림 (crawler_cache에 저장된 원본을 다시 파싱하는 기준)
+PARSER_VERSION = 1
+
+
+class NaverLottoParser:
+    """
+    HTML 조각을 feed()로 받아 당첨 정보 추출
+    win_number_box 블록을 다 받으면 feed()가 True를 반환
+    record=True면 읽은 본문을 text()로 돌려줌 (응답 캐시 저장용)
+    """
+
+    def __init__(self, record: bool = False):
+        self._chunks: Optional[List[str]] = [] if record else None
+        self._tail = ''          # 블록 시작 전: 경계 처리용 꼬리
+        self._box: Optional[str] = None  # 블록 시작 후: 블록 본문
+        self.done = False
+        self.chars_read = 0
+
+        self.selected_draw: Optional[int] = None
+        self.selected_date: Optional[str] = None
+        self.title_draw: Optional[int] = None
+        self.legacy_date: Optional[str] = None
+        self.page_balls: List[int] = []  # 블록을 못 찾을 때 쓰는 문서 앞쪽 ball 번호
+
+    def feed(self, chunk: str) -> bool:
+        if self.done:
+            return True
+        self.chars_read += len(chunk)
+        if self._chunks is not None:
+            self._chunks.append(chunk)
+
+        if self._box is not None:
+            self._box += chunk
+            return self._check_box_end()
+
+        text = self._tail + chunk
+        start = text.find(_BOX_START)
+        head = text if start < 0 else text[:start]
+        self._scan_head(head, len(self._tail))
+
+        if start >= 0:
+            self._box = text[start:]
+            return self._check_box_end()
+
+        self._tail = text[-_OVERLAP:]
+        return False
+
+    def text(self) -> str:
+        """지금까지 읽은 본문 (record=True일 때만)"""
+        return ''.join(self._chunks or [])
+
+    def close(self) -> bool:
+        """본문 끝 (블록이 끝까지 안 닫혔어도 지금까지 받은 내용으로 처리)"""
+        self.done = True
+        return True
+
+    def _scan_head(self, text: str, seen: int):
+        """블록 앞부분에서 회차/날짜/ball 정보 수집 (seen: 이전 조각에서 이미 본 길이)"""
+        if self.selected_draw is None:
+            match = _SELECTED_DRAW_RE.search(text)
+            if match:
+                self.selected_draw = int(match.group(1))
+                self.selected_date = f"{match.group(2)}-{match.group(3)}-{match.group(4)}"
+        # 선택된 회차 탭을 찾았으면 제목/예전 형식 날짜는 볼 필요 없음
+        if self.selected_draw is None and self.title_draw is None:
+            match = _TITLE_DRAW_RE.search(text)
+            if match:
+                self.title_draw = int(match.group(1))
+        if self.selected_date is None and self.legacy_date is None:
+            match = _DRAW_DATE_RE.search(text)
+            if match:
+                self.legacy_date = f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
+        if len(self.page_balls) < BALLS_PER_DRAW:
+            for match in _BALL_RE.finditer(text):
+                # 꼬리 부분에서 이미 센 번호는 제외
+                if match.end() <= seen:
+                    continue
+                value = int(match.group(1))
+                if 1 <= value <= 45:
+                    self.page_balls.append(value)
+
+    def _check_box_end(self) -> bool:
+        end = _BOX_END_RE.search(self._box, len(_BOX_START))
+        if end:
+            self._box = self._box[:end.end()]
+            self.done = True
+        elif len(self._box) >= MAX_BOX_CHARS:
+            self._box = self._box[:MAX_BOX_CHARS]
+            self.done = True
+        return self.done
+
+    def result(self) -> Optional[Dict]:
+        """
+        추출 결과
+        Returns:
+            {"draw_no", "draw_date", "numbers", "bonus", "prize_1st", "winners_1st"} 또는 None
+            draw_no/draw_date/prize_1st/winners_1st는 페이지에 없으면 None
+        """
+        numbers: List[int] = []
+        bonus = None
+        prize_1st = None
+        winners_1st = None
+
+        if self._box is not None:
+            split = self._box.find(_BONUS_START)
+            main_html = self._box if split < 0 else self._box[:split]
+            numbers = [int(b) for b in _BALL_RE.findall(main_html) if 1 <= int(b) <= 45]
+            if split >= 0:
+                bonus_balls = _BALL_RE.findall(self._box, split)
+                if bonus_balls:
+                    bonus = int(bonus_balls[0])
+            prize_match = _PRIZE_RE.search(self._box)
+            if prize_match:
+                prize_1st = int(prize_match.group(1).replace(',', ''))
+                winners_1st = int(prize_match.group(2))
+
+        # 블록 구조가 다르면 문서 앞쪽 ball 7개 사용
+        if (len(numbers) < 6 or bonus is None) and len(self.page_balls) >= BALLS_PER_DRAW:
+            numbers = self.page_balls[:6]
+            bonus = self.page_balls[6]
+
+        if len(numbers) < 6 or bonus is None:
+            return None
+
+        return {
+            "draw_no": self.selected_draw if self.selected_draw is not None else self.title_draw,
+            "draw_date": self.selected_date or self.legacy_date,
+            "numbers": numbers[:6],
+            "bonus": bonus,
+            "prize_1st": prize_1st,
+            "winners_1st": winners_1st,
+        }
+
+
+def parse_naver_lotto(html: str, chunk_size: int = 16384) -> Optional[Dict]:
+    """이미 받은 HTML 전체를 조각 단위로 파싱 (블록이 끝나면 나머지는 건너뜀)"""
+    parser = NaverLottoParser()
+    for start in range(0, len(html), chunk_size):
+        if parser.feed(html[start:start + chunk_size]):
+            break
+    parser.close()
+    return parser.result()
@@ -0,0 +1,177 @@
+"""
+'그럴듯한' 번호 조합 정확 샘플러
+is_plausible 조건(연속 4개 금지, 구간당 3개 이하, 짝수 2~4개, 합계 90~210)을
+만족하는 조합만을 대상으로, 번호 가중치의 곱에 비례하는 확률로 직접 추첨한다.
+
+구간(1-10, 11-20, 21-30, 31-40, 41-45) 단위 DP:
+  상태 = (선택 개수, 짝수 개수, 끝자리 연속 길이, 부분 합)
+  각 구간에서 고를 수 있는 부분집합(최대 3개)을 전이로 사용하고,
+  추첨은 마지막 상태에서 거꾸로 가중치 비례 역추적(backtracking)
+"""
+import threading
+from collections import OrderedDict
+from itertools import combinations
+from typing import Hashable, Iterable, List, Optional
+
+import numpy as np
+
+from lotto_sampler import InfeasibleConstraintsError
+
+LOTTO_MIN, LOTTO_MAX = 1, 45
+PICK = 6
+
+BLOCKS = ((1, 10), (11, 20), (21, 30), (31, 40), (41, 45))
+MAX_PER_BLOCK = 3       # 동일 구간 최대 개수
+MAX_RUN = 3             # 최대 연속 길이
+MIN_EVENS, MAX_EVENS = 2, 4
+MIN_SUM, MAX_SUM = 90, 210
+
+PLAUSIBLE_CACHE_SIZE = 64
+
+
+class _BlockSubsets:
+    """한 구간에서 고를 수 있는 부분집합 목록 (배열로 보관)"""
+
+    def __init__(self, start: int, end: int, weights: List[float], lucky: set):
+        block = list(range(start, end + 1))
+        forced = sorted(n for n in block if n in lucky)
+        free = [n for n in block if n not in lucky and weights[n - LOTTO_MIN] > 0]
+
+        rows = []
+        for size in range(len(forced), MAX_PER_BLOCK + 1):
+            for extra in combinations(free, size - len(forced)):
+                nums = sorted(forced + list(extra))
+                weight = 1.0
+                for n in extra:
+                    weight *= weights[n - LOTTO_MIN]
+                chosen = set(nums)
+                prefix = 0
+                while start + prefix in chosen:
+                    prefix += 1
+                suffix = 0
+                while end - suffix in chosen:
+                    suffix += 1
+                rows.append((nums, weight, sum(1 for n in nums if n % 2 == 0), sum(nums), prefix, suffix))
+
+        self.numbers = np.zeros((len(rows), MAX_PER_BLOCK), dtype=np.int64)
+        for i, row in enumerate(rows):
+            self.numbers[i, :len(row[0])] = row[0]
+        self.size = np.array([len(r[0]) for r in rows], dtype=np.int64)
+        self.weight = np.array([r[1] for r in rows], dtype=np.float64)
+        self.evens = np.array([r[2] for r in rows], dtype=np.int64)
+        self.total = np.array([r[3] for r in rows], dtype=np.int64)
+        self.prefix = np.array([r[4] for r in rows], dtype=np.int64)
+        self.suffix = np.array([r[5] for r in rows], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.size)
+
+
+class PlausibleSetSampler:
+    """
+    조건을 만족하는 6개 조합을 P(S) ∝ Π w(n) 분포로 정확히 추첨
+    (행운 번호는 항상 포함, 가중치 0인 번호는 제외)
+    """
+
+    def __init__(self, weights: List[float], lucky_numbers: Iterable[int] = ()):
+        lucky = set(lucky_numbers)
+        top = max(weights) if weights else 0.0
+        # 곱이 언더/오버플로하지 않도록 최대값 1로 정규화
+        norm = [w / top if top > 0 and w > 0 else 0.0 for w in weights]
+        self.blocks = [_BlockSubsets(start, end, norm, lucky) for start, end in BLOCKS]
+
+        # tables[b] = 앞의 b개 구간까지 처리한 뒤의 상태별 가중치 합
+        shape = (PICK + 1, MAX_EVENS + 1, MAX_RUN + 1, MAX_SUM + 1)
+        table = np.zeros(shape, dtype=np.float64)
+        table[0, 0, 0, 0] = 1.0
+        self.tables = [table]
+        for block in self.blocks:
+            # 직전 연속 길이 + 이번 구간 앞쪽 연속 길이 <= MAX_RUN 인 상태만 합산
+            allowed = np.cumsum(table, axis=2)
+            nxt = np.zeros(shape, dtype=np.float64)
+            for i in range(len(block)):
+                k, e, s = block.size[i], block.evens[i], block.total[i]
+                if k > PICK or e > MAX_EVENS or s > MAX_SUM:
+                    continue
+                src = allowed[:PICK + 1 - k, :MAX_EVENS + 1 - e, MAX_RUN - block.prefix[i], :MAX_SUM + 1 - s]
+                nxt[k:, e:, block.suffix[i], s:] += block.weight[i] * src
+            table = nxt
+            self.tables.append(table)
+
+        final = np.zeros_like(table[PICK])
+        final[MIN_EVENS:MAX_EVENS + 1, :, MIN_SUM:] = table[PICK, MIN_EVENS:MAX_EVENS + 1, :, MIN_SUM:]
+        self.final = final
+        self.total_weight = float(final.sum())
+
+    @property
+    def feasible(self) -> bool:
+        return self.total_weight > 0
+
+    def sample(self, n_sets: int, rng: np.random.Generator) -> List[List[int]]:
+        """n_sets개 조합을 한 번에 역추적으로 추첨 (정렬된 번호 리스트)"""
+        if not self.feasible:
+            raise InfeasibleConstraintsError("행운 번호/제외 번호 조건을 만족하는 번호 조합이 없습니다")
+
+        flat = self.final.ravel()
+        picks = rng.choice(flat.size, size=n_sets, p=flat / flat.sum())
+        evens, run, total = np.unravel_index(picks, self.final.shape)
+        count = np.full(n_sets, PICK, dtype=np.int64)
+        chosen = np.zeros((n_sets, len(self.blocks), MAX_PER_BLOCK), dtype=np.int64)
+        prev_runs = np.arange(MAX_RUN + 1)
+
+        for b in range(len(self.blocks) - 1, -1, -1):
+            block = self.blocks[b]
+            prev = self.tables[b]
+            c = count[:, None] - block.size[None, :]
+            e = evens[:, None] - block.evens[None, :]
+            s = total[:, None] - block.total[None, :]
+            ok = (c >= 0) & (e >= 0) & (s >= 0) & (block.suffix[None, :] == run[:, None])
+            weight = np.where(ok, block.weight[None, :], 0.0)
+            # (세트, 부분집합, 직전 연속 길이) 별 가중치
+            w = weight[:, :, None] * prev[np.clip(c, 0, PICK)[:, :, None],
+                                          np.clip(e, 0, MAX_EVENS)[:, :, None],
+                                          prev_runs[None, None, :],
+                                          np.clip(s, 0, MAX_SUM)[:, :, None]]
+            w[:, (block.prefix[:, None] + prev_runs[None, :]) > MAX_RUN] = 0.0
+
+            w = w.reshape(n_sets, -1)
+            cum = np.cumsum(w, axis=1)
+            u = rng.random(n_sets) * cum[:, -1]
+            idx = np.minimum((cum <= u[:, None]).sum(axis=1), w.shape[1] - 1)
+            j, run = np.divmod(idx, MAX_RUN + 1)
+
+            chosen[:, b] = block.numbers[j]
+            count -= block.size[j]
+            evens -= block.evens[j]
+            total -= block.total[j]
+
+        flat_sets = chosen.reshape(n_sets, -1)
+        return [sorted(int(n) for n in row if n) for row in flat_sets]
+
+
+_plausible_samplers: "OrderedDict[Hashable, PlausibleSetSampler]" = OrderedDict()
+_plausible_lock = threading.Lock()
+
+
+def get_plausible_sampler(key: Hashable,
+                          weights: List[float],
+                          lucky_numbers: Optional[Iterable[int]] = None) -> PlausibleSetSampler:
+    """
+    (가중치 캐시 키, 행운 번호) 별 DP 테이블 반환
+    key는 lotto_sampler.sampler_cache_key와 같은 값을 사용
+    """
+    lucky = frozenset(lucky_numbers or ())
+    cache_key = (key, lucky)
+    with _plausible_lock:
+        sampler = _plausible_samplers.get(cache_key)
+        if sampler is not None:
+            _plausible_samplers.move_to_end(cache_key)
+            return sampler
+
+    sampler = PlausibleSetSampler(weights, lucky)
+    with _plausible_lock:
+        _plausible_samplers[cache_key] = sampler
+        _plausible_samplers.move_to_end(cache_key)
+        while len(_plausible_samplers) > PLAUSIBLE_CACHE_SIZE:
+            _plausible_samplers.popitem(last=False)
+    return sampler
@@ -0,0 +1,141 @@
+"""
+인증된 사용자(principal) 메모리 캐시
+인증이 필요한 요청마다 users 테이블을 다시 조회하지 않도록
+(user_id, 토큰 jti/iat) 단위로 사용자 정보를 짧은 시간 보관
+
+- 같은 토큰으로 들어온 요청은 TTL 동안 DB 조회 없이 처리
+- 다시 로그인해 새 토큰을 받으면 키가 바뀌므로 자연스럽게 새로 조회
+- 사용자 정보가 바뀌는 API 경로는 카카오 로그인(프로필 갱신)뿐이며 여기서 invalidate_user() 호출
+  현재 비활성화/탈퇴 API는 없음 (탈퇴는 이메일 요청 후 DB에서 직접 처리, ACCOUNT_DELETION.md)
+  → DB를 직접 고친 경우 다른 요청에는 최대 TTL 뒤에 반영
+  비활성화/탈퇴 API를 추가하면 그 경로에서도 invalidate_user()를 호출할 것
+- 프로세스별 캐시이므로 다른 워커에는 TTL 뒤에 반영
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Hashable, Optional
+
+from sqlalchemy.orm import Session
+
+from models import User
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))  # 초 (0이면 캐시 안 함)
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))  # 보관할 최대 사용자 수
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    요청 처리 중 읽기만 하는 사용자 정보 (세션에 묶이지 않은 불변 객체)
+    User 모델과 같은 이름의 속성을 가지므로 current_user.id 등 기존 코드 그대로 사용
+    """
+    id: int
+    kakao_id: str
+    email: Optional[str]
+    nickname: Optional[str]
+    profile_image: Optional[str]
+    is_active: bool
+    created_at: Optional[datetime]
+    last_login_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            kakao_id=user.kakao_id,
+            email=user.email,
+            nickname=user.nickname,
+            profile_image=user.profile_image,
+            is_active=bool(user.is_active),
+            created_at=user.created_at,
+            last_login_at=user.last_login_at,
+        )
+
+
+# user_id → {토큰 식별자: (Principal, 만료 시각 monotonic)}
+# 사용자 단위 LRU (오래 안 쓴 사용자부터 제거)
+_entries: "OrderedDict[int, Dict[Hashable, tuple[Principal, float]]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def token_key(payload: Optional[Dict]) -> Hashable:
+    """토큰 페이로드의 식별자 (jti, 없으면 iat, 예전 토큰이면 None)"""
+    if not payload:
+        return None
+    return payload.get("jti") or payload.get("iat")
+
+
+def _get(user_id: int, key: Hashable) -> Optional[Principal]:
+    with _lock:
+        tokens = _entries.get(user_id)
+        if not tokens:
+            return None
+        cached = tokens.get(key)
+        if cached is None:
+            return None
+        principal, expires = cached
+        if expires <= time.monotonic():
+            del tokens[key]
+            return None
+        _entries.move_to_end(user_id)
+        return principal
+
+
+def _put(user_id: int, key: Hashable, principal: Principal):
+    if PRINCIPAL_CACHE_TTL <= 0:
+        return
+    with _lock:
+        now = time.monotonic()
+        tokens = _entries.setdefault(user_id, {})
+        # 다시 읽히지 않는 예전 토큰 항목이 쌓이지 않도록 만료된 것은 여기서 정리
+        for stale in [k for k, (_, expires) in tokens.items() if expires <= now]:
+            del tokens[stale]
+        tokens[key] = (principal, now + PRINCIPAL_CACHE_TTL)
+        _entries.move_to_end(user_id)
+        while len(_entries) > PRINCIPAL_CACHE_SIZE:
+            _entries.popitem(last=False)
+
+
+def get_principal(db: Session,
+                  user_id: int,
+                  key: Hashable = None,
+                  active_only: bool = True) -> Optional[Principal]:
+    """
+    사용자 정보 (캐시에 없으면 DB 조회 후 저장)
+
+    Args:
+        key: 토큰 식별자 (token_key(payload)), 토큰 없이 조회하면 None
+        active_only: True면 비활성 사용자는 None (인증용), False면 존재 여부만 확인
+
+    Returns:
+        Principal 또는 None (없는 사용자, active_only일 때 비활성 사용자)
+    """
+    principal = _get(user_id, key)
+    if principal is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        _put(user_id, key, principal)
+    if active_only and not principal.is_active:
+        return None
+    return principal
+
+
+def invalidate_user(user_id: int):
+    """사용자 정보를 바꾼 뒤 호출 (현재는 로그인 시 프로필 갱신)"""
+    with _lock:
+        if _entries.pop(user_id, None) is not None:
+            logger.debug(f"🧹 사용자 캐시 제거: user_id={user_id}")
+
+
+def clear_principal_cache():
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,190 @@
+"""
+당첨 번호 기반 응답 캐시 (ASGI 미들웨어)
+통계/대시보드/당첨 번호 조회 응답은 새 회차가 저장될 때만 바뀌므로
+렌더링된 JSON 바이트를 데이터 태그(스냅샷 버전)와 함께 LRU에 보관
+
+- ETag(본문 sha256)/Last-Modified/Cache-Control 헤더 추가
+- If-None-Match / If-Modified-Since가 맞으면 핸들러/DB를 거치지 않고 304
+- 데이터 태그가 바뀌면(새 회차 저장) 이전 항목은 모두 버리고 다시 렌더링
+- 캐시 적중 시 핸들러가 실행되지 않으므로 요청마다 부수 효과가 필요한 경로는 등록하지 말 것
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from anyio import to_thread
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))      # 보관할 최대 응답 수
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "60"))  # 클라이언트 Cache-Control max-age (초)
+# 태그가 같아도 다시 렌더링하는 주기 (초)
+# 응답에 섞인 시각 값(generated_at, 스케줄러 다음 실행 시각 등)이 이 시간만큼 늦을 수 있으므로
+# 클라이언트가 어차피 캐시하는 max-age와 같게 둠
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(RESPONSE_CACHE_MAX_AGE)))
+
+# 캐시된 응답에서 다시 보내지 않는 헤더 (새로 계산하거나 서버가 붙임)
+# ETag/Cache-Control은 핸들러가 직접 정한 값이 있으면 그대로 사용 (예: 지난 회차 immutable)
+_SKIP_HEADERS = {b"content-length", b"last-modified", b"date", b"server"}
+
+
+class _Entry:
+    __slots__ = ("tag", "body", "headers", "etag", "cache_control", "last_modified", "stored_at")
+
+    def __init__(self, tag: str, body: bytes, headers: List[Tuple[bytes, bytes]], last_modified: float):
+        self.tag = tag
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.cache_control = f"public, max-age={RESPONSE_CACHE_MAX_AGE}"
+        self.headers = []
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == b"etag":
+                self.etag = value.decode("latin-1")
+            elif lowered == b"cache-control":
+                self.cache_control = value.decode("latin-1")
+            elif lowered not in _SKIP_HEADERS:
+                self.headers.append((name, value))
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+
+
+class DrawResponseCacheMiddleware:
+    """
+    GET 요청 중 paths/patterns에 해당하는 200 응답을 캐시
+
+    Args:
+        get_tag: 현재 데이터 태그 (DB 조회 없이, 모르면 None)
+        load_tag: get_tag가 None일 때 스레드풀에서 호출 (스냅샷을 다시 로드하고 태그 반환)
+        paths: 캐시할 정확한 경로
+        patterns: 캐시할 경로 정규식 (예: r"^/api/winning-numbers/\\d+$")
+    """
+
+    def __init__(self,
+                 app,
+                 get_tag: Callable[[], Optional[str]],
+                 load_tag: Callable[[], Optional[str]],
+                 paths: Iterable[str] = (),
+                 patterns: Iterable[str] = (),
+                 max_entries: int = RESPONSE_CACHE_SIZE):
+        self.app = app
+        self.get_tag = get_tag
+        self.load_tag = load_tag
+        self.paths = set(paths)
+        self.patterns = [re.compile(p) for p in patterns]
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._current_tag: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _cacheable(self, path: str) -> bool:
+        return path in self.paths or any(p.match(path) for p in self.patterns)
+
+    async def _tag(self) -> Optional[str]:
+        tag = self.get_tag()
+        if tag is None:
+            try:
+                tag = await to_thread.run_sync(self.load_tag)
+            except Exception as e:
+                logger.warning(f"⚠️ 응답 캐시 데이터 태그 확인 실패 (캐시 없이 처리): {e}")
+                return None
+        if tag is not None and tag != self._current_tag:
+            # 새 회차 저장 → 이전 데이터로 만든 응답은 모두 폐기
+            if self._entries:
+                logger.info(f"🧹 응답 캐시 비움: 데이터 태그 {self._current_tag} → {tag}")
+            self._entries.clear()
+            self._current_tag = tag
+        return tag
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not self._cacheable(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        request_headers = dict(scope.get("headers") or [])
+        tag = await self._tag()
+
+        entry = self._entries.get(key) if tag is not None else None
+        if entry is not None and (entry.tag != tag or time.monotonic() - entry.stored_at > RESPONSE_CACHE_TTL):
+            del self._entries[key]
+            entry = None
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            await self._send_entry(entry, request_headers, send)
+            return
+
+        self.misses += 1
+        status = None
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers") or [])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+
+        # 렌더링 도중 새 회차가 저장됐으면 저장하지 않고 그대로 전달
+        tag_after = self.get_tag()
+        storable = (
+            status == 200
+            and tag is not None
+            and tag_after == tag
+            and not any(name.lower() == b"set-cookie" for name, _ in headers)
+        )
+        if not storable:
+            await send({"type": "http.response.start", "status": status or 500, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        entry = _Entry(tag, body, headers, time.time())
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        await self._send_entry(entry, request_headers, send)
+
+    async def _send_entry(self, entry: _Entry, request_headers: dict, send):
+        cache_headers = [
+            (b"etag", entry.etag.encode("latin-1")),
+            (b"last-modified", formatdate(entry.last_modified, usegmt=True).encode("latin-1")),
+            (b"cache-control", entry.cache_control.encode("latin-1")),
+        ]
+        if self._not_modified(entry, request_headers):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": entry.headers + cache_headers + [(b"content-length", str(len(entry.body)).encode("latin-1"))],
+        })
+        await send({"type": "http.response.body", "body": entry.body})
+
+    @staticmethod
+    def _not_modified(entry: _Entry, request_headers: dict) -> bool:
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match is not None:
+            tags = [t.strip() for t in if_none_match.decode("latin-1").split(",")]
+            return "*" in tags or entry.etag in tags
+        if_modified_since = request_headers.get(b"if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since.decode("latin-1")).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(entry.last_modified) <= since
+        return False
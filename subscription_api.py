@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from database import get_db
 from models import User, UserSubscription
 from auth import get_current_user
+from principal_cache import get_principal
 
 router = APIRouter(prefix="/api/subscription", tags=["subscription"])
 
@@ -56,9 +57,8 @@ class VerifyPurchaseResponse(BaseModel):
 
 def get_or_create_subscription(db: Session, user_id: int) -> UserSubscription:
     """구독 정보 조회 또는 생성"""
-    # 사용자 존재 여부 확인
-    from models import User
-    user = db.query(User).filter(User.id == user_id).first()
+    # 사용자 존재 여부 확인 (인증 요청마다 반복되므로 사용자 캐시 사용, 비활성 사용자도 포함)
+    user = get_principal(db, user_id, active_only=False)
     if not user:
         print(f"❌ 사용자 없음: user_id={user_id}")
         raise HTTPException(
@@ -123,10 +123,45 @@ def is_subscription_valid(subscription: UserSubscription) -> bool:
     return now < subscription_end
 
 
+def build_subscription_status(db: Session, subscription: UserSubscription) -> SubscriptionStatusResponse:
+    """구독 상태 응답 생성 (만료된 PRO 구독은 free로 되돌림)"""
+    # 구독 만료 확인
+    if subscription.is_pro_subscriber:
+        is_valid = is_subscription_valid(subscription)
+        print(f"🔍 PRO 구독 유효성 체크:")
+        print(f"   subscription_end_date: {subscription.subscription_end_date}")
+        print(f"   now: {datetime.now(timezone.utc)}")
+        print(f"   is_valid: {is_valid}")
+        
+        if not is_valid:
+            # 만료된 구독
+            print(f"⏰ 구독 만료 감지 → is_pro_subscriber를 False로 변경")
+            subscription.is_pro_subscriber = False
+            subscription.subscription_plan = "free"
+            db.commit()
+            db.refresh(subscription)
+    
+    # 체험 기간 계산
+    trial_days_remaining = calculate_trial_days_remaining(subscription)
+    trial_active = trial_days_remaining > 0  # 남은 기간이 있으면 활성
+    
+    return SubscriptionStatusResponse(
+        is_pro=subscription.is_pro_subscriber,
+        trial_active=trial_active,
+        trial_days_remaining=trial_days_remaining,
+        subscription_plan=subscription.subscription_plan or "free",
+        has_access=subscription.is_pro_subscriber or trial_active,
+        trial_start_date=subscription.trial_start_date,
+        trial_end_date=subscription.trial_end_date,
+        subscription_end_date=subscription.subscription_end_date,
+        auto_renew=subscription.auto_renew if subscription.auto_renew is not None else False
+    )
+
+
 # ==================== API 엔드포인트 ====================
 
 @router.post("/start-trial", response_model=SubscriptionStatusResponse)
-async def start_trial(
+def start_trial(
     user_id: int = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -206,7 +241,7 @@ async def start_trial(
 
 
 @router.get("/status", response_model=SubscriptionStatusResponse)
-async def get_subscription_status(
+def get_subscription_status(
     user_id: int = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -221,42 +256,11 @@ async def get_subscription_status(
     print(f"   user_id: {user_id}")
     
     subscription = get_or_create_subscription(db, user_id)
-    
-    # 구독 만료 확인
-    if subscription.is_pro_subscriber:
-        is_valid = is_subscription_valid(subscription)
-        print(f"🔍 PRO 구독 유효성 체크:")
-        print(f"   subscription_end_date: {subscription.subscription_end_date}")
-        print(f"   now: {datetime.now(timezone.utc)}")
-        print(f"   is_valid: {is_valid}")
-        
-        if not is_valid:
-            # 만료된 구독
-            print(f"⏰ 구독 만료 감지 → is_pro_subscriber를 False로 변경")
-            subscription.is_pro_subscriber = False
-            subscription.subscription_plan = "free"
-            db.commit()
-            db.refresh(subscription)
-    
-    # 체험 기간 계산
-    trial_days_remaining = calculate_trial_days_remaining(subscription)
-    trial_active = trial_days_remaining > 0  # 남은 기간이 있으면 활성
-    
-    return SubscriptionStatusResponse(
-        is_pro=subscription.is_pro_subscriber,
-        trial_active=trial_active,
-        trial_days_remaining=trial_days_remaining,
-        subscription_plan=subscription.subscription_plan or "free",
-        has_access=subscription.is_pro_subscriber or trial_active,
-        trial_start_date=subscription.trial_start_date,
-        trial_end_date=subscription.trial_end_date,
-        subscription_end_date=subscription.subscription_end_date,
-        auto_renew=subscription.auto_renew if subscription.auto_renew is not None else False
-    )
+    return build_subscription_status(db, subscription)
 
 
 @router.post("/verify-purchase", response_model=VerifyPurchaseResponse)
-async def verify_purchase(
+def verify_purchase(
     request: VerifyPurchaseRequest,
     user_id: int = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -327,7 +331,7 @@ async def verify_purchase(
 
 
 @router.post("/cancel")
-async def cancel_subscription(
+def cancel_subscription(
     user_id: int = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -362,7 +366,7 @@ async def cancel_subscription(
 # ==================== 관리자 API ====================
 
 @router.get("/admin/expiring-trials")
-async def get_expiring_trials(
+def get_expiring_trials(
     days: int = 3,
     user_id: int = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -404,7 +408,7 @@ async def get_expiring_trials(
 
 
 @router.get("/admin/stats")
-async def get_subscription_stats(
+def get_subscription_stats(
     user_id: int = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
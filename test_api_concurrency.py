@@ -0,0 +1,73 @@
+"""
+API 동시 요청 처리량 테스트 스크립트
+서버 실행 후: python test_api_concurrency.py [요청 수]
+동시 접속 수를 늘려 가며 엔드포인트별 초당 처리량(req/s)과 지연 시간을 측정
+핸들러가 이벤트 루프를 막지 않으면 동시 접속 수에 따라 처리량이 늘어나야 함
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:8000"
+
+CONCURRENCY_LEVELS = [1, 4, 16, 32]
+
+ENDPOINTS = [
+    ("GET", "/api/health", None),
+    ("GET", "/api/winning-numbers/latest", None),
+    ("GET", "/api/winning-numbers?limit=10", None),
+    ("GET", "/api/stats", None),
+    ("POST", "/api/backtest", {"tickets": [[3, 11, 19, 27, 34, 42], [5, 12, 18, 26, 33, 40]]}),
+]
+
+
+def run_level(method, path, body, concurrency, total):
+    """concurrency개 스레드로 total번 요청 → (req/s, 평균 ms, 최대 ms, 실패 수)"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+
+    def call(_):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, BASE_URL + path, json=body, timeout=30)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in results]
+    failures = sum(1 for _, ok in results if not ok)
+    return (total / elapsed,
+            sum(latencies) / len(latencies) * 1000,
+            max(latencies) * 1000,
+            failures)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    health = requests.get(f"{BASE_URL}/api/health", timeout=5)
+    print(f"서버 상태: {health.status_code} {health.json().get('status')}")
+
+    for method, path, body in ENDPOINTS:
+        print("\n" + "="*60)
+        print(f"{method} {path} ({total}회)")
+        print("="*60)
+        baseline = None
+        for concurrency in CONCURRENCY_LEVELS:
+            rps, avg_ms, max_ms, failures = run_level(method, path, body, concurrency, total)
+            baseline = baseline or rps
+            print(f"  동시 {concurrency:>3}: {rps:8.1f} req/s (x{rps / baseline:4.1f})  "
+                  f"평균 {avg_ms:7.1f}ms  최대 {max_ms:7.1f}ms  실패 {failures}")
+
+
+if __name__ == "__main__":
+    main()
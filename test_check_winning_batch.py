@@ -0,0 +1,89 @@
+"""
+일괄 당첨 확인 API 테스트 스크립트
+1. 최신 회차 당첨 번호 조회
+2. 당첨 번호 그대로 / 5개+보너스 / 무작위 번호를 한 번에 확인
+3. 잘못된 번호 세트 검증
+"""
+import random
+import requests
+from pprint import pprint
+
+from auth import TokenManager
+from models import User
+from database import SessionLocal
+
+BASE_URL = "http://localhost:8000"
+
+def get_test_headers():
+    """테스트 유저로 JWT 토큰 생성"""
+    db = SessionLocal()
+    test_user = db.query(User).filter(User.kakao_id == "test_kakao_id_001").first()
+    db.close()
+    if not test_user:
+        raise RuntimeError("테스트 유저가 없습니다. 먼저 test_saved_numbers.py를 실행하세요.")
+    token = TokenManager.create_access_token(data={"sub": str(test_user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+def test_batch_check(headers):
+    """최신 회차 기준 일괄 당첨 확인"""
+    print("\n" + "="*50)
+    print("1️⃣  일괄 당첨 확인 테스트")
+    print("="*50)
+
+    latest = requests.get(f"{BASE_URL}/api/winning-numbers/latest").json()
+    winning = latest["numbers"]
+    bonus = latest["bonus_number"]
+
+    tickets = [
+        winning,                                   # 1등
+        winning[:5] + [bonus],                     # 2등
+    ]
+    tickets += [sorted(random.sample(range(1, 46), 6)) for _ in range(100)]
+
+    payload = {
+        "tickets": tickets,
+        "draw_numbers": [latest["draw_number"]],
+        "save_history": False
+    }
+    response = requests.post(f"{BASE_URL}/api/check-winning/batch", json=payload, headers=headers)
+    print(f"Status Code: {response.status_code}")
+
+    if response.status_code != 200:
+        pprint(response.json())
+        return False
+
+    data = response.json()
+    results = data["draws"][0]["results"]
+    print(f"\n{data['ticket_count']}개 x {data['draw_count']}회차 확인")
+    print(f"등수별 당첨: {data['rank_counts']}")
+    print(f"예상 당첨금 합계: {data['total_prize']:,}원")
+
+    return results[0]["rank"] == 1 and results[1]["rank"] == 2 and len(results) == len(tickets)
+
+def test_batch_invalid_ticket(headers):
+    """잘못된 번호 세트는 400"""
+    print("\n" + "="*50)
+    print("2️⃣  잘못된 번호 세트 테스트")
+    print("="*50)
+
+    payload = {"tickets": [[1, 2, 3, 4, 5, 6], [1, 1, 2, 3, 4, 5]]}
+    response = requests.post(f"{BASE_URL}/api/check-winning/batch", json=payload, headers=headers)
+    print(f"Status Code: {response.status_code}")
+    pprint(response.json())
+    return response.status_code == 400
+
+if __name__ == "__main__":
+    try:
+        headers = get_test_headers()
+        results = {
+            "일괄 당첨 확인": test_batch_check(headers),
+            "잘못된 번호 검증": test_batch_invalid_ticket(headers),
+        }
+        print("\n" + "="*50)
+        print("📊 테스트 결과 요약")
+        print("="*50)
+        for name, result in results.items():
+            print(f"{name}: {'✅ 성공' if result else '❌ 실패'}")
+    except requests.exceptions.ConnectionError:
+        print("\n❌ 서버에 연결할 수 없습니다!")
+        print("먼저 API 서버를 실행하세요: python api_server.py")
@@ -0,0 +1,92 @@
+"""
+크롤러 응답 캐시 테스트 (서버/네트워크 불필요)
+저장된 naver_test.html(1205회차)을 네이버 응답으로 재생해서
+1. 첫 조회 때 원본 + 파싱 결과가 캐시에 저장되는지
+2. 두 번째 조회는 네트워크 없이 캐시에서 나오는지
+3. 파서 버전이 바뀌면 저장된 원본을 다시 파싱하는지
+4. 원본이 손상되면 캐시를 쓰지 않는지
+5. 페이지에 회차 표시가 없으면 결과는 돌려주되 캐시하지 않는지
+"""
+import re
+import tempfile
+from pathlib import Path
+
+import crawler_cache
+import lotto_crawler
+from naver_parser import PARSER_VERSION
+
+FIXTURE = Path(__file__).parent / "naver_test.html"
+DRAW_NO = 1205
+
+
+def replay_fixture(calls, html=None):
+    """저장된 페이지를 16KB 조각으로 돌려주는 stream_text 대체 함수"""
+    html = html if html is not None else FIXTURE.read_text(encoding="utf-8")
+
+    def stream_text(url, new_consumer, headers=None, timeout=15):
+        calls.append(url)
+        consumer = new_consumer()
+        for start in range(0, len(html), 16384):
+            if consumer.feed(html[start:start + 16384]):
+                break
+        return consumer, consumer.chars_read
+    return stream_text
+
+
+def offline(url, new_consumer, headers=None, timeout=15):
+    raise AssertionError(f"네트워크 요청이 발생함: {url}")
+
+
+def run_tests():
+    original_stream = lotto_crawler.stream_text
+    original_dir = crawler_cache.CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler_cache.CACHE_DIR = tmp
+        try:
+            print("\n1️⃣  첫 조회 → 캐시 저장")
+            calls = []
+            lotto_crawler.stream_text = replay_fixture(calls)
+            first = lotto_crawler.fetch_from_naver_search(DRAW_NO)
+            assert first and first["drwNo"] == DRAW_NO, first
+            assert len(calls) == 1
+            stats = crawler_cache.cache_stats()
+            print(f"   {first}")
+            print(f"   캐시: {stats}")
+            assert stats["sources"]["naver"]["draws"] == 1 and stats["blobs"] == 1
+
+            print("\n2️⃣  두 번째 조회 → 네트워크 없이 캐시 사용")
+            lotto_crawler.stream_text = offline
+            assert lotto_crawler.fetch_from_naver_search(DRAW_NO) == first
+
+            print("\n3️⃣  파서 버전 변경 → 저장된 원본 재파싱")
+            reparsed = crawler_cache.get_cached_draw(
+                "naver", DRAW_NO, PARSER_VERSION + 1, lotto_crawler._parse_naver_html)
+            assert reparsed == first, reparsed
+            meta = crawler_cache._read_meta("naver", DRAW_NO)
+            assert meta["parser_version"] == PARSER_VERSION + 1
+            assert crawler_cache.verify_cache() == {"ok": 1, "missing": 0, "corrupt": 0}
+
+            print("\n4️⃣  원본 손상 → 캐시 무시")
+            blob = crawler_cache._blob_path(meta["sha256"])
+            blob.write_bytes(b"broken")
+            assert crawler_cache.get_cached_draw(
+                "naver", DRAW_NO, PARSER_VERSION + 2, lotto_crawler._parse_naver_html) is None
+            assert crawler_cache.verify_cache()["corrupt"] == 1
+
+            print("\n5️⃣  회차 표시 없는 페이지 → 캐시하지 않음")
+            no_draw = re.sub(r"\d{1,4}회", "회", FIXTURE.read_text(encoding="utf-8"))
+            calls = []
+            lotto_crawler.stream_text = replay_fixture(calls, no_draw)
+            guessed = lotto_crawler.fetch_from_naver_search(DRAW_NO - 10)
+            assert guessed and guessed["drwNo"] == DRAW_NO - 10, guessed
+            assert crawler_cache._read_meta("naver", DRAW_NO - 10) is None
+            lotto_crawler.fetch_from_naver_search(DRAW_NO - 10)
+            assert len(calls) == 2  # 캐시가 없으므로 다시 네트워크 요청
+        finally:
+            lotto_crawler.stream_text = original_stream
+            crawler_cache.CACHE_DIR = original_dir
+    print("\n✅ 모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,102 @@
+"""
+네이버 검색 결과 파서 테스트 / 벤치마크 (서버 불필요)
+저장된 naver_test.html(1205회차 검색 결과)로
+1. 파싱 결과 확인
+2. 조각 크기와 관계없이 같은 결과인지 확인
+3. 예전 방식(전체 HTML 정규식)과 속도 / 읽은 분량 비교
+"""
+import re
+import time
+from pathlib import Path
+
+from naver_parser import NaverLottoParser, parse_naver_lotto
+
+FIXTURE = Path(__file__).parent / "naver_test.html"
+
+EXPECTED = {
+    "draw_no": 1205,
+    "draw_date": "2026-01-03",
+    "numbers": [1, 4, 16, 23, 31, 41],
+    "bonus": 2,
+    "prize_1st": 3226386263,
+    "winners_1st": 10,
+}
+
+
+def load_fixture() -> str:
+    return FIXTURE.read_text(encoding="utf-8")
+
+
+def legacy_parse(html: str):
+    """기존 lotto_crawler의 전체 HTML 정규식 방식 (비교용)"""
+    ball_pattern = r'ball[^"]*"[^>]*>(\d+)</span>'
+    numbers, bonus = [], None
+    match = re.search(r'winning_number["\']?\s*>([^<]*(?:<[^>]*>[^<]*)*?)</div>', html, re.DOTALL | re.IGNORECASE)
+    if match:
+        numbers = [int(b) for b in re.findall(ball_pattern, match.group(1), re.IGNORECASE) if 1 <= int(b) <= 45]
+    match = re.search(r'bonus_number["\']?\s*>([^<]*(?:<[^>]*>[^<]*)*?)</div>', html, re.DOTALL | re.IGNORECASE)
+    if match:
+        balls = re.findall(ball_pattern, match.group(1), re.IGNORECASE)
+        bonus = int(balls[0]) if balls else None
+    re.search(r'1등\s*당첨금[^<]*<strong[^>]*>([0-9,]+)</strong>원[^(]*\(당첨[^0-9]*(\d+)', html, re.IGNORECASE)
+    re.search(r'(\d{4})회', html)
+    re.search(r'\((\d{4}\.\d{2}\.\d{2})\s*추첨?\)', html)
+    return numbers, bonus
+
+
+def test_parse_fixture():
+    """저장된 페이지에서 당첨 정보 추출"""
+    result = parse_naver_lotto(load_fixture())
+    print(f"파싱 결과: {result}")
+    assert result == EXPECTED, result
+
+
+def test_chunk_sizes():
+    """조각 경계가 어디에 걸려도 같은 결과"""
+    html = load_fixture()
+    for chunk_size in (1, 7, 100, 4096, 65536, len(html)):
+        parser = NaverLottoParser()
+        for start in range(0, len(html), chunk_size):
+            if parser.feed(html[start:start + chunk_size]):
+                break
+        parser.close()
+        assert parser.result() == EXPECTED, (chunk_size, parser.result())
+        print(f"조각 {chunk_size:>6}자: 전체 {len(html):,}자 중 {parser.chars_read:,}자만 읽음")
+
+
+def test_missing_box():
+    """win_number_box가 없으면 문서 앞쪽 ball 7개 사용, 그것도 없으면 None"""
+    html = '<title>로또 1100회 당첨번호</title>' + ''.join(
+        f'<span class="ball type1">{n}</span>' for n in (3, 9, 12, 20, 33, 44, 7))
+    result = parse_naver_lotto(html)
+    assert result["draw_no"] == 1100 and result["numbers"] == [3, 9, 12, 20, 33, 44] and result["bonus"] == 7, result
+    assert parse_naver_lotto("<html>검색 결과 없음</html>") is None
+
+
+def benchmark(rounds: int = 20):
+    """예전 방식과 파싱 시간 비교"""
+    html = load_fixture()
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        legacy_parse(html)
+    legacy_ms = (time.perf_counter() - started) / rounds * 1000
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        parse_naver_lotto(html)
+    parser_ms = (time.perf_counter() - started) / rounds * 1000
+
+    print("\n" + "="*50)
+    print(f"naver_test.html ({len(html):,}자, {rounds}회 평균)")
+    print("="*50)
+    print(f"  예전 정규식:   {legacy_ms:8.2f}ms")
+    print(f"  스트리밍 파서: {parser_ms:8.2f}ms (x{legacy_ms / parser_ms:.1f})")
+
+
+if __name__ == "__main__":
+    test_parse_fixture()
+    test_chunk_sizes()
+    test_missing_box()
+    benchmark()
+    print("\n✅ 모든 테스트 통과")
@@ -0,0 +1,154 @@
+"""
+새 회차 당첨 확인 일괄 처리 (post-draw fan-out)
+새 회차가 저장되면 saved_numbers 전체를 id 순서로 나눠 읽어
+비트마스크로 한 번에 비교하고 WinningCheck를 bulk insert 한다.
+토요일 추첨 직후 사용자들이 각자 /api/check-winning을 호출하는 부하를
+자동 업데이트 직후의 한가한 시간대로 옮기기 위한 작업
+"""
+import logging
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import SavedNumber, WinningCheck, WinningNumber
+from lotto_checker import (
+    numbers_to_mask,
+    check_winning_mask,
+    calculate_rank,
+    actual_prize_for_rank,
+    estimate_prize_amount
+)
+
+# numpy가 없으면 파이썬 정수 비트마스크로 비교
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+FANOUT_CHUNK_SIZE = 2000  # 한 번에 읽고 저장하는 saved_numbers 행 수
+
+
+def _match_chunk(rows: List[tuple], winning_numbers: List[int], bonus_number: int) -> List[tuple]:
+    """
+    (id, user_id, 번호 6개) 행들을 당첨 번호와 비교
+    Returns: [(맞춘 개수, 보너스 포함 여부, 등수), ...]
+    """
+    if np is None:
+        winning_mask = numbers_to_mask(winning_numbers)
+        return [check_winning_mask(numbers_to_mask(row[2:8]), winning_mask, bonus_number) for row in rows]
+
+    numbers = np.array([row[2:8] for row in rows], dtype=np.uint64)
+    masks = np.bitwise_or.reduce(np.left_shift(np.uint64(1), numbers), axis=1)
+    winning_mask = np.uint64(numbers_to_mask(winning_numbers))
+    matched = np.bitwise_count(masks & winning_mask).astype(np.int64)
+    has_bonus = (matched == 5) & ((masks >> np.uint64(bonus_number)) & np.uint64(1)).astype(bool)
+    return [
+        (int(m), bool(b), calculate_rank(int(m), bool(b)))
+        for m, b in zip(matched.tolist(), has_bonus.tolist())
+    ]
+
+
+def check_saved_numbers_for_draw(db: Session,
+                                 draw_number: int,
+                                 chunk_size: int = FANOUT_CHUNK_SIZE) -> Dict:
+    """
+    저장된 모든 번호를 draw_number 회차와 비교해 당첨 확인 기록 생성
+
+    - id 기준 keyset 페이지네이션으로 chunk_size개씩 읽음 (OFFSET 없음)
+    - 같은 사용자/회차/번호의 기록이 이미 있으면 건너뜀 (재실행해도 중복 없음)
+    - 청크마다 bulk insert 후 commit
+
+    Returns:
+        {"draw_number", "checked", "inserted", "skipped", "rank_counts", "elapsed"}
+    """
+    started = time.time()
+    winning = db.query(WinningNumber).filter(WinningNumber.draw_number == draw_number).first()
+    if winning is None:
+        raise ValueError(f"{draw_number}회차 당첨 번호가 DB에 없습니다")
+
+    winning_numbers = [winning.number1, winning.number2, winning.number3,
+                       winning.number4, winning.number5, winning.number6]
+    prizes = {rank: estimate_prize_amount(rank, actual_prize_for_rank(winning, rank))
+              for rank in range(1, 6)}
+
+    checked = inserted = skipped = 0
+    rank_counts = Counter()
+    last_id = 0
+    while True:
+        rows = db.query(
+            SavedNumber.id, SavedNumber.user_id,
+            SavedNumber.number1, SavedNumber.number2, SavedNumber.number3,
+            SavedNumber.number4, SavedNumber.number5, SavedNumber.number6
+        ).filter(SavedNumber.id > last_id).order_by(SavedNumber.id).limit(chunk_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        # 이미 확인한 (사용자, 번호) 조합
+        user_ids = {row[1] for row in rows}
+        existing = {
+            (user_id, tuple(sorted(numbers)))
+            for user_id, numbers in db.query(WinningCheck.user_id, WinningCheck.numbers).filter(
+                WinningCheck.draw_number == draw_number,
+                WinningCheck.user_id.in_(user_ids)
+            ).all()
+        }
+
+        history_rows = []
+        for row, (matched_count, has_bonus, rank) in zip(rows, _match_chunk(rows, winning_numbers, winning.bonus_number)):
+            numbers = sorted(row[2:8])
+            key = (row[1], tuple(numbers))
+            if key in existing:
+                skipped += 1
+                continue
+            existing.add(key)
+            history_rows.append({
+                "user_id": row[1],
+                "numbers": numbers,
+                "draw_number": draw_number,
+                "rank": rank,
+                "prize_amount": prizes.get(rank),
+                "matched_count": matched_count,
+                "has_bonus": has_bonus
+            })
+            if rank:
+                rank_counts[rank] += 1
+
+        if history_rows:
+            db.execute(insert(WinningCheck), history_rows)
+            db.commit()
+        checked += len(rows)
+        inserted += len(history_rows)
+
+    elapsed = time.time() - started
+    logger.info(
+        f"🎯 {draw_number}회차 저장 번호 일괄 확인: {checked}개 확인, {inserted}개 기록, "
+        f"{skipped}개 중복 건너뜀, 당첨 {sum(rank_counts.values())}건 ({elapsed:.2f}초)"
+    )
+    return {
+        "draw_number": draw_number,
+        "checked": checked,
+        "inserted": inserted,
+        "skipped": skipped,
+        "rank_counts": dict(rank_counts),
+        "elapsed": elapsed
+    }
+
+
+def run_winning_fanout(draw_number: int) -> Optional[Dict]:
+    """스케줄러 백그라운드 작업용 진입점 (자체 세션 사용, 예외는 로그만 남김)"""
+    db = SessionLocal()
+    try:
+        return check_saved_numbers_for_draw(db, draw_number)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ {draw_number}회차 저장 번호 일괄 확인 실패: {e}")
+        return None
+    finally:
+        db.close()